@@ -12,6 +12,7 @@ from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_select_population import es_select_population
 from evolusnake.es_server import ESServer
+from evolusnake.es_logging import es_setup_logging
 import evolusnake.es_utils as utils
 
 
@@ -91,6 +92,10 @@ class BinPackingIndividual(ESIndividual):
 
         self.fitness = num_bins * penalty
 
+    @override
+    def es_genome_hash(self) -> int:
+        return hash(tuple(self.selection))
+
     @override
     def es_clone(self) -> Self:
         new = BinPackingIndividual(self.items, self.capacity)
@@ -145,10 +150,7 @@ def main():
             else:
                 break
 
-    log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    logging.basicConfig(filename=log_file_name, level=logging.DEBUG, format=log_format)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("parasnake").setLevel(logging.WARNING)
+    es_setup_logging(log_file_name, logging.DEBUG)
 
     ind = BinPackingIndividual([
         27.98, 33.36, 25.27, 24.44, 31.32, 35.00, 29.84, 20.32,
@@ -6,7 +6,7 @@
 # Python std lib:
 import logging
 import pathlib
-from typing import override, Self
+from typing import override, Self, Any
 import math
 
 # Local imports:
@@ -14,6 +14,7 @@ from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_select_population import es_select_population
 from evolusnake.es_server import ESServer
+from evolusnake.es_logging import es_setup_logging
 import evolusnake.es_utils as utils
 
 
@@ -98,16 +99,37 @@ class RastriginIndividual(ESIndividual):
 
         self.fitness = fitness
 
+    @override
+    def es_get_vector(self) -> list[float]:
+        return self.values[:]
+
+    @override
+    def es_set_vector(self, values: list[float]):
+        self.values = values[:]
+
+    @override
+    def es_vector_bounds(self) -> tuple[float, float]:
+        return (self.lower_bound, self.upper_bound)
+
+    @override
+    def es_calculate_fitness_matrix(self, matrix: Any) -> Any:
+        # Only needed for population kind 12:
+        import numpy as np
+
+        A: float = 10.0
+        terms = (matrix**2.0) - (A * np.cos(math.tau * matrix))
+        return (A * float(self.dimensions)) + terms.sum(axis=1)
+
     @override
     def es_clone(self) -> Self:
         new = RastriginIndividual(self.dimensions, self.lower_bound, self.upper_bound)
-        new.values = self.values
+        new.values = self.values[:]
 
         return new  # type: ignore
 
     @override
     def es_from_server(self, other):
-        self.values = other.values
+        self.values = other.values[:]
 
     @override
     def es_to_json(self) -> dict:
@@ -148,10 +170,7 @@ def main():
             else:
                 break
 
-    log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    logging.basicConfig(filename=log_file_name, level=logging.DEBUG, format=log_format)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("parasnake").setLevel(logging.WARNING)
+    es_setup_logging(log_file_name, logging.DEBUG)
 
     ind = RastriginIndividual(10, -5.0, 5.0)
 
@@ -6,13 +6,14 @@
 # Python std lib:
 import logging
 import pathlib
-from typing import override, Self
+from typing import override, Self, Any
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_select_population import es_select_population
 from evolusnake.es_server import ESServer
+from evolusnake.es_logging import es_setup_logging
 import evolusnake.es_utils as utils
 
 
@@ -96,16 +97,35 @@ class RosenbrockIndividual(ESIndividual):
 
         self.fitness = fitness
 
+    @override
+    def es_get_vector(self) -> list[float]:
+        return self.values[:]
+
+    @override
+    def es_set_vector(self, values: list[float]):
+        self.values = values[:]
+
+    @override
+    def es_vector_bounds(self) -> tuple[float, float]:
+        return (self.lower_bound, self.upper_bound)
+
+    @override
+    def es_calculate_fitness_matrix(self, matrix: Any) -> Any:
+        # Only needed for population kind 12:
+        term1 = 100.0 * (matrix[:, 1:] - matrix[:, :-1]**2.0)**2.0
+        term2 = (1.0 - matrix[:, :-1])**2.0
+        return (term1 + term2).sum(axis=1)
+
     @override
     def es_clone(self) -> Self:
         new = RosenbrockIndividual(self.dimensions, self.lower_bound, self.upper_bound)
-        new.values = self.values
+        new.values = self.values[:]
 
         return new  # type: ignore
 
     @override
     def es_from_server(self, other):
-        self.values = other.values
+        self.values = other.values[:]
 
     @override
     def es_to_json(self) -> dict:
@@ -146,10 +166,7 @@ def main():
             else:
                 break
 
-    log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    logging.basicConfig(filename=log_file_name, level=logging.DEBUG, format=log_format)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("parasnake").setLevel(logging.WARNING)
+    es_setup_logging(log_file_name, logging.DEBUG)
 
     ind = RosenbrockIndividual(10, -5.0, 5.0)
 
@@ -13,6 +13,7 @@ from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_select_population import es_select_population
 from evolusnake.es_server import ESServer
+from evolusnake.es_logging import es_setup_logging
 import evolusnake.es_utils as utils
 
 
@@ -89,6 +90,10 @@ class KnapsackIndividual(ESIndividual):
 
         self.fitness = self.penalty - total_value
 
+    @override
+    def es_genome_hash(self) -> int:
+        return hash(tuple(self.selection))
+
     @override
     def es_clone(self) -> Self:
         new = KnapsackIndividual(self.items, self.capacity)
@@ -143,10 +148,7 @@ def main():
             else:
                 break
 
-    log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    logging.basicConfig(filename=log_file_name, level=logging.DEBUG, format=log_format)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("parasnake").setLevel(logging.WARNING)
+    es_setup_logging(log_file_name, logging.DEBUG)
 
     ind = KnapsackIndividual([
         (27.98, 33.36),
@@ -13,6 +13,7 @@ from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_select_population import es_select_population
 from evolusnake.es_server import ESServer
+from evolusnake.es_logging import es_setup_logging
 import evolusnake.es_utils as utils
 
 from neuron import Neuron
@@ -227,10 +228,7 @@ def main():
             else:
                 break
 
-    log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    logging.basicConfig(filename=log_file_name, level=logging.DEBUG, format=log_format)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("parasnake").setLevel(logging.WARNING)
+    es_setup_logging(log_file_name, logging.DEBUG)
 
     data_values = []
 
@@ -9,7 +9,7 @@ from typing import Generator, override
 import logging
 
 # Local imports
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESPopulationView, ESIterationCallBack
 import evolusnake.es_utils as utils
 
 
@@ -21,11 +21,10 @@ class IterationNeural(ESIterationCallBack):
         pass
 
     @override
-    def es_fraction_iteration(self, population: ESPopulation):
+    def es_fraction_iteration(self, population: ESPopulationView):
         population.population[0].data_provider.create_batch_indices()  # type: ignore
-
-        for ind in population.population:
-            ind.es_calculate_fitness()
+        # New mini batch, old fitness values are no longer valid:
+        population.es_new_fitness_epoch()
 
     @override
     def es_get_iteration_factor(self) -> int:
@@ -304,6 +304,11 @@ class NeuralNetBase(ESIndividual):
         self.fitness = other.fitness
         self.use_softmax = other.use_softmax
 
+    @override
+    def es_use_fitness_data(self, other):
+        # Results from the nodes are evaluated on the batch of the server:
+        self.data_provider = other.data_provider
+
     @override
     def es_to_json(self) -> dict:
         data = {
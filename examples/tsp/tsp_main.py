@@ -6,155 +6,18 @@
 # Python std lib:
 import logging
 import pathlib
-from typing import override, Self
-import math
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
-from evolusnake.es_individual import ESIndividual
 from evolusnake.es_select_population import es_select_population
 from evolusnake.es_server import ESServer
-import evolusnake.es_utils as utils
+from evolusnake.es_tsp import ESTSPInstance, ESTSPIndividual
+from evolusnake.es_logging import es_setup_logging
 
 
 logger = logging.getLogger(__name__)
 
 
-class TSPIndividual(ESIndividual):
-    def __init__(self):
-        super().__init__()
-
-        self.positions: list = []
-        self.num_elems: int = 0
-
-    def load_data(self, filename):
-        self.positions = []
-        num_elems = 0
-
-        with open(filename, "r") as f:
-            for line in f:
-                items = line.split(" ")
-                x = float(items[0])
-                y = float(items[1])
-
-                self.positions.append((x, y))
-                num_elems += 1
-
-        self.num_elems = num_elems
-
-    def get_one_index(self) -> int:
-        return utils.es_rand_int(self.num_elems)
-
-    def get_two_indices(self) -> tuple[int, int]:
-        i1: int = utils.es_rand_int(self.num_elems)
-        i2: int = utils.es_rand_int(self.num_elems)
-
-        while i1 == i2:
-            i2 = utils.es_rand_int(self.num_elems)
-
-        return (i1, i2)
-
-    def reverse(self):
-        (i1, i2) = self.get_two_indices()
-
-        if i1 > i2:
-            (i1, i2) = (i2, i1)
-
-        while i1 < i2:
-            (self.positions[i1], self.positions[i2]) = (self.positions[i2], self.positions[i1])
-
-            i1 += 1
-            i2 -= 1
-
-    def just_swap(self):
-        (i1, i2) = self.get_two_indices()
-        (self.positions[i1], self.positions[i2]) = (self.positions[i2], self.positions[i1])
-
-    def shift_left(self):
-        (i1, i2) = self.get_two_indices()
-
-        if i1 > i2:
-            (i1, i2) = (i2, i1)
-
-        elements_to_shift = self.positions[i1:i2]
-        remaining_left = self.positions[:i1]
-        remaining_right = self.positions[i2:]
-
-        self.positions = remaining_left + elements_to_shift[1:] + elements_to_shift[:1] + remaining_right
-
-    def shift_right(self):
-        (i1, i2) = self.get_two_indices()
-
-        if i1 > i2:
-            (i1, i2) = (i2, i1)
-
-        elements_to_shift = self.positions[i1:i2]
-        remaining_left = self.positions[:i1]
-        remaining_right = self.positions[i2:]
-
-        self.positions = remaining_left + elements_to_shift[-1:] + elements_to_shift[:-1] + remaining_right
-
-    @override
-    def es_mutate(self, mut_op: int):
-        match mut_op:
-            case 0:
-                self.reverse()
-            case 1:
-                self.just_swap()
-            case 2:
-                self.shift_left()
-            case 3:
-                self.shift_right()
-            case _:
-                raise ValueError(f"Unknown mutation operation: {mut_op}")
-
-    @override
-    def es_randomize(self):
-        utils.es_shuffle_list(self.positions)
-
-    @override
-    def es_calculate_fitness(self):
-        length = 0.0
-
-        x0: float
-        y0: float
-        x1: float
-        y1: float
-
-        (x0, y0) = self.positions[-1]
-
-        for (x1, y1) in self.positions:
-            length += math.hypot(x0 - x1, y0 - y1)
-            (x0, y0) = (x1, y1)
-
-        self.fitness = length
-
-    @override
-    def es_clone(self) -> Self:
-        new = TSPIndividual()
-        new.positions = self.positions[:]
-        new.num_elems = self.num_elems
-
-        return new  # type: ignore
-
-    @override
-    def es_from_server(self, other):
-        self.positions = other.positions
-
-    @override
-    def es_to_json(self) -> dict:
-        data = {
-            "positions": self.positions
-        }
-
-        return data
-
-    @override
-    def es_from_json(self, data: dict):
-        self.positions = data["positions"]
-        self.num_elems = len(self.positions)
-
-
 def main():
     config = ESConfiguration.from_json("tsp_config.json")
     config.from_command_line()
@@ -175,23 +38,18 @@ def main():
             else:
                 break
 
-    log_format = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    logging.basicConfig(filename=log_file_name, level=logging.DEBUG, format=log_format)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("parasnake").setLevel(logging.WARNING)
-
-    ind = TSPIndividual()
+    es_setup_logging(log_file_name, logging.DEBUG)
 
     # Best fitness with city_positions1: 376.3341189874508
     # Possible good limit: 380.0
-    # ind.load_data("city_positions1.txt")
+    # ind = ESTSPIndividual(ESTSPInstance.from_file("city_positions1.txt"))
     # config.target_fitness = 380.0
 
     # Best fitness with city_positions2:
     # 8145.613167961496
     # 8143.067125164253
     # Possible good limit: 9000.0
-    ind.load_data("city_positions2.txt")
+    ind = ESTSPIndividual(ESTSPInstance.from_file("city_positions2.txt"))
     config.target_fitness = 9000.0
 
     if server_mode:
@@ -0,0 +1,124 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines an append-only checkpoint file.
+Each record is a JSON object prefixed with its length (4 bytes, big endian).
+The file starts with a snapshot record followed by incremental records.
+Compaction writes a new snapshot to a temporary file and replaces the
+checkpoint atomically.
+"""
+
+# Python std lib:
+import logging
+import json
+import os
+import struct
+import time
+
+logger = logging.getLogger(__name__)
+
+ES_RECORD_HEADER: struct.Struct = struct.Struct(">I")
+
+
+class ESCheckpoint:
+    def __init__(self, filename: str, compact_count: int, sync_interval: float = 0.0):
+        if compact_count < 1:
+            raise ValueError(f"Checkpoint compact count must be at least 1, {compact_count}")
+
+        if sync_interval < 0.0:
+            raise ValueError(f"Checkpoint sync interval must not be negative, {sync_interval}")
+
+        self.filename: str = filename
+        self.compact_count: int = compact_count
+        # Number of incremental records since the last snapshot:
+        self.append_count: int = 0
+        # Incremental records are synced to disk at most every sync_interval seconds,
+        # 0.0 syncs every record:
+        self.sync_interval: float = sync_interval
+        self.last_sync: float = time.monotonic()
+        self.unsynced: bool = False
+
+    def es_exists(self) -> bool:
+        return os.path.isfile(self.filename)
+
+    def es_read(self) -> list[dict]:
+        # Returns all complete records.
+        # An incomplete record at the end (crash while writing) is ignored.
+        records: list[dict] = []
+
+        with open(self.filename, "rb") as f:
+            data: bytes = f.read()
+
+        offset: int = 0
+        header_size: int = ES_RECORD_HEADER.size
+
+        while offset + header_size <= len(data):
+            (length,) = ES_RECORD_HEADER.unpack_from(data, offset)
+            start: int = offset + header_size
+            end: int = start + length
+
+            if end > len(data):
+                logger.warning(f"Incomplete record in checkpoint at offset {offset}, ignored.")
+                break
+
+            try:
+                records.append(json.loads(data[start:end]))
+            except ValueError:
+                logger.warning(f"Invalid record in checkpoint at offset {offset}, ignored.")
+                break
+
+            offset = end
+
+        self.append_count = max(0, len(records) - 1)
+
+        return records
+
+    def es_encode(self, record: dict) -> bytes:
+        payload: bytes = json.dumps(record).encode("utf-8")
+        return ES_RECORD_HEADER.pack(len(payload)) + payload
+
+    def es_write_snapshot(self, record: dict):
+        # Replaces the whole checkpoint with the given snapshot.
+        tmp_filename: str = f"{self.filename}.tmp"
+
+        with open(tmp_filename, "wb") as f:
+            f.write(self.es_encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_filename, self.filename)
+        self.append_count = 0
+        self.last_sync = time.monotonic()
+        self.unsynced = False
+
+    def es_append(self, record: dict) -> bool:
+        # Appends an incremental record.
+        # Returns True if the checkpoint should be compacted.
+        with open(self.filename, "ab") as f:
+            f.write(self.es_encode(record))
+            f.flush()
+
+            if (time.monotonic() - self.last_sync) >= self.sync_interval:
+                os.fsync(f.fileno())
+                self.last_sync = time.monotonic()
+                self.unsynced = False
+            else:
+                self.unsynced = True
+
+        self.append_count += 1
+
+        return self.append_count >= self.compact_count
+
+    def es_sync(self):
+        # Syncs the records that have been appended since the last sync.
+        if not self.unsynced:
+            return
+
+        with open(self.filename, "ab") as f:
+            os.fsync(f.fileno())
+
+        self.last_sync = time.monotonic()
+        self.unsynced = False
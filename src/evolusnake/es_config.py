@@ -9,6 +9,7 @@ This module defines the configuration.
 
 # Python std lib:
 import json
+import base64
 import logging
 import argparse
 from typing import Any
@@ -33,9 +34,27 @@ class ESConfiguration:
         self.target_fitness2: float = 0.0
         self.result_filename: str = "best_result.json"
         self.save_new_fitness: bool = False
+        self.result_history_filename: str = ""
+        self.fitness_history_filename: str = ""
+        self.fitness_history_buffer: int = 4096
         self.allow_same_fitness: bool = False
         self.share_only_best: bool = False
         self.server_population_size: int = 10
+        self.reevaluate_interval: int = 0
+        self.pareto_archive: bool = False
+        self.niching_radius: float = 0.0
+        self.node_scheduler: bool = False
+        self.node_stagnation_limit: int = 50
+        self.portfolio: list[dict] = []
+        self.portfolio_interval: int = 10
+        self.checkpoint_filename: str = ""
+        self.checkpoint_compact: int = 100
+        self.checkpoint_sync_interval: float = 1.0
+
+        # Metrics config (server and node):
+        self.metrics_filename: str = ""
+        self.metrics_port: int = 0
+        self.metrics_interval: float = 10.0
 
         # Node config:
         self.node_population_size: int = 10
@@ -51,6 +70,31 @@ class ESConfiguration:
         self.sine_amplitude: float = 50.0
         self.sine_frequency: float = 0.01
         self.limit_range: float = 5.0
+        self.fitness_cache_size: int = 0
+        self.noisy_fitness: bool = False
+        self.reevaluate_top_k: int = 0
+        self.vector_sigma: float = 0.1
+        self.restart_stagnation: int = 100
+        self.tournament_size: int = 2
+        self.fitness2_threshold: float = 0.01
+        self.fitness2_top_k: int = 0
+        self.profile_phases: bool = False
+        self.node_checkpoint_filename: str = ""
+        self.node_checkpoint_interval: int = 10
+        # 0 means: use the current time as seed.
+        self.random_seed: int = 0
+        # Create the population from the first individual of the server
+        # instead of random individuals:
+        self.deferred_init: bool = False
+        # Number of elite individuals the server sends to a new node,
+        # the node creates its population from them (implies deferred_init):
+        self.init_batch_size: int = 0
+        # Number of processes to evaluate the initial population (server and node),
+        # 0 means one for each CPU:
+        self.init_workers: int = 1
+        # Seconds to wait if the target fitness is reached in the first iteration,
+        # to avoid spamming the server:
+        self.early_exit_delay: float = 5.0
 
         # User defined options:
         self.user_options: str = ""
@@ -86,12 +130,22 @@ class ESConfiguration:
                     config.result_filename = value
                 case "save_new_fitness":
                     config.save_new_fitness = value
+                case "result_history_filename":
+                    config.result_history_filename = value
+                case "fitness_history_filename":
+                    config.fitness_history_filename = value
+                case "fitness_history_buffer":
+                    config.fitness_history_buffer = value
                 case "allow_same_fitness":
                     config.allow_same_fitness = value
                 case "share_only_best":
                     config.share_only_best = value
                 case "server_population_size":
                     config.server_population_size = value
+                case "reevaluate_interval":
+                    config.reevaluate_interval = value
+                case "pareto_archive":
+                    config.pareto_archive = value
                 case "node_population_size":
                     config.node_population_size = value
                 case "num_of_iterations":
@@ -118,6 +172,60 @@ class ESConfiguration:
                     config.sine_frequency = value
                 case "limit_range":
                     config.limit_range = value
+                case "fitness_cache_size":
+                    config.fitness_cache_size = value
+                case "noisy_fitness":
+                    config.noisy_fitness = value
+                case "reevaluate_top_k":
+                    config.reevaluate_top_k = value
+                case "vector_sigma":
+                    config.vector_sigma = value
+                case "restart_stagnation":
+                    config.restart_stagnation = value
+                case "tournament_size":
+                    config.tournament_size = value
+                case "fitness2_threshold":
+                    config.fitness2_threshold = value
+                case "fitness2_top_k":
+                    config.fitness2_top_k = value
+                case "profile_phases":
+                    config.profile_phases = value
+                case "node_checkpoint_filename":
+                    config.node_checkpoint_filename = value
+                case "node_checkpoint_interval":
+                    config.node_checkpoint_interval = value
+                case "random_seed":
+                    config.random_seed = value
+                case "deferred_init":
+                    config.deferred_init = value
+                case "init_batch_size":
+                    config.init_batch_size = value
+                case "init_workers":
+                    config.init_workers = value
+                case "early_exit_delay":
+                    config.early_exit_delay = value
+                case "niching_radius":
+                    config.niching_radius = value
+                case "node_scheduler":
+                    config.node_scheduler = value
+                case "node_stagnation_limit":
+                    config.node_stagnation_limit = value
+                case "portfolio":
+                    config.portfolio = value
+                case "portfolio_interval":
+                    config.portfolio_interval = value
+                case "checkpoint_filename":
+                    config.checkpoint_filename = value
+                case "checkpoint_compact":
+                    config.checkpoint_compact = value
+                case "checkpoint_sync_interval":
+                    config.checkpoint_sync_interval = value
+                case "metrics_filename":
+                    config.metrics_filename = value
+                case "metrics_port":
+                    config.metrics_port = value
+                case "metrics_interval":
+                    config.metrics_interval = value
                 case "user_options":
                     config.user_options = value
                 case _:
@@ -125,6 +233,29 @@ class ESConfiguration:
 
         return config
 
+    def to_json(self, file_name: str):
+        """
+        Save the configuration (JSON format) to the given file name.
+        The file can be loaded again with from_json().
+
+        :param file_name: File name of the configuration.
+        """
+
+        logger.debug(f"Save configuration to file: {file_name}.")
+
+        data: dict = {key: value for (key, value) in vars(self).items() if key != "parasnake_config"}
+
+        # Config data for Parasnake:
+        ps_config: PSConfiguration = self.parasnake_config
+        data["server_address"] = ps_config.server_address
+        data["server_port"] = ps_config.server_port
+        data["heartbeat_timeout"] = ps_config.heartbeat_timeout
+        data["quit_counter"] = ps_config.quit_counter
+        data["secret_key"] = base64.urlsafe_b64decode(ps_config.secret_key).decode()
+
+        with open(file_name, "w") as f:
+            json.dump(data, f, indent=4)
+
     def from_command_line(self):
         parser = argparse.ArgumentParser(add_help=False)
         parser.add_argument("-s", "--server", action="store_true")
@@ -144,6 +275,17 @@ class ESConfiguration:
         parser.add_argument("--limit_range", type=float)
         parser.add_argument("--user_options")
 
+        # All the other options with a simple type can be set with --<option>,
+        # boolean options with --<option> and --no-<option>.
+        # Lists and dicts (portfolio) can only be set in the JSON file.
+        other_options: dict[str, type] = self.es_other_options()
+
+        for (name, option_type) in other_options.items():
+            if option_type is bool:
+                parser.add_argument(f"--{name}", action=argparse.BooleanOptionalAction)
+            else:
+                parser.add_argument(f"--{name}", type=option_type)
+
         args = parser.parse_args()
 
         self.server_mode = args.server
@@ -191,3 +333,19 @@ class ESConfiguration:
 
         if args.user_options is not None:
             self.user_options = args.user_options
+
+        for name in other_options:
+            value = getattr(args, name)
+
+            if value is not None:
+                setattr(self, name, value)
+
+    def es_other_options(self) -> dict[str, type]:
+        # The options that do not have their own entry in from_command_line().
+        handled: set[str] = {"parasnake_config", "server_mode", "target_fitness", "target_fitness2",
+            "node_population_size", "num_of_mutations", "num_of_iterations", "population_kind",
+            "randomize_population", "mutation_operations", "randomize_count", "min_num_ind",
+            "sine_base", "sine_amplitude", "sine_frequency", "limit_range", "user_options"}
+
+        return {name: type(value) for (name, value) in vars(self).items()
+            if (name not in handled) and isinstance(value, (bool, int, float, str))}
@@ -0,0 +1,108 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines crossover operators for list based genomes.
+They can be used to implement ESIndividual.es_crossover().
+All functions return a new list and leave the parents unchanged.
+"""
+
+# Python std lib:
+import logging
+
+# Local imports:
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+
+def es_uniform_crossover(parent1: list, parent2: list) -> list:
+    # Each element is taken from one of the parents with the same probability.
+    child: list = parent1[:]
+
+    for i in range(len(child)):
+        if utils.es_rand_int(2) == 1:
+            child[i] = parent2[i]
+
+    return child
+
+
+def es_n_point_crossover(parent1: list, parent2: list, n: int) -> list:
+    # Choose n cut points and alternate between the parents.
+    num_elems: int = len(parent1)
+
+    if n < 1:
+        raise ValueError(f"Number of cut points must be at least 1, {n}")
+
+    points: list[int] = sorted({utils.es_rand_int(num_elems) for _ in range(n)})
+    points.append(num_elems)
+
+    child: list = []
+    parents: tuple[list, list] = (parent1, parent2)
+    current: int = 0
+    start: int = 0
+
+    for end in points:
+        child.extend(parents[current][start:end])
+        current = 1 - current
+        start = end
+
+    return child
+
+
+def es_random_segment(num_elems: int) -> tuple[int, int]:
+    # Returns the start and end (exclusive) of a random segment.
+    i1: int = utils.es_rand_int(num_elems)
+    i2: int = utils.es_rand_int(num_elems)
+
+    if i1 > i2:
+        (i1, i2) = (i2, i1)
+
+    return (i1, i2 + 1)
+
+
+def es_order_crossover(parent1: list, parent2: list) -> list:
+    # Order crossover (OX) for permutations:
+    # A segment is copied from the first parent, the remaining elements
+    # are filled in the order they appear in the second parent.
+    # The elements must be hashable.
+    num_elems: int = len(parent1)
+    (start, end) = es_random_segment(num_elems)
+
+    segment: list = parent1[start:end]
+    in_segment: set = set(segment)
+    remaining: list = [e for e in parent2 if e not in in_segment]
+
+    return remaining[:start] + segment + remaining[start:]
+
+
+def es_pmx_crossover(parent1: list, parent2: list) -> list:
+    # Partially mapped crossover (PMX) for permutations:
+    # A segment is copied from the first parent, the other positions are
+    # taken from the second parent, conflicts are resolved using the mapping
+    # defined by the segment.
+    # The elements must be hashable.
+    num_elems: int = len(parent1)
+    (start, end) = es_random_segment(num_elems)
+
+    child: list = parent2[:]
+    mapping: dict = {}
+
+    for i in range(start, end):
+        child[i] = parent1[i]
+        mapping[parent1[i]] = parent2[i]
+
+    for i in range(num_elems):
+        if start <= i < end:
+            continue
+
+        elem = child[i]
+
+        while elem in mapping:
+            elem = mapping[elem]
+
+        child[i] = elem
+
+    return child
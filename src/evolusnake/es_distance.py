@@ -0,0 +1,51 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines distance functions for list based genomes.
+They can be used to implement ESIndividual.es_distance(), which is needed
+for niching on the server.
+"""
+
+# Python std lib:
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+def es_hamming_distance(genome1: list, genome2: list) -> float:
+    # Number of positions with different values.
+    return float(sum(1 for (a, b) in zip(genome1, genome2) if a != b))
+
+
+def es_euclidean_distance(genome1: list[float], genome2: list[float]) -> float:
+    return math.dist(genome1, genome2)
+
+
+def es_permutation_distance(genome1: list, genome2: list) -> float:
+    # Number of neighbours (edges) in the first permutation that are not
+    # neighbours in the second one. Both are treated as closed tours,
+    # so rotated and reversed permutations have a distance of 0.
+    num_elems: int = len(genome1)
+
+    if num_elems < 2:
+        return 0.0
+
+    edges: set[tuple] = set()
+
+    for i in range(num_elems):
+        a = genome2[i - 1]
+        b = genome2[i]
+        edges.add((a, b))
+        edges.add((b, a))
+
+    distance: int = 0
+
+    for i in range(num_elems):
+        if (genome1[i - 1], genome1[i]) not in edges:
+            distance += 1
+
+    return float(distance)
@@ -0,0 +1,70 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines a bounded LRU cache for fitness values.
+The key is the genome hash provided by ESIndividual.es_genome_hash().
+"""
+
+# Python std lib:
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ESFitnessCache:
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError(f"Fitness cache size must be at least 1, {max_size}")
+
+        self.max_size: int = max_size
+        self.cache: OrderedDict[int, float] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def es_lookup(self, key: int) -> Optional[float]:
+        # Returns the cached fitness or None if the key is unknown.
+        fitness: Optional[float] = self.cache.get(key)
+
+        if fitness is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.cache.move_to_end(key)
+
+        return fitness
+
+    def es_store(self, key: int, fitness: float):
+        self.cache[key] = fitness
+        self.cache.move_to_end(key)
+
+        if len(self.cache) > self.max_size:
+            # Remove the least recently used entry:
+            self.cache.popitem(last=False)
+
+    def es_invalidate(self):
+        # Must be called when the fitness landscape changes,
+        # for example when a new mini batch is used.
+        self.cache.clear()
+        self.invalidations += 1
+
+    def es_hit_rate(self) -> float:
+        total: int = self.hits + self.misses
+
+        if total == 0:
+            return 0.0
+
+        return self.hits / total
+
+    def es_reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.cache)
@@ -0,0 +1,112 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines a compact binary history of all the results.
+Each record has a fixed size: time stamp, node id, fitness, fitness2 and
+whether the result has been accepted.
+Records are collected in memory and written in bulk.
+The history can be loaded into NumPy arrays for convergence plots.
+"""
+
+# Python std lib:
+import logging
+import os
+import struct
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ES_HISTORY_MAGIC: bytes = b"ESHIST01"
+# time, node id (UUID bytes), fitness, fitness2, accepted:
+ES_HISTORY_RECORD: struct.Struct = struct.Struct("<d16sdd?")
+
+
+class ESHistoryRecorder:
+    def __init__(self, filename: str, buffer_size: int = 4096, resume: bool = False):
+        if buffer_size < 1:
+            raise ValueError(f"History buffer size must be at least 1, {buffer_size}")
+
+        self.filename: str = filename
+        # Number of records that are kept in memory before they are written:
+        self.buffer_size: int = buffer_size
+        self.buffer: bytearray = bytearray()
+        self.buffer_count: int = 0
+        self.total_count: int = 0
+
+        if resume and self.es_valid_file():
+            # Keep the history of the job that is resumed:
+            self.es_truncate_incomplete()
+        else:
+            # A new history for each job:
+            with open(self.filename, "wb") as f:
+                f.write(ES_HISTORY_MAGIC)
+
+        logger.debug(f"{self.filename=}, {self.buffer_size=}, {resume=}")
+
+    def es_valid_file(self) -> bool:
+        if not os.path.isfile(self.filename):
+            return False
+
+        with open(self.filename, "rb") as f:
+            return f.read(len(ES_HISTORY_MAGIC)) == ES_HISTORY_MAGIC
+
+    def es_truncate_incomplete(self):
+        # Remove an incomplete record at the end (crash while writing),
+        # otherwise all the new records would be shifted.
+        data_size: int = os.path.getsize(self.filename) - len(ES_HISTORY_MAGIC)
+        num_of_records: int = data_size // ES_HISTORY_RECORD.size
+
+        if num_of_records * ES_HISTORY_RECORD.size != data_size:
+            logger.warning("Incomplete record in history %s, removed.", self.filename)
+
+            with open(self.filename, "r+b") as f:
+                f.truncate(len(ES_HISTORY_MAGIC) + (num_of_records * ES_HISTORY_RECORD.size))
+
+    def es_record(self, node_id: bytes, fitness: float, fitness2: float, accepted: bool):
+        self.buffer += ES_HISTORY_RECORD.pack(time.time(), node_id, fitness, fitness2, accepted)
+        self.buffer_count += 1
+
+        if self.buffer_count >= self.buffer_size:
+            self.es_flush()
+
+    def es_flush(self):
+        if self.buffer_count == 0:
+            return
+
+        with open(self.filename, "ab") as f:
+            f.write(self.buffer)
+
+        self.total_count += self.buffer_count
+        self.buffer = bytearray()
+        self.buffer_count = 0
+
+
+def es_read_history(filename: str) -> dict[str, Any]:
+    # Returns one NumPy array for each column:
+    # "time", "node_id", "fitness", "fitness2" and "accepted".
+    # The node ids are raw bytes, use uuid.UUID(bytes=bytes(node_id)).
+    # NumPy is only needed for reading the history.
+    import numpy as np
+
+    dtype = np.dtype([("time", "<f8"), ("node_id", "V16"), ("fitness", "<f8"),
+        ("fitness2", "<f8"), ("accepted", "?")])
+
+    assert dtype.itemsize == ES_HISTORY_RECORD.size
+
+    with open(filename, "rb") as f:
+        magic: bytes = f.read(len(ES_HISTORY_MAGIC))
+
+        if magic != ES_HISTORY_MAGIC:
+            raise ValueError(f"Not a history file: {filename}")
+
+        data: bytes = f.read()
+
+    # Ignore an incomplete record at the end:
+    num_of_records: int = len(data) // dtype.itemsize
+    records = np.frombuffer(data, dtype=dtype, count=num_of_records)
+
+    return {name: records[name].copy() for name in dtype.names}
@@ -9,7 +9,7 @@ This module defines the base data class for an individual.
 
 # Python std lib:
 import logging
-from typing import Self
+from typing import Self, Optional, Any
 from sys import float_info
 from collections import Counter
 
@@ -20,7 +20,17 @@ class ESIndividual:
     def __init__(self):
         self.fitness: float = float_info.max
         self.fitness2: float = float_info.max
+        # The genome has changed since fitness2 has been calculated.
+        self.fitness2_dirty: bool = True
         self.mut_op_counter: Counter = Counter()
+        # The fitness epoch in which the fitness has been calculated.
+        # Only fitness values from the same epoch can be compared.
+        self.fitness_epoch: int = 0
+        # All objectives for multi-objective optimization (minimized).
+        self.objectives: list[float] = []
+        # Messages from the server to the node and back (see es_scheduler).
+        self.server_message: dict = {}
+        self.node_message: dict = {}
 
     def es_reset_counter(self):
         # Resets the mutation counter.
@@ -31,6 +41,22 @@ class ESIndividual:
         # each mutation operation has been used.
         self.mut_op_counter[mut_op] += 1
         self.es_mutate(mut_op)
+        self.es_genome_changed()
+
+    def es_randomize_internal(self):
+        self.es_randomize()
+        self.es_genome_changed()
+
+    def es_genome_changed(self):
+        # The old fitness2 is no longer valid.
+        self.fitness2 = float_info.max
+        self.fitness2_dirty = True
+
+    def es_calculate_fitness2_internal(self):
+        # Only calculate fitness2 once for each version of the genome.
+        if self.fitness2_dirty:
+            self.es_calculate_fitness2()
+            self.fitness2_dirty = False
 
     def es_mutate(self, mut_op: int):
         # Must be implemented by the user.
@@ -40,10 +66,86 @@ class ESIndividual:
         # Must be implemented by the user.
         raise NotImplementedError
 
+    def es_crossover(self, other) -> Self:
+        # Returns a new individual that combines this and the other individual.
+        # See the module es_crossover for some common operators.
+        # Must be implemented by the user for crossover based population kinds.
+        raise NotImplementedError
+
     def es_calculate_fitness(self):
         # Must be implemented by the user.
         raise NotImplementedError
 
+    def es_calculate_fitness_batch(self, individuals: list[Self]):
+        # Calculates the fitness of all the given individuals (including this one).
+        # Used for the initial population (see es_parallel).
+        # Can be implemented by the user if the fitness of many individuals
+        # can be calculated faster at once (GPU, NumPy, ...).
+        for ind in individuals:
+            ind.es_calculate_fitness()
+
+    def es_get_evaluated_state(self) -> Any:
+        # Everything that the fitness calculation has changed, it's sent back
+        # from the worker process to the original individual (see es_parallel).
+        # Must be implemented by the user if the fitness calculation also
+        # updates other attributes (cached values, ...).
+        return self.fitness
+
+    def es_set_evaluated_state(self, state: Any):
+        # Counterpart of es_get_evaluated_state().
+        self.fitness = state
+
+    def es_use_fitness_data(self, other):
+        # Use the data of the other individual (data set, mini batch, ...)
+        # for the next fitness calculations.
+        # Called on the server for noisy fitness, so that all results are
+        # compared on the data of the server and not on the data of the node.
+        # Must be implemented by the user if the individual carries its own data.
+        pass
+
+    def es_genome_hash(self) -> Optional[int]:
+        # This method can be implemented to enable the fitness cache.
+        # Individuals with the same genome must return the same hash value.
+        # If None is returned the fitness is always calculated.
+        return None
+
+    def es_distance(self, other) -> float:
+        # Returns the distance between the genomes of this and the other individual.
+        # See the module es_distance for some common distance functions.
+        # Must be implemented by the user if niching is enabled on the server.
+        raise NotImplementedError
+
+    def es_calculate_objectives(self):
+        # This method can be implemented for multi-objective optimization.
+        # It's called right after es_calculate_fitness(), so self.fitness is
+        # already set (the primary objective) and must not be calculated again.
+        # It must set self.objectives.
+        # By default the two fitness values are used as objectives.
+        self.es_calculate_fitness2()
+        self.objectives = [self.fitness, self.fitness2]
+
+    def es_get_vector(self) -> list[float]:
+        # Returns the genome as a list of floats.
+        # Must be implemented by the user for vector based population kinds.
+        raise NotImplementedError
+
+    def es_set_vector(self, values: list[float]):
+        # Sets the genome from a list of floats.
+        # Must be implemented by the user for vector based population kinds.
+        raise NotImplementedError
+
+    def es_vector_bounds(self) -> tuple[float, float]:
+        # Lower and upper bound for all the values in the vector.
+        # Can be implemented by the user.
+        return (-float_info.max, float_info.max)
+
+    def es_calculate_fitness_matrix(self, matrix: Any) -> Any:
+        # Calculates the fitness of each row in the given NumPy matrix
+        # with the shape (population_size, dimensions) and returns a NumPy array
+        # with all the fitness values.
+        # Must be implemented by the user for the vectorized population kind.
+        raise NotImplementedError
+
     def es_calculate_fitness2(self):
         # This method can be implemented if there is a second target
         # that should be met.
@@ -57,8 +159,18 @@ class ESIndividual:
         clone.mut_op_counter = Counter(self.mut_op_counter)
         clone.fitness = self.fitness
         clone.fitness2 = self.fitness2
+        clone.fitness2_dirty = self.fitness2_dirty
+        clone.fitness_epoch = self.fitness_epoch
+        clone.objectives = self.objectives[:]
         return clone
 
+    def es_crossover_internal(self, other) -> Self:
+        # Crossover internal structures.
+        # The child keeps the statistics of both parents.
+        child = self.es_crossover(other)
+        child.mut_op_counter = self.mut_op_counter + other.mut_op_counter
+        return child
+
     def es_clone(self) -> Self:
         # Clont this individual.
         # Must be implemented by the user.
@@ -79,6 +191,24 @@ class ESIndividual:
         # Must be implemented by the user.
         raise NotImplementedError
 
+    def es_to_json_internal(self) -> dict:
+        # Convert this individual including the fitness values to a JSON object.
+        data: dict = self.es_to_json()
+        data["fitness"] = self.fitness
+        data["fitness2"] = self.fitness2
+        data["fitness2_dirty"] = self.fitness2_dirty
+        data["objectives"] = self.objectives
+        return data
+
+    def es_from_json_internal(self, data: dict):
+        # Restore this individual including the fitness values,
+        # no need to calculate the fitness again.
+        self.es_from_json(data)
+        self.fitness = data["fitness"]
+        self.fitness2 = data["fitness2"]
+        self.fitness2_dirty = data.get("fitness2_dirty", True)
+        self.objectives = data["objectives"]
+
     def es_actual_fitness(self) -> float:
         # This fitness will be printed.
         # Change it to the actual fitness if needed.
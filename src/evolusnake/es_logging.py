@@ -0,0 +1,52 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module sets up asynchronous logging to a file.
+Log records are put into a queue and written to the file by a background
+thread, so disk writes never block the evolution.
+"""
+
+# Python std lib:
+import logging
+import logging.handlers
+import atexit
+import queue
+
+ES_LOG_FORMAT: str = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+
+def es_setup_logging(filename: str, level: int = logging.INFO,
+        log_format: str = ES_LOG_FORMAT) -> logging.handlers.QueueListener:
+    # Replaces logging.basicConfig(filename=...) in the main function.
+    # The listener is stopped (and all remaining records are written)
+    # when the program exits.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    file_handler: logging.FileHandler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter(log_format))
+
+    listener: logging.handlers.QueueListener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True)
+
+    root_logger: logging.Logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # These are too verbose for debugging evolusnake:
+    logging.getLogger("asyncio").setLevel(logging.WARNING)
+    logging.getLogger("parasnake").setLevel(logging.WARNING)
+
+    listener.start()
+    atexit.register(listener.stop)
+
+    return listener
+
+
+def es_stop_logging(listener: logging.handlers.QueueListener):
+    # Writes all remaining log records and stops the background thread.
+    # Only needed if logging should stop before the program exits.
+    atexit.unregister(listener.stop)
+    listener.stop()
@@ -0,0 +1,249 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines counters, gauges and histograms for nodes and the server.
+The metrics can be exported to a JSONL file or served as Prometheus text
+on a local port.
+If no metrics are configured, no ESMetrics object is created at all,
+so the population and the server only check for None.
+"""
+
+# Python std lib:
+import logging
+import json
+import time
+import threading
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+
+logger = logging.getLogger(__name__)
+
+# Metric name and label, the label can be empty:
+ESMetricKey = tuple[str, str]
+
+
+class ESHistogram:
+    # Upper bounds for the buckets in seconds:
+    BUCKETS: tuple[float, ...] = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+    def __init__(self):
+        self.count: int = 0
+        self.total: float = 0.0
+        self.minimum: float = 0.0
+        self.maximum: float = 0.0
+        self.bucket_counts: list[int] = [0] * (len(self.BUCKETS) + 1)
+
+    def es_observe(self, value: float):
+        if self.count == 0:
+            self.minimum = value
+            self.maximum = value
+        else:
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+
+        self.count += 1
+        self.total += value
+
+        for (i, bound) in enumerate(self.BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                return
+
+        self.bucket_counts[-1] += 1
+
+    def es_to_dict(self) -> dict:
+        mean: float = 0.0
+
+        if self.count > 0:
+            mean = self.total / self.count
+
+        return {"count": self.count, "sum": self.total, "min": self.minimum,
+            "max": self.maximum, "mean": mean, "buckets": self.bucket_counts[:]}
+
+
+class ESMetrics:
+    def __init__(self, source: str, filename: str = "", interval: float = 10.0):
+        # source: "node" or "server", written to every record.
+        self.source: str = source
+        self.filename: str = filename
+        self.interval: float = interval
+        self.start_time: float = time.time()
+        self.last_export: float = self.start_time
+        self.lock: threading.Lock = threading.Lock()
+
+        self.counters: dict[ESMetricKey, float] = {}
+        self.gauges: dict[ESMetricKey, float] = {}
+        self.histograms: dict[ESMetricKey, ESHistogram] = {}
+
+        self.http_server: Optional["ThreadingHTTPServer"] = None
+
+        logger.debug(f"{self.source=}, {self.filename=}, {self.interval=}")
+
+    def es_increment(self, name: str, value: float = 1.0, label: str = ""):
+        key: ESMetricKey = (name, label)
+
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def es_set_gauge(self, name: str, value: float, label: str = ""):
+        with self.lock:
+            self.gauges[(name, label)] = value
+
+    def es_observe(self, name: str, value: float, label: str = ""):
+        key: ESMetricKey = (name, label)
+
+        with self.lock:
+            histogram: Optional[ESHistogram] = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = ESHistogram()
+                self.histograms[key] = histogram
+
+            histogram.es_observe(value)
+
+    def es_get_counter(self, name: str, label: str = "") -> float:
+        return self.counters.get((name, label), 0.0)
+
+    def es_snapshot(self) -> dict:
+        # All metrics as a JSON compatible dict.
+        # For each counter also the rate per second is provided.
+        now: float = time.time()
+        elapsed: float = max(now - self.start_time, 1e-9)
+
+        counters: dict = {}
+        rates: dict = {}
+        gauges: dict = {}
+        histograms: dict = {}
+
+        with self.lock:
+            for ((name, label), value) in self.counters.items():
+                counters.setdefault(name, {})[label] = value
+                rates.setdefault(name, {})[label] = value / elapsed
+
+            for ((name, label), value) in self.gauges.items():
+                gauges.setdefault(name, {})[label] = value
+
+            for ((name, label), histogram) in self.histograms.items():
+                histograms.setdefault(name, {})[label] = histogram.es_to_dict()
+
+        return {"time": now, "source": self.source, "elapsed": elapsed,
+            "counters": counters, "rates": rates, "gauges": gauges, "histograms": histograms}
+
+    def es_write_jsonl(self, filename: str):
+        # Append one line with the current snapshot.
+        line: str = json.dumps(self.es_snapshot())
+
+        with open(filename, "a") as f:
+            f.write(line + "\n")
+
+    def es_export(self):
+        # Writes a new snapshot if the interval has passed.
+        # Can be called on every exchange.
+        if not self.filename:
+            return
+
+        now: float = time.time()
+
+        if (now - self.last_export) >= self.interval:
+            self.last_export = now
+            self.es_write_jsonl(self.filename)
+
+    def es_prometheus_text(self) -> str:
+        # Prometheus text exposition format.
+        lines: list[str] = []
+        elapsed: float = max(time.time() - self.start_time, 1e-9)
+
+        def format_name(name: str, label: str, extra: str = "") -> str:
+            labels: list[str] = [f"source=\"{self.source}\""]
+
+            if label:
+                labels.append(f"label=\"{label}\"")
+
+            if extra:
+                labels.append(extra)
+
+            return f"evolusnake_{name}{{{','.join(labels)}}}"
+
+        with self.lock:
+            for ((name, label), value) in sorted(self.counters.items()):
+                lines.append(f"{format_name(name + '_total', label)} {value}")
+                lines.append(f"{format_name(name + '_per_second', label)} {value / elapsed}")
+
+            for ((name, label), value) in sorted(self.gauges.items()):
+                lines.append(f"{format_name(name, label)} {value}")
+
+            for ((name, label), histogram) in sorted(self.histograms.items(), key=lambda item: item[0]):
+                cumulative: int = 0
+
+                for (i, bound) in enumerate(ESHistogram.BUCKETS):
+                    cumulative += histogram.bucket_counts[i]
+                    bucket_name: str = format_name(name + "_bucket", label, f"le=\"{bound}\"")
+                    lines.append(f"{bucket_name} {cumulative}")
+
+                bucket_name = format_name(name + "_bucket", label, "le=\"+Inf\"")
+                lines.append(f"{bucket_name} {histogram.count}")
+                lines.append(f"{format_name(name + '_sum', label)} {histogram.total}")
+                lines.append(f"{format_name(name + '_count', label)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def es_start_http_server(self, port: int):
+        # Serves the Prometheus text on the given local port in a background thread.
+        # Only import the HTTP server when it's used, it slows down the startup:
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        metrics: ESMetrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body: bytes = metrics.es_prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Do not spam the log with every request.
+                pass
+
+        try:
+            self.http_server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        except OSError as e:
+            logger.error(f"Could not start metrics server on port {port}: {e}")
+            return
+
+        thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+        thread.start()
+
+        logger.info(f"Metrics available at http://127.0.0.1:{port}/metrics")
+
+    def es_stop_http_server(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+            self.http_server = None
+
+
+def es_create_metrics(config: ESConfiguration, source: str) -> Optional[ESMetrics]:
+    # Returns None if metrics are disabled.
+    if (not config.metrics_filename) and (config.metrics_port == 0):
+        return None
+
+    if config.metrics_interval < 0.0:
+        raise ValueError(f"Metrics interval must not be negative, {config.metrics_interval}")
+
+    metrics: ESMetrics = ESMetrics(source, config.metrics_filename, config.metrics_interval)
+
+    if config.metrics_port > 0:
+        metrics.es_start_http_server(config.metrics_port)
+
+    return metrics
@@ -0,0 +1,79 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the parallel evaluation of a whole population.
+It's used for the initial populations of the server and the nodes.
+The individuals are split into chunks, each chunk is evaluated in a
+process pool with ESIndividual.es_calculate_fitness_batch() and only the
+evaluated state (es_get_evaluated_state(), by default the fitness) is
+sent back. The progress is logged after each chunk.
+The individuals must be picklable (they are already sent to the server).
+"""
+
+# Python std lib:
+import logging
+import math
+import os
+from typing import Any
+
+# Local imports:
+from evolusnake.es_individual import ESIndividual
+
+logger = logging.getLogger(__name__)
+
+# Number of chunks for each worker, more chunks means more progress reports:
+ES_CHUNKS_PER_WORKER: int = 4
+
+
+def es_evaluate_chunk(individuals: list[ESIndividual]) -> list[Any]:
+    # Runs in the worker process.
+    individuals[0].es_calculate_fitness_batch(individuals)
+    return [ind.es_get_evaluated_state() for ind in individuals]
+
+
+def es_evaluate_population(individuals: list[ESIndividual], num_of_workers: int = 0):
+    # Calculates the fitness of all the given individuals.
+    # num_of_workers: 0 means one worker for each CPU, 1 evaluates all individuals in this process.
+    if num_of_workers < 0:
+        raise ValueError(f"Number of workers must not be negative, {num_of_workers}")
+
+    num_of_individuals: int = len(individuals)
+
+    if num_of_individuals == 0:
+        return
+
+    num_of_workers = num_of_workers or (os.cpu_count() or 1)
+    num_of_workers = min(num_of_workers, num_of_individuals)
+
+    if num_of_workers == 1:
+        individuals[0].es_calculate_fitness_batch(individuals)
+        return
+
+    # Only import it when it's used, it slows down the startup of a node:
+    from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+
+    chunk_size: int = math.ceil(num_of_individuals / (num_of_workers * ES_CHUNKS_PER_WORKER))
+    evaluated: int = 0
+
+    logger.info("Evaluate %d individuals with %d workers", num_of_individuals, num_of_workers)
+
+    with ProcessPoolExecutor(num_of_workers) as executor:
+        futures: dict[Future, int] = {}
+
+        for start in range(0, num_of_individuals, chunk_size):
+            future: Future = executor.submit(es_evaluate_chunk, individuals[start:start + chunk_size])
+            futures[future] = start
+
+        for future in as_completed(futures):
+            start = futures[future]
+            states: list[Any] = future.result()
+
+            for (i, state) in enumerate(states):
+                individuals[start + i].es_set_evaluated_state(state)
+
+            evaluated += len(states)
+            logger.info("Evaluated %d / %d individuals (%.0f%%)", evaluated, num_of_individuals,
+                100.0 * evaluated / num_of_individuals)
@@ -0,0 +1,102 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines helper functions for multi-objective optimization:
+Pareto dominance, fast non-dominated sorting and crowding distance (NSGA-II).
+All objectives are minimized.
+"""
+
+# Python std lib:
+import logging
+from sys import float_info
+
+logger = logging.getLogger(__name__)
+
+
+def es_dominates(objectives1: list[float], objectives2: list[float]) -> bool:
+    # Returns True if objectives1 is not worse in all objectives and
+    # better in at least one objective.
+    better: bool = False
+
+    for (o1, o2) in zip(objectives1, objectives2):
+        if o1 > o2:
+            return False
+        elif o1 < o2:
+            better = True
+
+    return better
+
+
+def es_non_dominated_sort(objectives: list[list[float]]) -> list[list[int]]:
+    # Fast non-dominated sorting.
+    # Returns a list of fronts, each front is a list of indices.
+    # The first front contains all the non-dominated indices.
+    num_elems: int = len(objectives)
+    dominated_by: list[list[int]] = [[] for _ in range(num_elems)]
+    domination_count: list[int] = [0] * num_elems
+
+    for i in range(num_elems):
+        for j in range(i + 1, num_elems):
+            if es_dominates(objectives[i], objectives[j]):
+                dominated_by[i].append(j)
+                domination_count[j] += 1
+            elif es_dominates(objectives[j], objectives[i]):
+                dominated_by[j].append(i)
+                domination_count[i] += 1
+
+    fronts: list[list[int]] = [[i for i in range(num_elems) if domination_count[i] == 0]]
+    current: int = 0
+
+    while fronts[current]:
+        next_front: list[int] = []
+
+        for i in fronts[current]:
+            for j in dominated_by[i]:
+                domination_count[j] -= 1
+                if domination_count[j] == 0:
+                    next_front.append(j)
+
+        fronts.append(next_front)
+        current += 1
+
+    # The last front is always empty:
+    fronts.pop()
+
+    return fronts
+
+
+def es_crowding_distance(objectives: list[list[float]], front: list[int]) -> dict[int, float]:
+    # Returns the crowding distance for each index in the given front.
+    # The boundary individuals get the maximum distance.
+    distance: dict[int, float] = {i: 0.0 for i in front}
+
+    if len(front) < 3:
+        for i in front:
+            distance[i] = float_info.max
+        return distance
+
+    num_objectives: int = len(objectives[front[0]])
+
+    for m in range(num_objectives):
+        sorted_front: list[int] = sorted(front, key=lambda i: objectives[i][m])
+        lowest: float = objectives[sorted_front[0]][m]
+        highest: float = objectives[sorted_front[-1]][m]
+
+        distance[sorted_front[0]] = float_info.max
+        distance[sorted_front[-1]] = float_info.max
+
+        value_range: float = highest - lowest
+
+        if value_range <= 0.0:
+            continue
+
+        for k in range(1, len(sorted_front) - 1):
+            i: int = sorted_front[k]
+            if distance[i] < float_info.max:
+                diff: float = objectives[sorted_front[k + 1]][m] - objectives[sorted_front[k - 1]][m]
+                distance[i] += diff / value_range
+
+    return distance
@@ -10,15 +10,35 @@ This module defines the base data class for a population.
 # Python std lib:
 import logging
 import time
+from typing import Optional, Protocol
+from sys import float_info
+from collections import Counter
 
 # Local imports
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_config import ESConfiguration
+from evolusnake.es_fitness_cache import ESFitnessCache
+from evolusnake.es_metrics import ESMetrics, es_create_metrics
+from evolusnake.es_checkpoint import ESCheckpoint
+from evolusnake.es_parallel import es_evaluate_population
 import evolusnake.es_utils as utils
 
 logger = logging.getLogger(__name__)
 
 
+class ESPopulationView(Protocol):
+    # The part of a population that the iteration callback can use.
+    # ESPopulation implements it and the population kinds that do not
+    # use ESPopulation (12, 13) as well.
+    @property
+    def population(self) -> list[ESIndividual]: ...
+
+    @property
+    def fitness_epoch(self) -> int: ...
+
+    def es_new_fitness_epoch(self): ...
+
+
 class ESIterationCallBack:
     def __init__(self):
         pass
@@ -29,22 +49,34 @@ class ESIterationCallBack:
         # A value of 3 means 33.33% and 66.66% and so on.
         return 1
 
-    def es_before_iteration(self, population: "ESPopulation"):
+    def es_before_iteration(self, population: ESPopulationView):
         # This method is called just before the iteration starts.
         pass
 
-    def es_fraction_iteration(self, population: "ESPopulation"):
+    def es_fraction_iteration(self, population: ESPopulationView):
         # This method is called when the specified fraction of the iteration counter is reached.
         pass
 
-    def es_after_of_iteration(self, population: "ESPopulation"):
+    def es_after_of_iteration(self, population: ESPopulationView):
         # This method is called after the end of the whole iteration.
         pass
 
+    def es_phase_times(self, population: ESPopulationView, phase_times: Counter, phase_calls: Counter):
+        # This method is called at the end of each ps_process_data() if profile_phases is enabled.
+        # phase_times contains the total time in nanoseconds for each phase
+        # (mutate, evaluate, clone, selection, fitness2, ...), phase_calls how often
+        # each phase has been entered.
+        pass
+
 
 class ESPopulation:
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
-            iteration_callback: ESIterationCallBack):
+            iteration_callback: ESIterationCallBack, deferred: bool = False,
+            calculate_objectives: bool = False):
+        # deferred: do not create the population here, the node calls
+        # es_seed_population() with the first individual from the server.
+        # calculate_objectives: call es_calculate_objectives() after each fitness
+        # calculation (multi-objective population kinds).
         if config.node_population_size < 2:
             raise ValueError(f"Node population must be at least 2, {config.node_population_size}")
 
@@ -57,14 +89,62 @@ class ESPopulation:
         if not config.mutation_operations:
             raise ValueError("There should at least be one mutation operation")
 
+        if config.early_exit_delay < 0.0:
+            raise ValueError(f"Early exit delay must not be negative, {config.early_exit_delay}")
+
+        self.fitness_cache: Optional[ESFitnessCache] = None
+        self.fitness_epoch: int = 0
+        self.calculate_objectives: bool = calculate_objectives
+        self.metrics: Optional[ESMetrics] = es_create_metrics(config, "node")
+        # Mutation operations since the last fitness calculation (only used for metrics):
+        self.pending_mut_ops: list[int] = []
+        self.exchange_start: float = time.perf_counter()
+        # Time spent in each phase (in ns) for one ps_process_data() call:
+        self.profile_phases: bool = config.profile_phases
+        self.phase_times: Counter = Counter()
+        self.phase_calls: Counter = Counter()
+
+        if config.fitness_cache_size > 0:
+            self.fitness_cache = ESFitnessCache(config.fitness_cache_size)
+
         self.population_size: int = config.node_population_size
         self.population: list[ESIndividual] = []
+        self.randomize_iteration: int = 0
+        # Adaptive state of the population node (global_fitness, ...),
+        # saved in the checkpoint together with the population:
+        self.node_state: dict = {}
+        self.checkpoint: Optional[ESCheckpoint] = None
+        self.checkpoint_interval: int = config.node_checkpoint_interval
+        self.checkpoint_counter: int = 0
+
+        if config.node_checkpoint_filename:
+            if self.checkpoint_interval < 1:
+                raise ValueError(f"Node checkpoint interval must be at least 1, {self.checkpoint_interval}")
+
+            self.checkpoint = ESCheckpoint(config.node_checkpoint_filename, 1)
+
+            if self.checkpoint.es_exists():
+                # Warm start, no need to evaluate the population again:
+                self.es_load_checkpoint(individual)
+
+        # Needed to create new individuals in es_seed_population():
+        self.initial_individual: ESIndividual = individual
+
+        self.init_workers: int = config.init_workers
+        self.early_exit_delay: float = config.early_exit_delay
 
-        for _ in range(self.population_size):
+        if self.init_workers < 0:
+            raise ValueError(f"Number of init workers must not be negative, {self.init_workers}")
+
+        new_individuals: list[ESIndividual] = []
+
+        while (not deferred) and (len(self.population) + len(new_individuals) < self.population_size):
             ind: ESIndividual = individual.es_clone()
-            ind.es_randomize()
-            ind.es_calculate_fitness()
-            self.population.append(ind)
+            ind.es_randomize_internal()
+            new_individuals.append(ind)
+
+        self.es_calculate_fitness_all(new_individuals)
+        self.population.extend(new_individuals)
 
         self.num_of_iterations: int = config.num_of_iterations
         self.half_iterations: int = int(self.num_of_iterations / 2)
@@ -74,6 +154,10 @@ class ESPopulation:
         self.randomize_count: int = config.randomize_count
         self.target_fitness: float = config.target_fitness
         self.target_fitness2: float = config.target_fitness2
+        self.noisy_fitness: bool = config.noisy_fitness
+        self.reevaluate_top_k: int = config.reevaluate_top_k
+        self.fitness2_threshold: float = config.fitness2_threshold
+        self.fitness2_top_k: int = config.fitness2_top_k
 
         self.best_index: int = 0
         self.worst_index: int = 0
@@ -88,75 +172,303 @@ class ESPopulation:
         self.fraction_iterations: int = int(self.num_of_iterations / self.fraction_value)
 
         # Init random number generator:
-        utils.es_init_seed()
+        utils.es_init_seed(config.random_seed)
 
         logger.debug(f"{self.population_size=}, {self.target_fitness=}, {self.target_fitness2=}")
         logger.debug(f"{self.num_of_iterations=}, {self.num_of_mutations=}")
         logger.debug(f"{self.randomize_population=}, {self.randomize_count=}")
         logger.debug(f"{self.accept_new_best=}, {self.mutation_operations=}")
+        logger.debug(f"{config.fitness_cache_size=}")
+        logger.debug(f"{self.noisy_fitness=}, {self.reevaluate_top_k=}")
+        logger.debug(f"{self.fitness2_threshold=}, {self.fitness2_top_k=}")
 
         self.mutation_operations = self.mutation_operations * 10
         self.mutation_operations_len: int = len(self.mutation_operations)
         self.es_shuffle_mutation_operations()
 
-        self.randomize_iteration: int = 0
-
     def es_find_worst_individual(self):
         self.worst_index = 0
-        worst_fitness: float = self.population[0].fitness
 
         for i in range(1, self.population_size):
-            fitness: float = self.population[i].fitness
-            if fitness > worst_fitness:
-                worst_fitness = fitness
+            if self.es_is_better(self.population[self.worst_index], self.population[i]):
                 self.worst_index = i
 
     def es_find_best_and_worst_individual(self):
         self.worst_index = 0
-        worst_fitness: float = self.population[0].fitness
         self.best_index = 0
-        best_fitness: float = self.population[0].fitness
 
         for i in range(1, self.population_size):
-            fitness: float = self.population[i].fitness
-            if fitness > worst_fitness:
-                worst_fitness = fitness
+            ind: ESIndividual = self.population[i]
+            if self.es_is_better(self.population[self.worst_index], ind):
                 self.worst_index = i
-            elif fitness < best_fitness:
-                best_fitness = fitness
+            elif self.es_is_better(ind, self.population[self.best_index]):
                 self.best_index = i
 
+    def es_phase_start(self) -> int:
+        # Returns the start time for es_phase_end() if profiling is enabled.
+        if self.profile_phases:
+            return time.perf_counter_ns()
+        return 0
+
+    def es_phase_end(self, phase: str, start: int):
+        if self.profile_phases:
+            self.phase_times[phase] += time.perf_counter_ns() - start
+            self.phase_calls[phase] += 1
+
+    def es_reset_phase_times(self):
+        self.phase_times.clear()
+        self.phase_calls.clear()
+
+    def es_clone_individual(self, ind: ESIndividual) -> ESIndividual:
+        if (self.metrics is None) and (not self.profile_phases):
+            return ind.es_clone_internal()
+
+        start: int = time.perf_counter_ns()
+        clone: ESIndividual = ind.es_clone_internal()
+        self.es_phase_end("clone", start)
+
+        if self.metrics is not None:
+            # The rate of clones is the number of clones per second:
+            self.metrics.es_increment("clones")
+            self.metrics.es_observe("clone_seconds", (time.perf_counter_ns() - start) * 1e-9)
+
+        return clone
+
+    def es_mutate_individual(self, ind: ESIndividual, num_of_mutations: int):
+        if (self.metrics is None) and (not self.profile_phases):
+            for _ in range(num_of_mutations):
+                ind.es_mutate_internal(self.es_get_mut_op())
+            return
+
+        start: int = time.perf_counter_ns()
+        for _ in range(num_of_mutations):
+            ind.es_mutate_internal(self.es_get_mut_op())
+        self.es_phase_end("mutate", start)
+
+        if self.metrics is not None:
+            self.metrics.es_increment("mutations", num_of_mutations)
+            self.metrics.es_observe("mutate_seconds", (time.perf_counter_ns() - start) * 1e-9)
+
     def es_sort_population(self):
-        self.population.sort(key=lambda ind: ind.fitness)
+        # Individuals with a stale fitness are moved to the end:
+        epoch: int = self.fitness_epoch
+
+        if (self.metrics is None) and (not self.profile_phases):
+            self.population.sort(key=lambda ind: (ind.fitness_epoch != epoch, ind.fitness))
+            return
+
+        start: int = time.perf_counter_ns()
+        self.population.sort(key=lambda ind: (ind.fitness_epoch != epoch, ind.fitness))
+        self.es_phase_end("selection", start)
+
+        if self.metrics is not None:
+            self.metrics.es_observe("sort_seconds", (time.perf_counter_ns() - start) * 1e-9)
+
+    def es_calculate_fitness(self, ind: ESIndividual):
+        # Calculate the fitness of the given individual.
+        if (self.metrics is None) and (not self.profile_phases):
+            self.es_calculate_fitness_cached(ind)
+
+            if self.calculate_objectives:
+                ind.es_calculate_objectives()
+            return
+
+        previous_fitness: float = ind.fitness
+        start: int = time.perf_counter_ns()
+        self.es_calculate_fitness_cached(ind)
+
+        if self.calculate_objectives:
+            ind.es_calculate_objectives()
+
+        self.es_phase_end("evaluate", start)
+
+        if self.metrics is None:
+            return
+
+        self.metrics.es_observe("evaluate_seconds", (time.perf_counter_ns() - start) * 1e-9)
+        self.metrics.es_increment("evaluations")
+
+        if self.pending_mut_ops:
+            # A mutation is accepted if it improves the fitness.
+            # A new individual from es_crossover() has not been evaluated yet,
+            # so there is no fitness to compare with and it's not counted.
+            if previous_fitness < float_info.max:
+                name: str = "mutations_accepted" if ind.fitness < previous_fitness else "mutations_rejected"
+
+                for mut_op in self.pending_mut_ops:
+                    self.metrics.es_increment(name, label=str(mut_op))
+
+            self.pending_mut_ops.clear()
+
+    def es_calculate_fitness_all(self, individuals: list[ESIndividual]):
+        # Calculate the fitness of many individuals, in parallel if init_workers is not 1.
+        if self.init_workers == 1:
+            for ind in individuals:
+                self.es_calculate_fitness(ind)
+            return
+
+        # The same bookkeeping as es_calculate_fitness(), only the individuals
+        # that are not in the fitness cache are evaluated in parallel:
+        start: int = time.perf_counter_ns()
+        missing: list[ESIndividual] = []
+        keys: list[Optional[int]] = []
+
+        for ind in individuals:
+            ind.fitness_epoch = self.fitness_epoch
+            key: Optional[int] = None
+
+            if self.fitness_cache is not None:
+                key = ind.es_genome_hash()
+                fitness: Optional[float] = None if key is None else self.fitness_cache.es_lookup(key)
+
+                if fitness is not None:
+                    ind.fitness = fitness
+                    continue
+
+            missing.append(ind)
+            keys.append(key)
+
+        es_evaluate_population(missing, self.init_workers)
+
+        if self.fitness_cache is not None:
+            for (ind, key) in zip(missing, keys):
+                if key is not None:
+                    self.fitness_cache.es_store(key, ind.fitness)
+
+        if self.calculate_objectives:
+            for ind in individuals:
+                ind.es_calculate_objectives()
+
+        self.es_phase_end("evaluate", start)
+
+        if self.metrics is not None:
+            self.metrics.es_increment("evaluations", len(individuals))
+
+    def es_calculate_fitness_cached(self, ind: ESIndividual):
+        # If the fitness cache is enabled, look it up first.
+        ind.fitness_epoch = self.fitness_epoch
+
+        if self.fitness_cache is None:
+            ind.es_calculate_fitness()
+            return
+
+        key: Optional[int] = ind.es_genome_hash()
+
+        if key is None:
+            ind.es_calculate_fitness()
+            return
+
+        fitness: Optional[float] = self.fitness_cache.es_lookup(key)
+
+        if fitness is None:
+            ind.es_calculate_fitness()
+            self.fitness_cache.es_store(key, ind.fitness)
+        else:
+            ind.fitness = fitness
+
+    def es_invalidate_fitness_cache(self):
+        # Must be called when the fitness landscape changes.
+        if self.fitness_cache is not None:
+            self.fitness_cache.es_invalidate()
+
+    def es_new_fitness_epoch(self):
+        # Must be called when the fitness landscape changes, for example
+        # when a new mini batch is used.
+        # Only the best reevaluate_top_k individuals are re-evaluated
+        # (all if it's 0). The others keep their stale fitness and will be
+        # replaced by new offspring.
+        self.fitness_epoch += 1
+        self.es_invalidate_fitness_cache()
+
+        indices: list[int] = list(range(self.population_size))
+
+        if 0 < self.reevaluate_top_k < self.population_size:
+            indices.sort(key=lambda i: self.population[i].fitness)
+            indices = indices[:self.reevaluate_top_k]
+
+        for i in indices:
+            self.es_calculate_fitness(self.population[i])
+
+    def es_is_stale(self, ind: ESIndividual) -> bool:
+        # The fitness has been calculated in a previous epoch.
+        return ind.fitness_epoch != self.fitness_epoch
+
+    def es_is_better(self, ind1: ESIndividual, ind2: ESIndividual) -> bool:
+        # Only fitness values from the same epoch can be compared,
+        # an individual with a stale fitness is always worse.
+        if ind1.fitness_epoch != ind2.fitness_epoch:
+            return not self.es_is_stale(ind1)
+
+        return ind1.fitness < ind2.fitness
+
+    def es_is_complete(self) -> bool:
+        # False if the population has been deferred and not seeded yet.
+        return len(self.population) >= self.population_size
+
+    def es_seed_population(self, seeds: list[ESIndividual]):
+        # Creates the missing individuals from the given individuals (from the server)
+        # instead of random ones: first a copy of each, then mutated copies.
+        logger.debug("Seed population from %d individuals", len(seeds))
+
+        i: int = 0
+
+        while len(self.population) < self.population_size:
+            ind: ESIndividual = self.initial_individual.es_clone()
+            ind.es_from_server(seeds[i % len(seeds)])
+
+            if i >= len(seeds):
+                self.es_mutate_individual(ind, self.num_of_mutations)
+
+            self.es_calculate_fitness(ind)
+            self.population.append(ind)
+            i += 1
 
     def es_random_population(self):
         for ind in self.population:
             ind.es_reset_counter()
-            ind.es_randomize()
-            ind.es_calculate_fitness()
+            ind.es_randomize_internal()
+            self.es_calculate_fitness(ind)
 
     def es_randomize_or_accept_best(self, best: ESIndividual):
+        if best.server_message.get("restart", False):
+            # The server has detected that this node is stagnant:
+            logger.debug("Restart signal from server, randomize population...")
+            self.randomize_iteration = 0
+            self.es_random_population()
+            return
+
         if self.randomize_population:
             self.randomize_iteration += 1
             if self.randomize_iteration >= self.randomize_count:
                 self.randomize_iteration = 0
                 logger.debug("Randomize counter reached, randomzte population...")
                 self.es_random_population()
-            logger.debug(f"{self.randomize_iteration=}")
+            logger.debug("randomize_iteration=%d", self.randomize_iteration)
         elif self.accept_new_best:
             self.population[0].es_from_server(best)
+            # Same genome, so fitness2 does not have to be calculated again:
+            self.population[0].fitness2 = best.fitness2
+            self.population[0].fitness2_dirty = best.fitness2_dirty
+            self.population[0].objectives = best.objectives[:]
+
+            if self.noisy_fitness:
+                # The fitness from the server has been calculated on a different
+                # data set, so calculate it again here:
+                self.es_calculate_fitness(self.population[0])
+            elif self.calculate_objectives and (not best.objectives):
+                self.population[0].es_calculate_objectives()
 
     def es_shuffle_mutation_operations(self):
         utils.es_shuffle_list(self.mutation_operations)
 
     def es_randomize_worst(self):
         worst = self.population[self.worst_index]
-        worst.es_randomize()
-        worst.es_calculate_fitness()
+        worst.es_randomize_internal()
+        self.es_calculate_fitness(worst)
         # Now maybe no longer the worst!
 
     def es_replace_best(self, individual: ESIndividual):
-        if individual.fitness < self.population[self.best_index].fitness:
+        if self.es_is_better(individual, self.population[self.best_index]):
             self.population[self.best_index] = individual
         # Still the best at index: self.best_index!
 
@@ -166,6 +478,7 @@ class ESPopulation:
 
     def es_clone_best_to_worst(self):
         ind = self.population[self.best_index].es_clone()
+        ind.fitness_epoch = self.population[self.best_index].fitness_epoch
         self.population[self.worst_index] = ind
         # Now no longer the worst!
 
@@ -175,74 +488,185 @@ class ESPopulation:
     def es_get_best_fitness(self) -> float:
         return self.population[self.best_index].fitness
 
+    def es_get_worst(self) -> ESIndividual:
+        return self.population[self.worst_index]
+
     def es_get_worst_fitness(self) -> float:
         return self.population[self.worst_index].fitness
 
+    def es_tournament_select(self, tournament_size: int) -> ESIndividual:
+        # Pick tournament_size random individuals and return the best one.
+        best: ESIndividual = self.population[utils.es_rand_int(self.population_size)]
+
+        for _ in range(1, tournament_size):
+            ind: ESIndividual = self.population[utils.es_rand_int(self.population_size)]
+            if self.es_is_better(ind, best):
+                best = ind
+
+        return best
+
     def es_get_mut_op(self) -> int:
         self.mut_op_index += 1
 
         if self.mut_op_index >= self.mutation_operations_len:
             self.mut_op_index = 0
 
-        return self.mutation_operations[self.mut_op_index]
+        mut_op: int = self.mutation_operations[self.mut_op_index]
+
+        if self.metrics is not None:
+            self.pending_mut_ops.append(mut_op)
+
+        return mut_op
 
     def es_check_limit(self, ind: ESIndividual, limit: float, i: int):
-        if (ind.fitness < limit) or (ind.fitness < self.population[i].fitness):
+        if (ind.fitness < limit) or self.es_is_better(ind, self.population[i]):
             self.population[i] = ind
 
     def es_early_exit(self, iteration: int):
-        logger.info(f"Early exit at iteration {iteration}")
+        logger.info("Early exit at iteration %d", iteration)
         self.minimum_found = True
 
         if iteration == 0:
             # Wait some seconds to avoid spamming the server.
-            time.sleep(5)
+            time.sleep(self.early_exit_delay)
 
     def es_calculate_fitness2(self):
+        start: int = self.es_phase_start()
         fitness2_list: list = []
+        candidates: list[int] = [i for i in range(self.population_size)
+            if self.population[i].fitness < self.fitness2_threshold]
 
-        for i in range(self.population_size):
+        if self.fitness2_top_k > 0:
+            # Only the best candidates:
+            candidates.sort(key=lambda i: self.population[i].fitness)
+            candidates = candidates[:self.fitness2_top_k]
+
+        for i in candidates:
             ind: ESIndividual = self.population[i]
-            if ind.fitness < 0.01:
-                ind.es_calculate_fitness2()
-                fitness2_list.append((ind.fitness2, i))
+            # Only calculated if the genome has changed:
+            ind.es_calculate_fitness2_internal()
+            fitness2_list.append((ind.fitness2, i))
 
         if fitness2_list:
             fitness2_list.sort(key=lambda x: x[0])
             index: int = fitness2_list[0][1]
 
             if index != self.best_index:
-                ind1: ESIndividual = self.population[self.best_index]
-                fitness_1a: float = ind1.fitness
-                fitness_2a: float = ind1.fitness2
-                ind2: ESIndividual = self.population[index]
-                fitness_1b: float = ind2.fitness
-                fitness_2b: float = ind2.fitness2
-
-                logger.debug(f"{self.best_index=}, {index=}")
-                logger.debug(f"{fitness_1a=}, {fitness_1b=}")
-                logger.debug(f"{fitness_2a=}, {fitness_2b=}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    ind1: ESIndividual = self.population[self.best_index]
+                    ind2: ESIndividual = self.population[index]
+                    logger.debug("best_index=%d, index=%d", self.best_index, index)
+                    logger.debug("fitness_1a=%s, fitness_1b=%s", ind1.fitness, ind2.fitness)
+                    logger.debug("fitness_2a=%s, fitness_2b=%s", ind1.fitness2, ind2.fitness2)
 
                 self.best_index = index
 
+        self.es_phase_end("fitness2", start)
+
+    def es_report_phase_times(self):
+        total: int = sum(self.phase_times.values())
+        debug_enabled: bool = logger.isEnabledFor(logging.DEBUG)
+
+        for (phase, phase_time) in self.phase_times.most_common():
+            if debug_enabled:
+                percent: float = (100.0 * phase_time) / max(total, 1)
+                logger.debug("Phase %s: %.3f ms, %.1f %%, calls: %d",
+                    phase, phase_time * 1e-6, percent, self.phase_calls[phase])
+
+            if self.metrics is not None:
+                self.metrics.es_increment("phase_seconds", phase_time * 1e-9, label=phase)
+
+        self.iteration_callback.es_phase_times(self, self.phase_times, self.phase_calls)
+        self.es_reset_phase_times()
+
+    def es_load_checkpoint(self, individual: ESIndividual):
+        assert self.checkpoint is not None
+
+        records: list[dict] = self.checkpoint.es_read()
+
+        if not records:
+            logger.warning("Invalid node checkpoint %s, start from scratch.", self.checkpoint.filename)
+            return
+
+        state: dict = records[-1]
+
+        if len(state["population"]) != self.population_size:
+            logger.warning("Population size in node checkpoint does not match, start from scratch: %d",
+                len(state["population"]))
+            return
+
+        self.fitness_epoch = state["fitness_epoch"]
+        self.randomize_iteration = state["randomize_iteration"]
+        self.node_state = state["node_state"]
+
+        for data in state["population"]:
+            ind: ESIndividual = individual.es_clone()
+            ind.es_from_json_internal(data)
+            ind.fitness_epoch = self.fitness_epoch
+            self.population.append(ind)
+
+        logger.info("Warm start from node checkpoint %s", self.checkpoint.filename)
+
+    def es_save_checkpoint(self):
+        # Called once for each ps_process_data(), the checkpoint is only written
+        # every checkpoint_interval calls.
+        if self.checkpoint is None:
+            return
+
+        self.checkpoint_counter += 1
+
+        if self.checkpoint_counter < self.checkpoint_interval:
+            return
+
+        self.checkpoint_counter = 0
+
+        state: dict = {
+            "population": [ind.es_to_json_internal() for ind in self.population],
+            "fitness_epoch": self.fitness_epoch,
+            "randomize_iteration": self.randomize_iteration,
+            "node_state": self.node_state,
+        }
+
+        self.checkpoint.es_write_snapshot(state)
+        logger.debug("Node checkpoint written: %s", self.checkpoint.filename)
+
     def es_log_statistics(self):
         best_individual: ESIndividual = self.population[self.best_index]
-        best_fitness: float = best_individual.fitness
-        best_fitness2: float = best_individual.fitness2
         worst_individual: ESIndividual = self.population[self.worst_index]
-        worst_fitness: float = worst_individual.fitness
-        worst_fitness2: float = worst_individual.fitness2
-        actual_best: float = best_individual.es_actual_fitness()
-        actual_worst: float = worst_individual.es_actual_fitness()
-        logger.debug(f"{best_fitness=}, {best_fitness2=}")
-        logger.debug(f"{worst_fitness=}, {worst_fitness2=}")
-        logger.debug(f"{actual_best=}, {actual_worst=}")
-        logger.debug(f"Best individual mutations: {best_individual.mut_op_counter}")
-        logger.debug(f"Worst individual mutations: {worst_individual.mut_op_counter}")
+
+        # Only build the log messages if they are written:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("best_fitness=%s, best_fitness2=%s", best_individual.fitness, best_individual.fitness2)
+            logger.debug("worst_fitness=%s, worst_fitness2=%s", worst_individual.fitness, worst_individual.fitness2)
+            logger.debug("actual_best=%s, actual_worst=%s",
+                best_individual.es_actual_fitness(), worst_individual.es_actual_fitness())
+            logger.debug("Best individual mutations: %s", best_individual.mut_op_counter)
+            logger.debug("Worst individual mutations: %s", worst_individual.mut_op_counter)
+
+            if self.fitness_cache is not None:
+                cache: ESFitnessCache = self.fitness_cache
+                logger.debug("Fitness cache: hit_rate=%s, hits=%d, misses=%d, invalidations=%d",
+                    cache.es_hit_rate(), cache.hits, cache.misses, cache.invalidations)
+
+        if self.profile_phases:
+            self.es_report_phase_times()
+
+        if self.metrics is not None:
+            self.metrics.es_increment("exchanges")
+            self.metrics.es_observe("exchange_seconds", time.perf_counter() - self.exchange_start)
+            self.metrics.es_set_gauge("best_fitness", best_individual.fitness)
+            self.metrics.es_set_gauge("worst_fitness", worst_individual.fitness)
+
+            if self.fitness_cache is not None:
+                self.metrics.es_set_gauge("fitness_cache_hit_rate", self.fitness_cache.es_hit_rate())
+
+            self.metrics.es_export()
 
         best_individual.es_new_best_individual()
+        self.es_save_checkpoint()
 
     def es_before_iteration(self):
+        self.exchange_start = time.perf_counter()
         self.iteration_callback.es_before_iteration(self)
 
     def es_fraction_iteration(self):
@@ -11,65 +11,52 @@ This module defines the class for population type 1.
 import logging
 from typing import override
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode1(PSNode):
+class ESPopulationNode1(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 1")
         logger.info("Clone population and mutate individuals in place. Then sort population by fitness.")
         logger.info("The worst individuals are overwritten.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
-
-        self.population = ESPopulation(config, individual, iteration_callback)
-        self.population.es_sort_population()
+        super().__init__(config, individual, iteration_callback)
 
         self.offset: int = int(self.population.population_size / 2)
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode1.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
+    def es_init_node(self):
+        self.population.es_sort_population()
 
-        self.population.es_randomize_or_accept_best(data)
-        self.population.es_shuffle_mutation_operations()
+    @override
+    def es_before_steps(self):
+        # The population is always sorted:
         self.population.best_index = 0
         self.population.worst_index = self.population.population_size - 1
 
-        self.population.es_before_iteration()
-
-        for i in range(self.population.num_of_iterations):
-            self.population.es_fraction_iteration()
-
-            # Create a copy of each individual before mutating it:
-            for j in range(self.offset):
-                ind: ESIndividual = self.population.population[j]
-                self.population.population[j + self.offset] = ind.es_clone_internal()
-
-                # Now mutate the original individual:
-                for _ in range(self.population.num_of_mutations):
-                    ind.es_mutate_internal(self.population.es_get_mut_op())
-                ind.es_calculate_fitness()
+    @override
+    def es_step(self, iteration: int):
+        # Create a copy of each individual before mutating it:
+        for j in range(self.offset):
+            ind: ESIndividual = self.population.population[j]
+            self.population.population[j + self.offset] = self.population.es_clone_individual(ind)
 
-            self.population.es_sort_population()
+            # Now mutate the original individual:
+            self.population.es_mutate_individual(ind, self.population.num_of_mutations)
+            self.population.es_calculate_fitness(ind)
 
-            if self.population.population[0].fitness <= self.population.target_fitness:
-                self.population.es_early_exit(i)
-                break
+        self.population.es_sort_population()
 
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
-        return self.population.es_get_best()
+        if self.population.population[0].fitness <= self.population.target_fitness:
+            self.population.es_early_exit(iteration)
 
+    @override
+    def es_after_steps(self):
+        pass
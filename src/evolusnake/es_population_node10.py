@@ -11,64 +11,48 @@ This module defines the class for population type 10.
 import logging
 from typing import override
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode10(PSNode):
+class ESPopulationNode10(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 10")
         logger.info("Sort population, take the best individual and")
         logger.info("clone and mutate it. Duplicates are allowed.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
-
-        self.population = ESPopulation(config, individual, iteration_callback)
+        super().__init__(config, individual, iteration_callback)
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode10.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
-
-        self.population.es_randomize_or_accept_best(data)
-        self.population.es_shuffle_mutation_operations()
+    def es_before_steps(self):
         self.population.es_sort_population()
         self.population.best_index = 0
         self.population.worst_index = self.population.population_size - 1
 
-        self.population.es_before_iteration()
-
-        for i in range(self.population.num_of_iterations):
-            self.population.es_fraction_iteration()
-
-            best_ind: ESIndividual = self.population.population[0]
-
-            if best_ind.fitness <= self.population.target_fitness:
-                self.population.es_early_exit(i)
-                break
+    @override
+    def es_step(self, iteration: int):
+        best_ind: ESIndividual = self.population.population[0]
 
-            for j in range(1, self.population.population_size):
-                new_ind: ESIndividual = best_ind.es_clone_internal()
+        if best_ind.fitness <= self.population.target_fitness:
+            self.population.es_early_exit(iteration)
+            return
 
-                for _ in range(self.population.num_of_mutations):
-                    new_ind.es_mutate_internal(self.population.es_get_mut_op())
-                new_ind.es_calculate_fitness()
+        for j in range(1, self.population.population_size):
+            new_ind: ESIndividual = self.population.es_clone_individual(best_ind)
 
-                self.population.population[j] = new_ind
+            self.population.es_mutate_individual(new_ind, self.population.num_of_mutations)
+            self.population.es_calculate_fitness(new_ind)
 
-            self.population.es_sort_population()
+            self.population.population[j] = new_ind
 
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
-        return self.population.es_get_best()
+        self.population.es_sort_population()
 
+    @override
+    def es_after_steps(self):
+        pass
@@ -12,68 +12,38 @@ import logging
 from typing import override
 import math
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode11(PSNode):
+class ESPopulationNode11(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 11")
         logger.info("Use a sine wave for the fitness limit.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
-
-        self.population = ESPopulation(config, individual, iteration_callback)
+        super().__init__(config, individual, iteration_callback)
         self.sine_base: float = config.sine_base
         self.sine_amplitude: float = config.sine_amplitude
         self.sine_frequency: float = config.sine_frequency
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode11.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
-
-        self.population.es_randomize_or_accept_best(data)
-        self.population.es_shuffle_mutation_operations()
-        self.population.minimum_found = False
-
-        current_limit: float = 0.0
-
-        self.population.es_before_iteration()
+    def es_step(self, iteration: int):
+        current_limit: float = self.sine_base + (self.sine_amplitude * math.sin(self.sine_frequency * iteration))
 
-        for i in range(self.population.num_of_iterations):
-            self.population.es_fraction_iteration()
+        for j in range(self.population.population_size):
+            ind: ESIndividual = self.population.es_clone_individual(self.population.population[j])
 
-            current_limit = self.sine_base + (self.sine_amplitude * math.sin(self.sine_frequency * i))
+            self.population.es_mutate_individual(ind, self.population.num_of_mutations)
+            self.population.es_calculate_fitness(ind)
 
-            for j in range(self.population.population_size):
-                ind: ESIndividual = self.population.population[j].es_clone_internal()
+            self.population.es_check_limit(ind, current_limit, j)
 
-                for _ in range(self.population.num_of_mutations):
-                    ind.es_mutate_internal(self.population.es_get_mut_op())
-                ind.es_calculate_fitness()
-
-                self.population.es_check_limit(ind, current_limit, j)
-
-                if ind.fitness < self.population.target_fitness:
-                    self.population.es_early_exit(i)
-                    break
-
-            if self.population.minimum_found:
+            if ind.fitness < self.population.target_fitness:
+                self.population.es_early_exit(iteration)
                 break
-
-        self.population.es_find_best_and_worst_individual()
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
-        return self.population.es_get_best()
-
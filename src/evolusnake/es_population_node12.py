@@ -0,0 +1,347 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the class for population type 12.
+The whole population is stored as one NumPy matrix.
+There are no ESPopulation and no individual objects here, so the iteration
+callback gets this node instead (see ESPopulationView). Its population property
+creates the individuals from the matrix and es_new_fitness_epoch() evaluates
+the whole matrix again.
+Profiling, metrics and the node checkpoint work like in ESPopulation,
+the phases are mutate, evaluate and selection and the checkpoint contains
+the matrix.
+"""
+
+# Python std lib:
+import logging
+import time
+from typing import override, Optional
+from collections import Counter
+
+# External imports:
+from parasnake.ps_node import PSNode
+import numpy as np
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_metrics import ESMetrics, es_create_metrics
+from evolusnake.es_checkpoint import ESCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+class ESPopulationNode12(PSNode):
+    def __init__(self, config: ESConfiguration, individual: ESIndividual,
+            iteration_callback: ESIterationCallBack = ESIterationCallBack()):
+        logger.info("Init population node type 12")
+        logger.info("Store the whole population as one matrix (population_size, dimensions).")
+        logger.info("Mutate, evaluate and select all individuals at once using array operations.")
+        logger.info("The better half is kept, the worse half is overwritten by mutated copies.")
+
+        super().__init__(config.parasnake_config)
+        logger.debug(f"Node ID: {self.node_id}")
+
+        if config.node_population_size < 2:
+            raise ValueError(f"Node population must be at least 2, {config.node_population_size}")
+
+        if config.num_of_iterations < 1:
+            raise ValueError(f"Number of iterations must be at least 1, {config.num_of_iterations}")
+
+        if config.num_of_mutations < 1:
+            raise ValueError(f"Number of mutations must be at least 1, {config.num_of_mutations}")
+
+        if config.vector_sigma <= 0.0:
+            raise ValueError(f"Vector sigma must be greater than 0.0, {config.vector_sigma}")
+
+        if config.early_exit_delay < 0.0:
+            raise ValueError(f"Early exit delay must not be negative, {config.early_exit_delay}")
+
+        self.individual: ESIndividual = individual.es_clone()
+        self.population_size: int = config.node_population_size
+        self.num_of_iterations: int = config.num_of_iterations
+        self.num_of_mutations: int = config.num_of_mutations
+        self.target_fitness: float = config.target_fitness
+        self.accept_new_best: bool = config.accept_new_best
+        self.randomize_population: bool = config.randomize_population
+        self.randomize_count: int = config.randomize_count
+        self.randomize_iteration: int = 0
+        self.sigma: float = config.vector_sigma
+        self.noisy_fitness: bool = config.noisy_fitness
+        self.early_exit_delay: float = config.early_exit_delay
+        self.fitness_epoch: int = 0
+        self.minimum_found: bool = False
+
+        self.iteration_callback = iteration_callback
+        self.iteration_counter: int = 0
+        self.fraction_iterations: int = int(self.num_of_iterations / iteration_callback.es_get_iteration_factor())
+
+        self.metrics: Optional[ESMetrics] = es_create_metrics(config, "node")
+        self.exchange_start: float = time.perf_counter()
+        # Time spent in each phase (in ns) for one ps_process_data() call:
+        self.profile_phases: bool = config.profile_phases
+        self.phase_times: Counter = Counter()
+        self.phase_calls: Counter = Counter()
+
+        (self.lower_bound, self.upper_bound) = self.individual.es_vector_bounds()
+
+        # Init random number generator:
+        self.rng = np.random.default_rng(config.random_seed or int(time.time()))
+
+        self.checkpoint: Optional[ESCheckpoint] = None
+        self.checkpoint_interval: int = config.node_checkpoint_interval
+        self.checkpoint_counter: int = 0
+
+        if config.node_checkpoint_filename:
+            if self.checkpoint_interval < 1:
+                raise ValueError(f"Node checkpoint interval must be at least 1, {self.checkpoint_interval}")
+
+            self.checkpoint = ESCheckpoint(config.node_checkpoint_filename, 1)
+
+        if (self.checkpoint is None) or (not self.es_load_checkpoint()):
+            self.matrix = self.es_random_matrix()
+            self.fitness = self.es_calculate_fitness(self.matrix)
+
+        self.dimensions: int = self.matrix.shape[1]
+
+        # Number of mutated values per row (on average):
+        self.mutation_rate: float = min(1.0, self.num_of_mutations / self.dimensions)
+
+        self.parent_size: int = self.population_size - (self.population_size // 2)
+        self.child_size: int = self.population_size // 2
+
+        logger.debug(f"{self.population_size=}, {self.dimensions=}, {self.target_fitness=}")
+        logger.debug(f"{self.num_of_iterations=}, {self.num_of_mutations=}, {self.sigma=}")
+        logger.debug(f"{self.lower_bound=}, {self.upper_bound=}")
+
+    def es_random_matrix(self):
+        rows: list[list[float]] = []
+
+        for _ in range(self.population_size):
+            ind: ESIndividual = self.individual.es_clone()
+            ind.es_randomize()
+            # The individual may share its vector with the clones, so copy it:
+            rows.append(list(ind.es_get_vector()))
+
+        return np.array(rows, dtype=np.float64)
+
+    def es_calculate_fitness(self, matrix):
+        start: int = time.perf_counter_ns()
+        fitness = np.asarray(self.individual.es_calculate_fitness_matrix(matrix), dtype=np.float64)
+        self.es_phase_end("evaluate", start)
+
+        if self.metrics is not None:
+            self.metrics.es_increment("evaluations", len(matrix))
+            self.metrics.es_observe("evaluate_seconds", (time.perf_counter_ns() - start) * 1e-9)
+
+        return fitness
+
+    def es_phase_end(self, phase: str, start: int):
+        if self.profile_phases:
+            self.phase_times[phase] += time.perf_counter_ns() - start
+            self.phase_calls[phase] += 1
+
+    @property
+    def population(self) -> list[ESIndividual]:
+        # The rows of the matrix as individuals, for the iteration callback.
+        # Changing them does not change the matrix.
+        result: list[ESIndividual] = []
+
+        for (row, fitness) in zip(self.matrix, self.fitness):
+            ind: ESIndividual = self.individual.es_clone()
+            ind.es_set_vector(row.tolist())
+            ind.fitness = float(fitness)
+            ind.fitness_epoch = self.fitness_epoch
+            result.append(ind)
+
+        return result
+
+    def es_random_population(self):
+        self.matrix = self.es_random_matrix()
+        self.fitness = self.es_calculate_fitness(self.matrix)
+
+    def es_new_fitness_epoch(self):
+        # Must be called when the fitness landscape changes (see ESPopulation).
+        # All the rows are evaluated again, it's only one call.
+        self.fitness_epoch += 1
+        self.fitness = self.es_calculate_fitness(self.matrix)
+
+    def es_randomize_or_accept_best(self, best: ESIndividual):
+        if best.server_message.get("restart", False):
+            # The server has detected that this node is stagnant:
+            logger.debug("Restart signal from server, randomize population...")
+            self.randomize_iteration = 0
+            self.es_random_population()
+            return
+
+        if self.randomize_population:
+            self.randomize_iteration += 1
+            if self.randomize_iteration >= self.randomize_count:
+                self.randomize_iteration = 0
+                logger.debug("Randomize counter reached, randomize population...")
+                self.es_random_population()
+        elif self.accept_new_best:
+            worst: int = int(np.argmax(self.fitness))
+            self.matrix[worst] = best.es_get_vector()
+
+            if self.noisy_fitness:
+                # The fitness from the server has been calculated on a different
+                # data set, so calculate it again here:
+                self.fitness[worst] = self.es_calculate_fitness(self.matrix[worst:worst + 1])[0]
+            else:
+                self.fitness[worst] = best.fitness
+
+    def es_fraction_iteration(self):
+        self.iteration_counter += 1
+        if self.iteration_counter > self.fraction_iterations:
+            self.iteration_counter = 0
+            self.iteration_callback.es_fraction_iteration(self)
+
+    def es_get_best(self) -> ESIndividual:
+        best: int = int(np.argmin(self.fitness))
+
+        ind: ESIndividual = self.individual.es_clone()
+        ind.es_set_vector(self.matrix[best].tolist())
+        ind.fitness = float(self.fitness[best])
+
+        return ind
+
+    @override
+    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
+        logger.debug("ESPopulationNode12.ps_process_data()")
+        logger.debug("Individual from server: %s", data.fitness)
+
+        self.es_randomize_or_accept_best(data)
+        self.minimum_found = False
+
+        shape: tuple[int, int] = (self.child_size, self.dimensions)
+
+        self.exchange_start = time.perf_counter()
+        self.iteration_callback.es_before_iteration(self)
+
+        for i in range(self.num_of_iterations):
+            self.es_fraction_iteration()
+
+            start: int = time.perf_counter_ns()
+            order = np.argsort(self.fitness)
+            parents = self.matrix[order[:self.parent_size]]
+            parent_fitness = self.fitness[order[:self.parent_size]]
+            self.es_phase_end("selection", start)
+
+            # Mutate copies of the best individuals:
+            start = time.perf_counter_ns()
+            noise = self.rng.standard_normal(shape) * self.sigma
+            mask = self.rng.random(shape) < self.mutation_rate
+            children = parents[:self.child_size] + (noise * mask)
+            np.clip(children, self.lower_bound, self.upper_bound, out=children)
+            self.es_phase_end("mutate", start)
+
+            child_fitness = self.es_calculate_fitness(children)
+
+            # The worse half is overwritten:
+            self.matrix = np.concatenate((parents, children))
+            self.fitness = np.concatenate((parent_fitness, child_fitness))
+
+            if child_fitness.min() <= self.target_fitness:
+                logger.info("Early exit at iteration %d", i)
+                self.minimum_found = True
+
+                if i == 0:
+                    # Wait some seconds to avoid spamming the server.
+                    time.sleep(self.early_exit_delay)
+                break
+
+        self.iteration_callback.es_after_of_iteration(self)
+
+        best_ind: ESIndividual = self.es_get_best()
+        best_ind.es_calculate_fitness2()
+
+        worst_fitness: float = float(self.fitness.max())
+        logger.debug("best_ind.fitness=%s, best_ind.fitness2=%s, worst_fitness=%s",
+            best_ind.fitness, best_ind.fitness2, worst_fitness)
+
+        if self.profile_phases:
+            self.es_report_phase_times()
+
+        if self.metrics is not None:
+            self.metrics.es_increment("exchanges")
+            self.metrics.es_observe("exchange_seconds", time.perf_counter() - self.exchange_start)
+            self.metrics.es_set_gauge("best_fitness", best_ind.fitness)
+            self.metrics.es_set_gauge("worst_fitness", worst_fitness)
+            self.metrics.es_export()
+
+        best_ind.es_new_best_individual()
+        self.es_save_checkpoint()
+        return best_ind
+
+    def es_report_phase_times(self):
+        total: int = sum(self.phase_times.values())
+        debug_enabled: bool = logger.isEnabledFor(logging.DEBUG)
+
+        for (phase, phase_time) in self.phase_times.most_common():
+            if debug_enabled:
+                percent: float = (100.0 * phase_time) / max(total, 1)
+                logger.debug("Phase %s: %.3f ms, %.1f %%, calls: %d",
+                    phase, phase_time * 1e-6, percent, self.phase_calls[phase])
+
+            if self.metrics is not None:
+                self.metrics.es_increment("phase_seconds", phase_time * 1e-9, label=phase)
+
+        self.iteration_callback.es_phase_times(self, self.phase_times, self.phase_calls)
+        self.phase_times.clear()
+        self.phase_calls.clear()
+
+    def es_load_checkpoint(self) -> bool:
+        # Returns False if there is no valid checkpoint.
+        assert self.checkpoint is not None
+
+        if not self.checkpoint.es_exists():
+            return False
+
+        records: list[dict] = self.checkpoint.es_read()
+
+        if not records:
+            logger.warning("Invalid node checkpoint %s, start from scratch.", self.checkpoint.filename)
+            return False
+
+        state: dict = records[-1]
+
+        if len(state["matrix"]) != self.population_size:
+            logger.warning("Population size in node checkpoint does not match, start from scratch: %d",
+                len(state["matrix"]))
+            return False
+
+        self.matrix = np.array(state["matrix"], dtype=np.float64)
+        self.fitness = np.array(state["fitness"], dtype=np.float64)
+        self.fitness_epoch = state["fitness_epoch"]
+        self.randomize_iteration = state["randomize_iteration"]
+
+        logger.info("Warm start from node checkpoint %s", self.checkpoint.filename)
+        return True
+
+    def es_save_checkpoint(self):
+        # Called once for each ps_process_data(), the checkpoint is only written
+        # every checkpoint_interval calls.
+        if self.checkpoint is None:
+            return
+
+        self.checkpoint_counter += 1
+
+        if self.checkpoint_counter < self.checkpoint_interval:
+            return
+
+        self.checkpoint_counter = 0
+
+        state: dict = {
+            "matrix": self.matrix.tolist(),
+            "fitness": self.fitness.tolist(),
+            "fitness_epoch": self.fitness_epoch,
+            "randomize_iteration": self.randomize_iteration,
+        }
+
+        self.checkpoint.es_write_snapshot(state)
+        logger.debug("Node checkpoint written: %s", self.checkpoint.filename)
@@ -0,0 +1,260 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the class for population type 13.
+A (mu/mu, lambda) evolution strategy with self-adaptive step size
+and IPOP restarts for continuous problems.
+There is no ESPopulation here, so the iteration callback gets this node
+instead (see ESPopulationView). Its population property only contains
+the best individual of the current ps_process_data() call and
+es_new_fitness_epoch() evaluates it again.
+"""
+
+# Python std lib:
+import logging
+import math
+import time
+from typing import override
+from sys import float_info
+
+# External imports:
+from parasnake.ps_node import PSNode
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+
+class ESPopulationNode13(PSNode):
+    def __init__(self, config: ESConfiguration, individual: ESIndividual,
+            iteration_callback: ESIterationCallBack = ESIterationCallBack()):
+        logger.info("Init population node type 13")
+        logger.info("(mu/mu, lambda) evolution strategy with self-adaptive step size.")
+        logger.info("Create lambda offspring around the mean of the mu best individuals.")
+        logger.info("Restart with a doubled population if the search stagnates (IPOP).")
+
+        super().__init__(config.parasnake_config)
+        logger.debug(f"Node ID: {self.node_id}")
+
+        if config.node_population_size < 2:
+            raise ValueError(f"Node population must be at least 2, {config.node_population_size}")
+
+        if config.num_of_iterations < 1:
+            raise ValueError(f"Number of iterations must be at least 1, {config.num_of_iterations}")
+
+        if config.vector_sigma <= 0.0:
+            raise ValueError(f"Vector sigma must be greater than 0.0, {config.vector_sigma}")
+
+        if config.restart_stagnation < 1:
+            raise ValueError(f"Restart stagnation must be at least 1, {config.restart_stagnation}")
+
+        if config.early_exit_delay < 0.0:
+            raise ValueError(f"Early exit delay must not be negative, {config.early_exit_delay}")
+
+        self.individual: ESIndividual = individual.es_clone()
+        self.base_lambda: int = config.node_population_size
+        self.num_of_iterations: int = config.num_of_iterations
+        self.target_fitness: float = config.target_fitness
+        self.accept_new_best: bool = config.accept_new_best
+        self.randomize_population: bool = config.randomize_population
+        self.randomize_count: int = config.randomize_count
+        self.randomize_iteration: int = 0
+        self.initial_sigma: float = config.vector_sigma
+        self.restart_stagnation: int = config.restart_stagnation
+        self.noisy_fitness: bool = config.noisy_fitness
+        self.early_exit_delay: float = config.early_exit_delay
+        self.fitness_epoch: int = 0
+        self.minimum_found: bool = False
+
+        self.iteration_callback = iteration_callback
+        self.iteration_counter: int = 0
+        self.fraction_iterations: int = int(self.num_of_iterations / iteration_callback.es_get_iteration_factor())
+
+        (self.lower_bound, self.upper_bound) = self.individual.es_vector_bounds()
+
+        # Init random number generator:
+        utils.es_init_seed(config.random_seed)
+
+        self.restart_counter: int = 0
+        self.lambda_size: int = self.base_lambda
+        self.mu_size: int = max(1, self.lambda_size // 4)
+
+        self.mean: list[float] = self.es_random_vector()
+        self.dimensions: int = len(self.mean)
+        self.tau: float = 1.0 / math.sqrt(2.0 * self.dimensions)
+        self.sigma: float = self.initial_sigma
+
+        self.run_best_fitness: float = float_info.max
+        self.stagnation_counter: int = 0
+
+        self.best_individual: ESIndividual = self.es_new_individual(self.mean[:])
+
+        logger.debug(f"{self.lambda_size=}, {self.mu_size=}, {self.dimensions=}")
+        logger.debug(f"{self.initial_sigma=}, {self.tau=}, {self.restart_stagnation=}")
+        logger.debug(f"{self.lower_bound=}, {self.upper_bound=}")
+
+    def es_random_vector(self) -> list[float]:
+        ind: ESIndividual = self.individual.es_clone()
+        ind.es_randomize()
+        return ind.es_get_vector()[:]
+
+    def es_new_individual(self, values: list[float]) -> ESIndividual:
+        ind: ESIndividual = self.individual.es_clone()
+        ind.es_set_vector(values)
+        ind.es_calculate_fitness()
+        ind.fitness_epoch = self.fitness_epoch
+        return ind
+
+    @property
+    def population(self) -> list[ESIndividual]:
+        # The best individual of the current call, for the iteration callback.
+        return [self.best_individual]
+
+    def es_new_fitness_epoch(self):
+        # Must be called when the fitness landscape changes (see ESPopulation).
+        # The fitness values of the previous generations can't be compared anymore.
+        self.fitness_epoch += 1
+        self.best_individual.es_calculate_fitness()
+        self.best_individual.fitness_epoch = self.fitness_epoch
+        self.run_best_fitness = self.best_individual.fitness
+        self.stagnation_counter = 0
+
+    def es_restart(self, mean: list[float], increase_population: bool):
+        if increase_population:
+            self.restart_counter += 1
+            # IPOP: double the population size, but start again with
+            # the initial size after some restarts.
+            if self.restart_counter > 8:
+                self.restart_counter = 0
+
+        self.lambda_size = self.base_lambda * (2**self.restart_counter)
+        self.mu_size = max(1, self.lambda_size // 4)
+        self.mean = mean
+        self.sigma = self.initial_sigma
+        self.run_best_fitness = float_info.max
+        self.stagnation_counter = 0
+
+        logger.debug("Restart: restart_counter=%d, lambda_size=%d, mu_size=%d",
+            self.restart_counter, self.lambda_size, self.mu_size)
+
+    def es_randomize_or_accept_best(self, best: ESIndividual):
+        if best.server_message.get("restart", False):
+            # The server has detected that this node is stagnant:
+            logger.debug("Restart signal from server, restart from random position...")
+            self.randomize_iteration = 0
+            self.es_restart(self.es_random_vector(), False)
+            return
+
+        if self.randomize_population:
+            self.randomize_iteration += 1
+            if self.randomize_iteration >= self.randomize_count:
+                self.randomize_iteration = 0
+                logger.debug("Randomize counter reached, restart from random position...")
+                self.es_restart(self.es_random_vector(), False)
+        elif self.accept_new_best:
+            fitness: float = best.fitness
+
+            if self.noisy_fitness:
+                # The fitness from the server has been calculated on a different
+                # data set, so calculate it again here:
+                fitness = self.es_new_individual(best.es_get_vector()[:]).fitness
+
+            if fitness < self.run_best_fitness:
+                # Continue the search around the best individual from the server:
+                self.mean = best.es_get_vector()[:]
+                self.run_best_fitness = fitness
+                self.stagnation_counter = 0
+
+    def es_fraction_iteration(self):
+        self.iteration_counter += 1
+        if self.iteration_counter > self.fraction_iterations:
+            self.iteration_counter = 0
+            self.iteration_callback.es_fraction_iteration(self)
+
+    def es_generation(self) -> float:
+        # Create lambda offspring, select the mu best and recombine them.
+        # Returns the best fitness of this generation.
+        offspring: list[tuple[float, float, list[float]]] = []
+
+        for _ in range(self.lambda_size):
+            sigma: float = self.sigma * math.exp(self.tau * utils.es_gauss())
+            values: list[float] = []
+
+            for m in self.mean:
+                v: float = m + (sigma * utils.es_gauss())
+                values.append(min(self.upper_bound, max(self.lower_bound, v)))
+
+            ind: ESIndividual = self.es_new_individual(values)
+            offspring.append((ind.fitness, sigma, values))
+
+            if ind.fitness < self.best_individual.fitness:
+                self.best_individual = ind
+
+        offspring.sort(key=lambda o: o[0])
+        selected = offspring[:self.mu_size]
+
+        # Intermediate recombination of the mu best:
+        factor: float = 1.0 / self.mu_size
+
+        for i in range(self.dimensions):
+            self.mean[i] = sum(o[2][i] for o in selected) * factor
+
+        # Geometric mean of the step sizes:
+        self.sigma = math.exp(sum(math.log(o[1]) for o in selected) * factor)
+
+        return offspring[0][0]
+
+    @override
+    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
+        logger.debug("ESPopulationNode13.ps_process_data()")
+        logger.debug("Individual from server: %s", data.fitness)
+
+        self.es_randomize_or_accept_best(data)
+        self.minimum_found = False
+
+        # Only the best individual of this call is sent back to the server,
+        # the one from the previous call may be from an old position or epoch:
+        self.best_individual = self.es_new_individual(self.mean[:])
+
+        self.iteration_callback.es_before_iteration(self)
+
+        for i in range(self.num_of_iterations):
+            self.es_fraction_iteration()
+
+            generation_best: float = self.es_generation()
+
+            if self.best_individual.fitness <= self.target_fitness:
+                logger.info("Early exit at iteration %d", i)
+                self.minimum_found = True
+
+                if i == 0:
+                    # Wait some seconds to avoid spamming the server.
+                    time.sleep(self.early_exit_delay)
+                break
+
+            if generation_best < self.run_best_fitness:
+                self.run_best_fitness = generation_best
+                self.stagnation_counter = 0
+            else:
+                self.stagnation_counter += 1
+
+            if (self.stagnation_counter >= self.restart_stagnation) or (self.sigma < 1e-12):
+                self.es_restart(self.es_random_vector(), True)
+
+        self.iteration_callback.es_after_of_iteration(self)
+
+        best_ind: ESIndividual = self.best_individual
+        best_ind.es_calculate_fitness2()
+
+        logger.debug("best_ind.fitness=%s, best_ind.fitness2=%s", best_ind.fitness, best_ind.fitness2)
+        logger.debug("sigma=%s, lambda_size=%d, restart_counter=%d", self.sigma, self.lambda_size, self.restart_counter)
+
+        best_ind.es_new_best_individual()
+        return best_ind
@@ -0,0 +1,72 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the class for population type 14.
+A steady state genetic algorithm with tournament selection and crossover.
+"""
+
+# Python std lib:
+import logging
+from typing import override
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
+
+logger = logging.getLogger(__name__)
+
+
+class ESPopulationNode14(ESPopulationNodeBase):
+    def __init__(self, config: ESConfiguration, individual: ESIndividual,
+            iteration_callback: ESIterationCallBack = ESIterationCallBack()):
+        logger.info("Init population node type 14")
+        logger.info("Steady state genetic algorithm: pick two parents with tournament selection,")
+        logger.info("combine them with crossover and mutate the child.")
+        logger.info("If the child is better than the worst individual, replace it.")
+
+        if config.tournament_size < 1:
+            raise ValueError(f"Tournament size must be at least 1, {config.tournament_size}")
+
+        super().__init__(config, individual, iteration_callback)
+        self.tournament_size: int = config.tournament_size
+
+        logger.debug(f"{self.tournament_size=}")
+
+    @override
+    def es_num_of_steps(self) -> int:
+        # Only one child is created in each step:
+        return self.population.num_of_iterations * self.population.population_size
+
+    @override
+    def es_before_steps(self):
+        self.population.es_find_best_and_worst_individual()
+
+    @override
+    def es_step(self, iteration: int):
+        start: int = self.population.es_phase_start()
+        parent1: ESIndividual = self.population.es_tournament_select(self.tournament_size)
+        parent2: ESIndividual = self.population.es_tournament_select(self.tournament_size)
+        self.population.es_phase_end("selection", start)
+
+        start = self.population.es_phase_start()
+        child: ESIndividual = parent1.es_crossover_internal(parent2)
+        self.population.es_phase_end("crossover", start)
+
+        self.population.es_mutate_individual(child, self.population.num_of_mutations)
+        self.population.es_calculate_fitness(child)
+
+        if self.population.es_is_better(child, self.population.population[self.population.worst_index]):
+            self.population.es_replace_worst(child)
+            self.population.es_find_best_and_worst_individual()
+
+            if child.fitness <= self.population.target_fitness:
+                self.population.es_early_exit(iteration)
+
+    @override
+    def es_after_steps(self):
+        pass
@@ -0,0 +1,122 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the class for population type 15.
+Multi-objective optimization using non-dominated sorting and
+crowding distance (NSGA-II).
+"""
+
+# Python std lib:
+import logging
+from typing import override
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
+from evolusnake.es_pareto import es_non_dominated_sort, es_crowding_distance
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+
+class ESPopulationNode15(ESPopulationNodeBase):
+    # The objectives are calculated together with the fitness:
+    calculate_objectives: bool = True
+
+    def __init__(self, config: ESConfiguration, individual: ESIndividual,
+            iteration_callback: ESIterationCallBack = ESIterationCallBack()):
+        logger.info("Init population node type 15")
+        logger.info("Multi-objective optimization (NSGA-II): pick parents with a crowded tournament,")
+        logger.info("mutate clones and keep the best fronts of parents and offspring.")
+        logger.info("Within the last front keep the individuals with the largest crowding distance.")
+
+        # Set by es_select(), which is already called from es_init_node():
+        self.rank: list[int] = []
+        self.crowding: list[float] = []
+
+        super().__init__(config, individual, iteration_callback)
+
+    def es_select(self, candidates: list[ESIndividual]):
+        # Keep the best population_size individuals, sorted by front and crowding distance.
+        size: int = self.population.population_size
+        objectives: list[list[float]] = [ind.objectives for ind in candidates]
+        fronts: list[list[int]] = es_non_dominated_sort(objectives)
+
+        selected: list[ESIndividual] = []
+        self.rank = []
+        self.crowding = []
+
+        for (rank, front) in enumerate(fronts):
+            distance: dict[int, float] = es_crowding_distance(objectives, front)
+
+            if len(selected) + len(front) > size:
+                front = sorted(front, key=lambda i: distance[i], reverse=True)
+                front = front[:size - len(selected)]
+
+            for i in front:
+                selected.append(candidates[i])
+                self.rank.append(rank)
+                self.crowding.append(distance[i])
+
+            if len(selected) >= size:
+                break
+
+        self.population.population = selected
+
+    def es_crowded_tournament(self) -> ESIndividual:
+        # The individual with the lower rank wins,
+        # if both have the same rank the larger crowding distance wins.
+        i: int = utils.es_rand_int(self.population.population_size)
+        j: int = utils.es_rand_int(self.population.population_size)
+
+        if (self.rank[j] < self.rank[i]) or \
+                ((self.rank[j] == self.rank[i]) and (self.crowding[j] > self.crowding[i])):
+            i = j
+
+        return self.population.population[i]
+
+    @override
+    def es_init_node(self):
+        self.es_select(self.population.population)
+
+    @override
+    def es_before_steps(self):
+        # The individual from the server (or a random population) is not ranked yet:
+        self.es_select(self.population.population)
+
+    @override
+    def es_step(self, iteration: int):
+        # One generation: create population_size children and
+        # keep the best fronts of parents and children.
+        offspring: list[ESIndividual] = []
+
+        for _ in range(self.population.population_size):
+            start: int = self.population.es_phase_start()
+            parent: ESIndividual = self.es_crowded_tournament()
+            self.population.es_phase_end("selection", start)
+
+            child: ESIndividual = self.population.es_clone_individual(parent)
+            self.population.es_mutate_individual(child, self.population.num_of_mutations)
+            self.population.es_calculate_fitness(child)
+
+            offspring.append(child)
+
+            if child.fitness <= self.population.target_fitness:
+                self.population.es_early_exit(iteration)
+                break
+
+        start = self.population.es_phase_start()
+        self.es_select(self.population.population + offspring)
+        self.population.es_phase_end("selection", start)
+
+    @override
+    def es_after_steps(self):
+        self.population.es_find_best_and_worst_individual()
+
+        front_size: int = self.rank.count(0)
+        logger.debug("front_size=%d", front_size)
@@ -11,19 +11,17 @@ This module defines the class for population type 3.
 import logging
 from typing import override
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 import evolusnake.es_utils as utils
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode3(PSNode):
+class ESPopulationNode3(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 3")
@@ -31,45 +29,33 @@ class ESPopulationNode3(PSNode):
         logger.debug("If it's better than the best replace it.")
         logger.debug("Else if it's better than the worst replace it.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
-
-        self.population: ESPopulation = ESPopulation(config, individual, iteration_callback)
+        super().__init__(config, individual, iteration_callback)
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode3.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
+    def es_num_of_steps(self) -> int:
+        # Only one individual is mutated in each step:
+        return self.population.num_of_iterations * self.population.population_size
 
-        self.population.es_randomize_or_accept_best(data)
+    @override
+    def es_before_steps(self):
         self.population.es_find_best_and_worst_individual()
-        self.population.es_shuffle_mutation_operations()
-
-        max_iter = self.population.num_of_iterations * self.population.population_size
-
-        self.population.es_before_iteration()
 
-        for i in range(max_iter):
-            self.population.es_fraction_iteration()
-
-            j = utils.es_rand_int(self.population.population_size)
-            tmp_ind: ESIndividual = self.population.population[j].es_clone_internal()
-
-            for _ in range(self.population.num_of_mutations):
-                tmp_ind.es_mutate_internal(self.population.es_get_mut_op())
-            tmp_ind.es_calculate_fitness()
+    @override
+    def es_step(self, iteration: int):
+        j = utils.es_rand_int(self.population.population_size)
+        tmp_ind: ESIndividual = self.population.es_clone_individual(self.population.population[j])
 
-            if tmp_ind.fitness < self.population.es_get_best_fitness():
-                self.population.es_replace_best(tmp_ind)
-                if tmp_ind.fitness <= self.population.target_fitness:
-                    self.population.es_early_exit(i)
-                    break
-            elif tmp_ind.fitness < self.population.es_get_worst_fitness():
-                self.population.es_replace_worst(tmp_ind)
-                self.population.es_find_worst_individual()
+        self.population.es_mutate_individual(tmp_ind, self.population.num_of_mutations)
+        self.population.es_calculate_fitness(tmp_ind)
 
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
-        return self.population.es_get_best()
+        if self.population.es_is_better(tmp_ind, self.population.es_get_best()):
+            self.population.es_replace_best(tmp_ind)
+            if tmp_ind.fitness <= self.population.target_fitness:
+                self.population.es_early_exit(iteration)
+        elif self.population.es_is_better(tmp_ind, self.population.es_get_worst()):
+            self.population.es_replace_worst(tmp_ind)
+            self.population.es_find_worst_individual()
 
+    @override
+    def es_after_steps(self):
+        pass
@@ -11,18 +11,16 @@ This module defines the class for population type 4.
 import logging
 from typing import override
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESIterationCallBack, ESPopulation
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode4(PSNode):
+class ESPopulationNode4(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 4")
@@ -31,64 +29,59 @@ class ESPopulationNode4(PSNode):
         logger.debug("Reduce global fitness each iteration.")
         logger.debug("If no individual is better, increase the global fitness a bit.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
+        # Set in es_init_node():
+        self.global_fitness: float = 0.0
 
-        self.population: ESPopulation = ESPopulation(config, individual, iteration_callback)
-        self.population.es_find_worst_individual()
+        super().__init__(config, individual, iteration_callback)
 
-        self.global_fitness = self.population.es_get_worst_fitness()
         self.min_num_ind: int = config.min_num_ind
+        self.all_above_global: int = 0
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode4.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
-
-        self.population.es_randomize_or_accept_best(data)
-        self.population.es_shuffle_mutation_operations()
-        self.population.minimum_found = False
-        ind_below_global: int = 0
-        all_above_global: int = 0
-
-        self.population.es_before_iteration()
+    def es_init_node(self):
+        self.population.es_find_worst_individual()
 
-        for i in range(self.population.num_of_iterations):
-            self.population.es_fraction_iteration()
+        self.global_fitness = self.population.node_state.get("global_fitness",
+            self.population.es_get_worst_fitness())
 
-            for j in range(self.population.population_size):
-                tmp_ind: ESIndividual = self.population.population[j].es_clone_internal()
+    @override
+    def es_before_steps(self):
+        self.all_above_global = 0
 
-                for _ in range(self.population.num_of_mutations):
-                    tmp_ind.es_mutate_internal(self.population.es_get_mut_op())
-                tmp_ind.es_calculate_fitness()
+    @override
+    def es_step(self, iteration: int):
+        for j in range(self.population.population_size):
+            tmp_ind: ESIndividual = self.population.es_clone_individual(self.population.population[j])
 
-                self.population.es_check_limit(tmp_ind, self.global_fitness, j)
+            self.population.es_mutate_individual(tmp_ind, self.population.num_of_mutations)
+            self.population.es_calculate_fitness(tmp_ind)
 
-                if tmp_ind.fitness <= self.population.target_fitness:
-                    self.population.es_early_exit(i)
-                    break
+            self.population.es_check_limit(tmp_ind, self.global_fitness, j)
 
-            if self.population.minimum_found:
-                break
+            if tmp_ind.fitness <= self.population.target_fitness:
+                self.population.es_early_exit(iteration)
+                return
 
-            ind_below_global = 0
-            for ind in self.population.population:
-                if ind.fitness < self.global_fitness:
-                    ind_below_global += 1
+        ind_below_global: int = 0
+        for ind in self.population.population:
+            # A stale fitness from a previous epoch does not count:
+            if (ind.fitness < self.global_fitness) and (not self.population.es_is_stale(ind)):
+                ind_below_global += 1
 
-            if ind_below_global >= self.min_num_ind:
-                self.global_fitness = self.global_fitness * 0.9
-            else:
-                self.global_fitness = self.global_fitness * 1.01
-                all_above_global += 1
+        if ind_below_global >= self.min_num_ind:
+            self.global_fitness = self.global_fitness * 0.9
+        else:
+            self.global_fitness = self.global_fitness * 1.01
+            self.all_above_global += 1
 
-        logger.debug(f"{all_above_global=}")
+    @override
+    def es_after_steps(self):
+        logger.debug("all_above_global=%s", self.all_above_global)
 
+        self.population.node_state["global_fitness"] = self.global_fitness
         self.population.es_find_best_and_worst_individual()
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
+
+    @override
+    def es_result(self) -> ESIndividual:
         self.population.es_clone_best_to_worst()
         return self.population.es_get_best()
-
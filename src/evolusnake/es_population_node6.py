@@ -11,18 +11,16 @@ This module defines the class for population type 6.
 import logging
 from typing import override
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode6(PSNode):
+class ESPopulationNode6(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 6")
@@ -31,55 +29,30 @@ class ESPopulationNode6(PSNode):
         logger.info("The first clone keeps mutating, the second clone is reset to the initial individual.")
         logger.info("The best of all the mutations is kept and the next individual is mutated.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
-
-        self.population = ESPopulation(config, individual, iteration_callback)
+        super().__init__(config, individual, iteration_callback)
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode6.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
-
-        self.population.es_randomize_or_accept_best(data)
-        self.population.es_shuffle_mutation_operations()
-        self.population.minimum_found = False
-
-        self.population.es_before_iteration()
-
-        for i in range(self.population.num_of_iterations):
-            self.population.es_fraction_iteration()
-
-            for j in range(self.population.population_size):
-                tmp_ind1: ESIndividual = self.population.population[j].es_clone_internal()
-                initial_ind: ESIndividual = tmp_ind1.es_clone_internal()
-                best_ind: ESIndividual = tmp_ind1.es_clone_internal()
-
-                for _ in range(self.population.num_of_mutations):
-                    tmp_ind1.es_mutate_internal(self.population.es_get_mut_op())
-                    tmp_ind1.es_calculate_fitness()
-                    if tmp_ind1.fitness < best_ind.fitness:
-                        best_ind = tmp_ind1.es_clone_internal()
-
-                    tmp_ind2: ESIndividual = initial_ind.es_clone_internal()
-                    tmp_ind2.es_mutate_internal(self.population.es_get_mut_op())
-                    tmp_ind2.es_calculate_fitness()
-                    if tmp_ind2.fitness < best_ind.fitness:
-                        best_ind = tmp_ind2.es_clone_internal()
-
-                if best_ind.fitness < self.population.population[j].fitness:
-                    self.population.population[j] = best_ind
-
-                    if best_ind.fitness <= self.population.target_fitness:
-                        self.population.es_early_exit(i)
-                        break
-
-            if self.population.minimum_found:
-                break
-
-        self.population.es_find_best_and_worst_individual()
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
-        return self.population.es_get_best()
-
+    def es_step(self, iteration: int):
+        for j in range(self.population.population_size):
+            tmp_ind1: ESIndividual = self.population.es_clone_individual(self.population.population[j])
+            initial_ind: ESIndividual = self.population.es_clone_individual(tmp_ind1)
+            best_ind: ESIndividual = self.population.es_clone_individual(tmp_ind1)
+
+            for _ in range(self.population.num_of_mutations):
+                self.population.es_mutate_individual(tmp_ind1, 1)
+                self.population.es_calculate_fitness(tmp_ind1)
+                if self.population.es_is_better(tmp_ind1, best_ind):
+                    best_ind = self.population.es_clone_individual(tmp_ind1)
+
+                tmp_ind2: ESIndividual = self.population.es_clone_individual(initial_ind)
+                self.population.es_mutate_individual(tmp_ind2, 1)
+                self.population.es_calculate_fitness(tmp_ind2)
+                if self.population.es_is_better(tmp_ind2, best_ind):
+                    best_ind = self.population.es_clone_individual(tmp_ind2)
+
+            if self.population.es_is_better(best_ind, self.population.population[j]):
+                self.population.population[j] = best_ind
+
+                if best_ind.fitness <= self.population.target_fitness:
+                    self.population.es_early_exit(iteration)
+                    break
@@ -9,20 +9,19 @@ This module defines the class for population type 7.
 
 # Python std lib:
 import logging
+import sys
 from typing import override
 
-# External imports:
-from parasnake.ps_node import PSNode
-
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
 
 logger = logging.getLogger(__name__)
 
 
-class ESPopulationNode7(PSNode):
+class ESPopulationNode7(ESPopulationNodeBase):
     def __init__(self, config: ESConfiguration, individual: ESIndividual,
             iteration_callback: ESIterationCallBack = ESIterationCallBack()):
         logger.info("Init population node type 7")
@@ -31,62 +30,60 @@ class ESPopulationNode7(PSNode):
         logger.info("Keep track of the best fitness and if it stays the same for too long, then")
         logger.info("randomize the whole population.")
 
-        super().__init__(config.parasnake_config)
-        logger.debug(f"Node ID: {self.node_id}")
+        super().__init__(config, individual, iteration_callback)
+
+        self.offset: int = int(self.population.population_size / 2)
+        self.previous_best_fitness: float = 0.0
+        self.previous_best_counter: int = 0
+        # The iterations only end when the best fitness stays the same,
+        # so the next call starts with a random population.
+        # The first call uses the initial (or seeded) population:
+        self.stagnated: bool = False
 
-        self.population = ESPopulation(config, individual, iteration_callback)
+    @override
+    def es_num_of_steps(self) -> int:
+        # The number of iterations is given by es_stop_steps():
+        return sys.maxsize
 
     @override
-    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
-        logger.debug("ESPopulationNode7.ps_process_data()")
-        logger.debug(f"Individual from server: {data.fitness}")
+    def es_before_steps(self):
+        if self.stagnated:
+            self.population.es_random_population()
 
-        self.population.es_random_population()
         self.population.es_sort_population()
-        self.population.es_shuffle_mutation_operations()
         self.population.best_index = 0
         self.population.worst_index = self.population.population_size - 1
 
-        offset: int = int(self.population.population_size / 2)
-        previous_best_fitness: float = self.population.es_get_best_fitness()
-        previous_best_counter: int = 0
-        best_fitness: float = previous_best_fitness
-        iter_counter: int = 0
-
-        self.population.es_before_iteration()
-
-        while True:
-            self.population.es_fraction_iteration()
-
-            # Create a copy of each individual before mutating it:
-            for j in range(offset):
-                ind: ESIndividual = self.population.population[j]
-                self.population.population[j + offset] = ind.es_clone_internal()
+        self.previous_best_fitness = self.population.es_get_best_fitness()
+        self.previous_best_counter = 0
 
-                ind.es_mutate_internal(self.population.es_get_mut_op())
-                ind.es_calculate_fitness()
-
-            self.population.es_sort_population()
+    @override
+    def es_step(self, iteration: int):
+        # Create a copy of each individual before mutating it:
+        for j in range(self.offset):
+            ind: ESIndividual = self.population.population[j]
+            self.population.population[j + self.offset] = self.population.es_clone_individual(ind)
 
-            best_fitness = self.population.es_get_best_fitness()
+            self.population.es_mutate_individual(ind, 1)
+            self.population.es_calculate_fitness(ind)
 
-            if best_fitness <= self.population.target_fitness:
-                self.population.es_early_exit(iter_counter)
-                break
+        self.population.es_sort_population()
 
-            if previous_best_fitness == best_fitness:
-                previous_best_counter += 1
-                if previous_best_counter >= self.population.num_of_iterations:
-                    break
-            else:
-                previous_best_fitness = best_fitness
-                previous_best_counter = 0
+        best_fitness: float = self.population.es_get_best_fitness()
 
-            iter_counter += 1
+        if best_fitness <= self.population.target_fitness:
+            self.population.es_early_exit(iteration)
+        elif self.previous_best_fitness == best_fitness:
+            self.previous_best_counter += 1
+        else:
+            self.previous_best_fitness = best_fitness
+            self.previous_best_counter = 0
 
-        self.population.es_after_iteration()
-        self.population.es_calculate_fitness2()
-        self.population.es_log_statistics()
-        logger.debug(f"{iter_counter=}")
-        return self.population.es_get_best()
+    @override
+    def es_stop_steps(self) -> bool:
+        self.stagnated = self.previous_best_counter >= self.population.num_of_iterations
+        return self.stagnated
 
+    @override
+    def es_after_steps(self):
+        pass
@@ -0,0 +1,128 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the base class for population kinds that use ESPopulation.
+It implements the common parts of ps_process_data(): accept the individual
+from the server, shuffle the mutation operations, call the iteration callbacks,
+calculate fitness2 and log the statistics.
+A population kind only implements es_step(), which is called
+es_num_of_steps() times (or until the target fitness is reached or
+es_stop_steps() returns True).
+Everything that needs the population at startup goes into es_init_node(),
+since with deferred_init the population is only created when the first
+individual from the server arrives (from the elite individuals of
+ps_init() if init_batch_size is set).
+ps_init() runs on the asyncio loop of the node, so it only keeps the elite
+individuals and the population is created in ps_process_data(), which runs
+in its own thread.
+"""
+
+# Python std lib:
+import logging
+from typing import override, Optional
+
+# External imports:
+from parasnake.ps_node import PSNode
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESPopulation, ESIterationCallBack
+
+logger = logging.getLogger(__name__)
+
+
+class ESPopulationNodeBase(PSNode):
+    # Multi-objective population kinds set this to True, then the objectives
+    # are calculated together with the fitness:
+    calculate_objectives: bool = False
+
+    def __init__(self, config: ESConfiguration, individual: ESIndividual,
+            iteration_callback: ESIterationCallBack = ESIterationCallBack()):
+        super().__init__(config.parasnake_config)
+        logger.debug(f"Node ID: {self.node_id}")
+
+        # With deferred_init the population is created from the first individual
+        # of the server, so the node connects to the server without delay:
+        self.population: ESPopulation = ESPopulation(config, individual, iteration_callback,
+            config.deferred_init or (config.init_batch_size > 0), self.calculate_objectives)
+        # Elite individuals from the server, used in the first ps_process_data():
+        self.init_data: list[ESIndividual] = []
+
+        if self.population.es_is_complete():
+            self.es_init_node()
+
+    def es_init_node(self):
+        # Called once the population has been created (sort it, ...).
+        pass
+
+    def es_num_of_steps(self) -> int:
+        # How often es_step() is called for each ps_process_data().
+        return self.population.num_of_iterations
+
+    def es_before_steps(self):
+        # Called after the individual from the server has been accepted.
+        pass
+
+    def es_step(self, iteration: int):
+        # One iteration of the population kind.
+        # Must call population.es_early_exit() if the target fitness is reached.
+        # Must be implemented by the population kind.
+        raise NotImplementedError
+
+    def es_stop_steps(self) -> bool:
+        # Called after each es_step(), True ends the iterations (stagnation, ...).
+        return False
+
+    def es_after_steps(self):
+        # Called after all the iterations, must set best_index and worst_index.
+        self.population.es_find_best_and_worst_individual()
+
+    def es_result(self) -> ESIndividual:
+        # The individual that is sent back to the server.
+        return self.population.es_get_best()
+
+    @override
+    def ps_init(self, data: Optional[list[ESIndividual]]):
+        # Elite individuals from the server (init_batch_size).
+        if data and (not self.population.es_is_complete()):
+            self.init_data = data
+
+    @override
+    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s.ps_process_data()", type(self).__name__)
+            logger.debug("Individual from server: %s", data.fitness)
+
+        population: ESPopulation = self.population
+
+        if not population.es_is_complete():
+            population.es_seed_population(self.init_data or [data])
+            self.init_data = []
+            self.es_init_node()
+
+        population.es_randomize_or_accept_best(data)
+        population.es_shuffle_mutation_operations()
+        population.minimum_found = False
+
+        self.es_before_steps()
+
+        population.es_before_iteration()
+
+        for i in range(self.es_num_of_steps()):
+            population.es_fraction_iteration()
+
+            self.es_step(i)
+
+            if population.minimum_found or self.es_stop_steps():
+                break
+
+        self.es_after_steps()
+
+        population.es_after_iteration()
+        population.es_calculate_fitness2()
+        population.es_log_statistics()
+        return self.es_result()
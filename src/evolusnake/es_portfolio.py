@@ -0,0 +1,124 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the portfolio node.
+The server assigns a population kind and parameters to each node
+(see es_scheduler) and the portfolio node switches to the requested
+population kind. The used CPU time is sent back to the server, so it can
+allocate more nodes to the kinds that work best for the current problem.
+When the population kind is switched, the new population is created from the
+individuals of the previous one, so the progress of the node is not lost.
+"""
+
+# Python std lib:
+import logging
+import copy
+import time
+from typing import override, Any, Optional
+
+# External imports:
+from parasnake.ps_node import PSNode
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+from evolusnake.es_population_node_base import ESPopulationNodeBase
+
+logger = logging.getLogger(__name__)
+
+
+def es_portfolio_config(config: ESConfiguration, entry: dict) -> ESConfiguration:
+    # Returns a copy of the configuration with the options from the portfolio entry,
+    # for example: {"population_kind": 4, "num_of_mutations": 2}
+    new_config: ESConfiguration = copy.copy(config)
+    new_config.portfolio = []
+
+    for (key, value) in entry.items():
+        if not hasattr(new_config, key):
+            raise ValueError(f"Unknown option in portfolio: {key}")
+
+        setattr(new_config, key, value)
+
+    return new_config
+
+
+class ESPortfolioNode(PSNode):
+    def __init__(self, config: ESConfiguration, individual: ESIndividual,
+            iteration_callback: ESIterationCallBack = ESIterationCallBack()):
+        logger.info("Init portfolio node")
+        logger.info("The server decides which population kind is used.")
+
+        super().__init__(config.parasnake_config)
+        logger.debug(f"Node ID: {self.node_id}")
+
+        self.config: ESConfiguration = config
+        self.individual: ESIndividual = individual
+        self.iteration_callback: ESIterationCallBack = iteration_callback
+        # The population is created when the first data from the server arrives:
+        self.entry: Optional[dict] = None
+        self.node: Optional[PSNode] = None
+        # Elite individuals from the server for the first population:
+        self.init_data: Any = None
+        # The last result, used if the population of the node is not accessible:
+        self.last_result: Optional[ESIndividual] = None
+
+    def es_create_node(self, config: ESConfiguration) -> PSNode:
+        # Import here, es_select_population creates portfolio nodes.
+        from evolusnake.es_select_population import es_select_population
+        return es_select_population(config, self.individual, self.iteration_callback)
+
+    def es_seeds(self) -> list[ESIndividual]:
+        # The individuals of the current node, best first.
+        if isinstance(self.node, ESPopulationNodeBase) and self.node.population.es_is_complete():
+            return sorted(self.node.population.population, key=lambda ind: ind.fitness)
+
+        if self.last_result is not None:
+            return [self.last_result]
+
+        return []
+
+    def es_switch(self, entry: dict):
+        logger.info("Switch to portfolio entry: %s", entry)
+        config: ESConfiguration = es_portfolio_config(self.config, entry)
+        seeds: list[ESIndividual] = self.es_seeds()
+
+        if seeds:
+            # Create the new population from the previous one instead of random individuals:
+            config.deferred_init = True
+            self.init_data = seeds
+
+        self.entry = entry
+        self.node = self.es_create_node(config)
+
+        if self.init_data is not None:
+            self.node.ps_init(self.init_data)
+            self.init_data = None
+
+    @override
+    def ps_init(self, data: Any):
+        # The population is created later, keep the data until then.
+        self.init_data = data
+
+    @override
+    def ps_process_data(self, data: ESIndividual) -> ESIndividual:
+        entry: Optional[dict] = data.server_message.get("portfolio")
+
+        if entry is None:
+            # No portfolio on the server, use the population kind from the configuration:
+            entry = {}
+
+        if (self.node is None) or (entry != self.entry):
+            self.es_switch(entry)
+
+        assert self.node is not None
+
+        start: float = time.process_time()
+        result: ESIndividual = self.node.ps_process_data(data)
+        result.node_message = {"cpu_seconds": time.process_time() - start}
+        self.last_result = result
+
+        return result
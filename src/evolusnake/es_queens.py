@@ -0,0 +1,162 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the N-Queens problem.
+Each column contains exactly one queen, the genome is a flat integer array
+with the row of the queen in each column.
+The number of queens in each row and diagonal is counted, so moving a queen
+updates the number of conflicts (pairs of queens that attack each other)
+in O(1) and es_calculate_fitness() does not have to check all pairs.
+"""
+
+# Python std lib:
+import logging
+from array import array
+from typing import override, Self
+
+# Local imports:
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_distance import es_hamming_distance
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+
+class ESQueensIndividual(ESIndividual):
+    def __init__(self, size: int):
+        super().__init__()
+
+        if size < 4:
+            raise ValueError(f"Board size must be at least 4, {size}")
+
+        self.size: int = size
+        # rows[column] is the row of the queen in this column:
+        self.rows: array = array("i", [0] * size)
+        # Number of queens in each row and in each diagonal:
+        # diagonal1: row + column, diagonal2: row - column + size - 1
+        # All queens start in row 0, so the counters are known:
+        self.row_count: array = array("i", [size] + [0] * (size - 1))
+        self.diagonal1_count: array = array("i", [1] * size + [0] * (size - 1))
+        self.diagonal2_count: array = array("i", [1] * size + [0] * (size - 1))
+        self.conflicts: int = (size * (size - 1)) // 2
+
+    def es_count_conflicts(self):
+        # Calculates all the counters from the genome, O(size).
+        size: int = self.size
+        self.row_count = array("i", [0] * size)
+        self.diagonal1_count = array("i", [0] * (2 * size - 1))
+        self.diagonal2_count = array("i", [0] * (2 * size - 1))
+        self.conflicts = 0
+
+        for (column, row) in enumerate(self.rows):
+            self.es_add_queen(column, row)
+
+    def es_add_queen(self, column: int, row: int):
+        # The new queen attacks all the queens that are already in the same row and diagonals.
+        d1: int = row + column
+        d2: int = row - column + self.size - 1
+
+        self.conflicts += self.row_count[row] + self.diagonal1_count[d1] + self.diagonal2_count[d2]
+
+        self.row_count[row] += 1
+        self.diagonal1_count[d1] += 1
+        self.diagonal2_count[d2] += 1
+
+    def es_remove_queen(self, column: int, row: int):
+        d1: int = row + column
+        d2: int = row - column + self.size - 1
+
+        self.row_count[row] -= 1
+        self.diagonal1_count[d1] -= 1
+        self.diagonal2_count[d2] -= 1
+
+        self.conflicts -= self.row_count[row] + self.diagonal1_count[d1] + self.diagonal2_count[d2]
+
+    def es_move_queen(self, column: int, row: int):
+        self.es_remove_queen(column, self.rows[column])
+        self.rows[column] = row
+        self.es_add_queen(column, row)
+
+    def random_pos(self):
+        column: int = utils.es_rand_int(self.size)
+        row: int = utils.es_rand_int(self.size)
+
+        self.es_move_queen(column, row)
+
+    def swap_pos(self):
+        column1: int = utils.es_rand_int(self.size)
+        column2: int = utils.es_rand_int(self.size)
+
+        while column1 == column2:
+            column2 = utils.es_rand_int(self.size)
+
+        row1: int = self.rows[column1]
+        row2: int = self.rows[column2]
+
+        self.es_move_queen(column1, row2)
+        self.es_move_queen(column2, row1)
+
+    @override
+    def es_mutate(self, mut_op: int):
+        match mut_op:
+            case 0:
+                self.random_pos()
+            case 1:
+                self.swap_pos()
+            case _:
+                raise ValueError(f"Unknown mutation operation: {mut_op}")
+
+    @override
+    def es_randomize(self):
+        for column in range(self.size):
+            self.rows[column] = utils.es_rand_int(self.size)
+
+        self.es_count_conflicts()
+
+    @override
+    def es_calculate_fitness(self):
+        self.fitness = float(self.conflicts)
+
+    @override
+    def es_genome_hash(self) -> int:
+        return hash(self.rows.tobytes())
+
+    @override
+    def es_distance(self, other) -> float:
+        return es_hamming_distance(self.rows, other.rows)  # type: ignore
+
+    @override
+    def es_clone(self) -> Self:
+        new = ESQueensIndividual(self.size)
+        new.es_copy_from(self)
+
+        return new  # type: ignore
+
+    def es_copy_from(self, other):
+        # The arrays are copied, so the clone does not share any state.
+        self.rows = array("i", other.rows)
+        self.row_count = array("i", other.row_count)
+        self.diagonal1_count = array("i", other.diagonal1_count)
+        self.diagonal2_count = array("i", other.diagonal2_count)
+        self.conflicts = other.conflicts
+
+    @override
+    def es_from_server(self, other):
+        self.es_copy_from(other)
+
+    @override
+    def es_to_json(self) -> dict:
+        data = {
+            "rows": self.rows.tolist()
+        }
+
+        return data
+
+    @override
+    def es_from_json(self, data: dict):
+        self.size = len(data["rows"])
+        self.rows = array("i", data["rows"])
+        self.es_count_conflicts()
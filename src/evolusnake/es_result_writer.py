@@ -0,0 +1,130 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines a background writer for the results on the server.
+New best individuals are put into a bounded queue, converted to JSON and
+written to disk by a separate thread, so the server is never blocked by
+slow disk writes or by es_to_json().
+If several results are waiting only the newest one is written, the older
+ones are dropped: there is no file for them and they're missing in the
+result history file. The number of dropped results is logged as coalesced.
+"""
+
+# Python std lib:
+import logging
+import json
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+# Local imports:
+from evolusnake.es_individual import ESIndividual
+
+logger = logging.getLogger(__name__)
+
+
+def es_write_json_atomic(filename: str, data: dict):
+    # Write to a temporary file first and then replace the target,
+    # so there is never a partially written result file.
+    tmp_filename: str = f"{filename}.tmp"
+
+    with open(tmp_filename, "w") as f:
+        json.dump(data, f)
+
+    os.replace(tmp_filename, filename)
+
+
+class ESResultWriter:
+    def __init__(self, history_filename: str = "", queue_size: int = 16):
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be at least 1, {queue_size}")
+
+        # If a history file is given, all results are appended to this
+        # file (one JSON object per line) instead of separate files.
+        self.history_filename: str = history_filename
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.thread: Optional[threading.Thread] = None
+        # Number of results that have been replaced by a newer one:
+        self.coalesced: int = 0
+        self.written: int = 0
+
+    def es_start(self):
+        self.thread = threading.Thread(target=self.es_run, daemon=True)
+        self.thread.start()
+
+    def es_stop(self):
+        # Writes all pending results and waits for the thread to finish.
+        if self.thread is None:
+            return
+
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+        logger.debug("Result writer stopped: written=%d, coalesced=%d", self.written, self.coalesced)
+
+    def es_submit(self, filename: str, counter: int, ind: ESIndividual):
+        # Never blocks. If the queue is full the oldest result is dropped.
+        # The individual is converted to JSON in the writer thread, so it must not
+        # be modified afterwards. The fitness values are copied here, since the
+        # server may re-evaluate its population.
+        item: tuple[str, int, ESIndividual, float, float] = (filename, counter, ind, ind.fitness, ind.fitness2)
+
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.coalesced += 1
+                except queue.Empty:
+                    pass
+
+    def es_run(self):
+        running: bool = True
+
+        while running:
+            item: Optional[tuple[str, int, ESIndividual, float, float]] = self.queue.get()
+
+            if item is None:
+                break
+
+            # Skip all older results that are still waiting:
+            while True:
+                try:
+                    next_item: Optional[tuple[str, int, ESIndividual, float, float]] = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if next_item is None:
+                    running = False
+                    break
+
+                item = next_item
+                self.coalesced += 1
+
+            try:
+                self.es_write(*item)
+            except OSError as e:
+                logger.error(f"Could not write result: {e}")
+
+    def es_write(self, filename: str, counter: int, ind: ESIndividual, fitness: float, fitness2: float):
+        data: dict = ind.es_to_json()
+        data["fitness"] = fitness
+        data["fitness2"] = fitness2
+
+        if self.history_filename:
+            line: str = json.dumps({"counter": counter, "time": time.time(), "individual": data})
+
+            with open(self.history_filename, "a") as f:
+                f.write(line + "\n")
+        else:
+            es_write_json_atomic(filename, data)
+
+        self.written += 1
@@ -0,0 +1,197 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the node scheduler for the server.
+It tracks the throughput, improvement rate and latency of each node and
+decides what each node gets: the best individual or a diverse one from the
+elite population, and whether a stagnant node should restart.
+The decision is sent to the node together with the individual as a
+message dict (ESIndividual.server_message).
+In portfolio mode it also assigns a population kind and parameters to each
+node (see es_portfolio) based on the accepted results per CPU second.
+"""
+
+# Python std lib:
+import logging
+import time
+import statistics
+from typing import Optional
+
+# External imports:
+from parasnake.ps_nodeid import PSNodeId
+
+# Local imports:
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+
+class ESNodeStats:
+    def __init__(self):
+        self.first_request: float = time.time()
+        self.last_request: float = 0.0
+        self.results: int = 0
+        self.accepted: int = 0
+        self.improvements: int = 0
+        # Number of results since the last accepted one:
+        self.stagnation: int = 0
+        self.total_latency: float = 0.0
+        # Current portfolio entry of this node and the number of results with it:
+        self.entry: int = -1
+        self.entry_results: int = 0
+
+    def es_throughput(self) -> float:
+        # Results per second.
+        elapsed: float = max(time.time() - self.first_request, 1e-9)
+        return self.results / elapsed
+
+    def es_improvement_rate(self) -> float:
+        # Accepted results per result.
+        if self.results == 0:
+            return 0.0
+        return self.accepted / self.results
+
+    def es_latency(self) -> float:
+        # Average time in seconds between sending the data and getting the result.
+        if self.results == 0:
+            return 0.0
+        return self.total_latency / self.results
+
+
+class ESPortfolioStats:
+    def __init__(self):
+        self.results: int = 0
+        self.accepted: int = 0
+        self.cpu_seconds: float = 0.0
+
+    def es_score(self) -> float:
+        # Accepted results per CPU second.
+        return self.accepted / max(self.cpu_seconds, 1e-9)
+
+
+class ESNodeScheduler:
+    # Probability to assign a random portfolio entry instead of the best one:
+    EXPLORE_PROBABILITY: float = 0.1
+
+    def __init__(self, stagnation_limit: int, portfolio: Optional[list[dict]] = None,
+            portfolio_interval: int = 10):
+        if stagnation_limit < 1:
+            raise ValueError(f"Stagnation limit must be at least 1, {stagnation_limit}")
+
+        if portfolio_interval < 1:
+            raise ValueError(f"Portfolio interval must be at least 1, {portfolio_interval}")
+
+        self.stagnation_limit: int = stagnation_limit
+        self.node_stats: dict[PSNodeId, ESNodeStats] = {}
+        # Each entry contains the population kind and other options for the node.
+        self.portfolio: list[dict] = portfolio or []
+        self.portfolio_stats: list[ESPortfolioStats] = [ESPortfolioStats() for _ in self.portfolio]
+        # Number of results before a node gets a new portfolio entry:
+        self.portfolio_interval: int = portfolio_interval
+
+        logger.debug(f"{self.stagnation_limit=}, {self.portfolio=}, {self.portfolio_interval=}")
+
+    def es_get_stats(self, node_id: PSNodeId) -> ESNodeStats:
+        stats: Optional[ESNodeStats] = self.node_stats.get(node_id)
+
+        if stats is None:
+            stats = ESNodeStats()
+            self.node_stats[node_id] = stats
+
+        return stats
+
+    def es_node_request(self, node_id: PSNodeId) -> dict:
+        # Called when the node needs new data.
+        # Returns the message for the node.
+        stats: ESNodeStats = self.es_get_stats(node_id)
+        stats.last_request = time.time()
+
+        message: dict = {"share_best": self.es_is_productive(node_id)}
+
+        if self.portfolio:
+            if (stats.entry < 0) or (stats.entry_results >= self.portfolio_interval):
+                stats.entry = self.es_select_entry()
+                stats.entry_results = 0
+
+            message["portfolio"] = self.portfolio[stats.entry]
+
+        if stats.stagnation >= self.stagnation_limit:
+            logger.debug("Node %s is stagnant, send restart signal", node_id)
+            stats.stagnation = 0
+            message["restart"] = True
+
+        return message
+
+    def es_node_result(self, node_id: PSNodeId, accepted: bool, improved: bool,
+            cpu_seconds: Optional[float] = None):
+        # Called for each result from the node.
+        # If the node doesn't report the CPU time, the latency is used instead.
+        stats: ESNodeStats = self.es_get_stats(node_id)
+        stats.results += 1
+        latency: float = 0.0
+
+        if stats.last_request > 0.0:
+            latency = time.time() - stats.last_request
+            stats.total_latency += latency
+
+        if stats.entry >= 0:
+            stats.entry_results += 1
+            entry_stats: ESPortfolioStats = self.portfolio_stats[stats.entry]
+            entry_stats.results += 1
+            entry_stats.cpu_seconds += latency if cpu_seconds is None else cpu_seconds
+
+            if accepted:
+                entry_stats.accepted += 1
+
+        if accepted:
+            stats.accepted += 1
+            stats.stagnation = 0
+        else:
+            stats.stagnation += 1
+
+        if improved:
+            stats.improvements += 1
+
+    def es_remove_node(self, node_id: PSNodeId):
+        self.node_stats.pop(node_id, None)
+
+    def es_select_entry(self) -> int:
+        # First try all the portfolio entries, then mostly use the one with
+        # the best score. Sometimes pick a random one, the best entry may
+        # change while the search goes on.
+        untried: list[int] = [i for (i, stats) in enumerate(self.portfolio_stats) if stats.results == 0]
+
+        if untried:
+            # The entry that is used by the fewest nodes:
+            usage: list[int] = [sum(1 for stats in self.node_stats.values() if stats.entry == i) for i in untried]
+            return untried[usage.index(min(usage))]
+
+        if utils.es_uniform5(0.0, 1.0) < self.EXPLORE_PROBABILITY:
+            return utils.es_rand_int(len(self.portfolio))
+
+        scores: list[float] = [stats.es_score() for stats in self.portfolio_stats]
+        return scores.index(max(scores))
+
+    def es_is_productive(self, node_id: PSNodeId) -> bool:
+        # A node is productive if its improvement rate is at least the median
+        # of all nodes. Productive nodes continue with the best individual,
+        # the others get a random one from the elite population.
+        rates: list[float] = [stats.es_improvement_rate() for stats in self.node_stats.values()]
+
+        if len(rates) < 2:
+            return True
+
+        return self.node_stats[node_id].es_improvement_rate() >= statistics.median(rates)
+
+    def es_log_stats(self):
+        for (node_id, stats) in self.node_stats.items():
+            logger.info("Node %s: results=%d, accepted=%d, improvements=%d, throughput=%.3f/s, latency=%.3f s",
+                node_id, stats.results, stats.accepted, stats.improvements,
+                stats.es_throughput(), stats.es_latency())
+
+        for (entry, stats) in zip(self.portfolio, self.portfolio_stats):
+            logger.info("Portfolio %s: results=%d, accepted=%d, cpu_seconds=%.3f, score=%.3f",
+                entry, stats.results, stats.accepted, stats.cpu_seconds, stats.es_score())
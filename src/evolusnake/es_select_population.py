@@ -5,58 +5,108 @@
 
 # Python std lib:
 import logging
+import importlib
+from typing import Callable, Optional, Union, TYPE_CHECKING
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
 from evolusnake.es_population import ESIterationCallBack
-from evolusnake.es_population_node1 import ESPopulationNode1
-from evolusnake.es_population_node2 import ESPopulationNode2
-from evolusnake.es_population_node3 import ESPopulationNode3
-from evolusnake.es_population_node4 import ESPopulationNode4
-from evolusnake.es_population_node5 import ESPopulationNode5
-from evolusnake.es_population_node6 import ESPopulationNode6
-from evolusnake.es_population_node7 import ESPopulationNode7
-from evolusnake.es_population_node8 import ESPopulationNode8
-from evolusnake.es_population_node9 import ESPopulationNode9
-from evolusnake.es_population_node10 import ESPopulationNode10
-from evolusnake.es_population_node11 import ESPopulationNode11
-
-# External imports:
-from parasnake.ps_node import PSNode
+
+if TYPE_CHECKING:
+    # External imports:
+    from parasnake.ps_node import PSNode
 
 
 logger = logging.getLogger(__name__)
 
+# Creates the node for a population kind:
+ESPopulationFactory = Callable[[ESConfiguration, ESIndividual, ESIterationCallBack], "PSNode"]
+
+# Entry point group for population kinds from other packages.
+# The name of the entry point is the number of the population kind, for example:
+# [project.entry-points."evolusnake.population_kinds"]
+# 100 = "my_package.my_node:MyPopulationNode"
+ES_POPULATION_ENTRY_POINTS: str = "evolusnake.population_kinds"
+
+# The built-in population kinds are given as "module:class" and only
+# imported when they are used. This keeps the startup of a node fast
+# and node 12 needs NumPy.
+ES_POPULATION_KINDS: dict[int, Union[ESPopulationFactory, str]] = {
+    1: "evolusnake.es_population_node1:ESPopulationNode1",
+    2: "evolusnake.es_population_node2:ESPopulationNode2",
+    3: "evolusnake.es_population_node3:ESPopulationNode3",
+    4: "evolusnake.es_population_node4:ESPopulationNode4",
+    5: "evolusnake.es_population_node5:ESPopulationNode5",
+    6: "evolusnake.es_population_node6:ESPopulationNode6",
+    7: "evolusnake.es_population_node7:ESPopulationNode7",
+    8: "evolusnake.es_population_node8:ESPopulationNode8",
+    9: "evolusnake.es_population_node9:ESPopulationNode9",
+    10: "evolusnake.es_population_node10:ESPopulationNode10",
+    11: "evolusnake.es_population_node11:ESPopulationNode11",
+    12: "evolusnake.es_population_node12:ESPopulationNode12",
+    13: "evolusnake.es_population_node13:ESPopulationNode13",
+    14: "evolusnake.es_population_node14:ESPopulationNode14",
+    15: "evolusnake.es_population_node15:ESPopulationNode15",
+}
+
+
+def es_load_factory(spec: str) -> ESPopulationFactory:
+    # Imports the factory given as "module:name".
+    (module_name, _, name) = spec.partition(":")
+
+    if not name:
+        raise ValueError(f"Invalid population factory, expected 'module:name': {spec}")
+
+    module = importlib.import_module(module_name)
+    return getattr(module, name)
+
+
+def es_register_population(kind: int, factory: Union[ESPopulationFactory, str]):
+    # Adds a new population kind, for example a subclass of ESPopulationNodeBase.
+    # The factory can also be given as "module:name", then it's imported when it's used.
+    if kind in ES_POPULATION_KINDS:
+        raise ValueError(f"Population kind already registered: {kind}")
+
+    logger.debug("Register population kind %d: %s", kind, factory)
+    ES_POPULATION_KINDS[kind] = factory
+
+
+def es_load_entry_points():
+    # Registers the population kinds of all installed packages.
+    # importlib.metadata is slow to import, so only do it when it's needed:
+    import importlib.metadata
+
+    for entry_point in importlib.metadata.entry_points(group=ES_POPULATION_ENTRY_POINTS):
+        try:
+            kind: int = int(entry_point.name)
+        except ValueError:
+            logger.error("Invalid population kind in entry point: %s", entry_point.name)
+            continue
+
+        if kind not in ES_POPULATION_KINDS:
+            es_register_population(kind, entry_point.value)
+
 
 def es_select_population(configuration: ESConfiguration, individual: ESIndividual,
-        iteration_callback: ESIterationCallBack = ESIterationCallBack()) -> PSNode:
+        iteration_callback: ESIterationCallBack = ESIterationCallBack()) -> "PSNode":
     pop_kind: int = configuration.population_kind
 
-    match pop_kind:
-        case 1:
-            return ESPopulationNode1(configuration, individual, iteration_callback)
-        case 2:
-            return ESPopulationNode2(configuration, individual, iteration_callback)
-        case 3:
-            return ESPopulationNode3(configuration, individual, iteration_callback)
-        case 4:
-            return ESPopulationNode4(configuration, individual, iteration_callback)
-        case 5:
-            return ESPopulationNode5(configuration, individual, iteration_callback)
-        case 6:
-            return ESPopulationNode6(configuration, individual, iteration_callback)
-        case 7:
-            return ESPopulationNode7(configuration, individual, iteration_callback)
-        case 8:
-            return ESPopulationNode8(configuration, individual, iteration_callback)
-        case 9:
-            return ESPopulationNode9(configuration, individual, iteration_callback)
-        case 10:
-            return ESPopulationNode10(configuration, individual, iteration_callback)
-        case 11:
-            return ESPopulationNode11(configuration, individual, iteration_callback)
-        case _:
-            raise ValueError(f"Unknown population kind: {pop_kind}")
+    if configuration.portfolio:
+        # The server assigns the population kind:
+        from evolusnake.es_portfolio import ESPortfolioNode
+        return ESPortfolioNode(configuration, individual, iteration_callback)
+
+    if pop_kind not in ES_POPULATION_KINDS:
+        es_load_entry_points()
+
+    factory: Optional[Union[ESPopulationFactory, str]] = ES_POPULATION_KINDS.get(pop_kind)
+
+    if factory is None:
+        raise ValueError(f"Unknown population kind: {pop_kind}")
 
+    if isinstance(factory, str):
+        factory = es_load_factory(factory)
+        ES_POPULATION_KINDS[pop_kind] = factory
 
+    return factory(configuration, individual, iteration_callback)
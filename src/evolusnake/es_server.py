@@ -9,14 +9,22 @@ This module defines the Parasnake server class.
 
 # Python std lib:
 import logging
-import json
+import os
 import time
+import uuid
 from typing import override, Optional
 from collections import Counter
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 from evolusnake.es_individual import ESIndividual
+from evolusnake.es_pareto import es_dominates, es_non_dominated_sort, es_crowding_distance
+from evolusnake.es_metrics import ESMetrics, es_create_metrics
+from evolusnake.es_checkpoint import ESCheckpoint
+from evolusnake.es_parallel import es_evaluate_population
+from evolusnake.es_result_writer import ESResultWriter, es_write_json_atomic
+from evolusnake.es_history import ESHistoryRecorder
+from evolusnake.es_scheduler import ESNodeScheduler
 import evolusnake.es_utils as utils
 
 # External imports:
@@ -45,34 +53,220 @@ class ESServer(PSServer):
         self.save_new_fitness: bool = config.save_new_fitness
         self.allow_same_fitness: bool = config.allow_same_fitness
         self.share_only_best: bool = config.share_only_best
+        self.noisy_fitness: bool = config.noisy_fitness
+        self.reevaluate_interval: int = config.reevaluate_interval
+        self.reevaluate_counter: int = 0
+        self.fitness_epoch: int = 0
+        # Owns the data of the server, noisy results are evaluated on it:
+        self.fitness_data: ESIndividual = individual
+        self.pareto_archive: bool = config.pareto_archive
+        self.niching_radius: float = config.niching_radius
+
+        if self.niching_radius < 0.0:
+            raise ValueError(f"Niching radius must not be negative, {self.niching_radius}")
+
+        self.init_batch_size: int = config.init_batch_size
+
+        if self.init_batch_size < 0:
+            raise ValueError(f"Init batch size must not be negative, {self.init_batch_size}")
+
         self.new_fitness_counter: int = 0
         self.node_stats: Counter = Counter()
         self.target2_met: bool = False
+        self.metrics: Optional[ESMetrics] = es_create_metrics(config, "server")
+        self.result_writer: Optional[ESResultWriter] = None
+        self.history: Optional[ESHistoryRecorder] = None
+        self.scheduler: Optional[ESNodeScheduler] = None
 
-        for _ in range(self.population_size):
-            ind: ESIndividual = individual.es_clone()
-            ind.es_mutate(0)
-            ind.es_calculate_fitness()
-            self.population.append(ind)
+        if config.node_scheduler or config.portfolio:
+            self.scheduler = ESNodeScheduler(config.node_stagnation_limit, config.portfolio,
+                config.portfolio_interval)
 
-        self.population.sort(key=lambda ind: ind.fitness)
+        if config.fitness_history_filename:
+            # When the server resumes from a checkpoint the history is continued:
+            resume: bool = bool(config.checkpoint_filename) and os.path.isfile(config.checkpoint_filename)
+            self.history = ESHistoryRecorder(config.fitness_history_filename, config.fitness_history_buffer,
+                resume)
+
+        if self.save_new_fitness:
+            # Write new best results in the background:
+            self.result_writer = ESResultWriter(config.result_history_filename)
+            self.result_writer.es_start()
+
+        self.checkpoint: Optional[ESCheckpoint] = None
+        resumed: bool = False
+
+        if config.checkpoint_filename:
+            self.checkpoint = ESCheckpoint(config.checkpoint_filename, config.checkpoint_compact,
+                config.checkpoint_sync_interval)
+
+            if self.checkpoint.es_exists():
+                resumed = self.es_load_checkpoint()
+
+        if not resumed:
+            # Only create and evaluate a new population if there is no checkpoint:
+            self.es_init_population(individual, config.init_workers)
+
+        if self.checkpoint is not None:
+            # Start with a compacted checkpoint:
+            self.es_write_checkpoint()
 
         logger.debug(f"{self.population_size=}, {self.target_fitness=}, {self.target_fitness2=}")
         logger.debug(f"{self.result_filename=}, {self.save_new_fitness=}")
         logger.debug(f"{self.allow_same_fitness=}, {self.share_only_best=}")
+        logger.debug(f"{self.noisy_fitness=}, {self.reevaluate_interval=}")
+        logger.debug(f"{self.pareto_archive=}, {self.niching_radius=}")
+        logger.debug(f"{self.init_batch_size=}")
 
         # Initialize random number generator:
-        utils.es_init_seed()
+        utils.es_init_seed(config.random_seed)
 
         self.start_time: float = time.time()
 
+    def es_result_json(self) -> dict:
+        ind = self.population[0]
+        data = ind.es_to_json()
+        data["fitness"] = ind.fitness
+        data["fitness2"] = ind.fitness2
+        return data
+
     def es_save_data(self, filename: str):
-        with open(filename, "w") as f:
-            ind = self.population[0]
-            data = ind.es_to_json()
-            data["fitness"] = ind.fitness
-            data["fitness2"] = ind.fitness2
-            json.dump(data, f)
+        es_write_json_atomic(filename, self.es_result_json())
+
+    def es_save_new_fitness(self):
+        # The best individual is converted to JSON and written to disk in the background.
+        # The server never changes its individuals in place (only the fitness values,
+        # which es_submit() copies), so no clone is needed.
+        if self.result_writer is not None:
+            filename: str = f"{self.new_fitness_counter}_{self.result_filename}"
+            self.result_writer.es_submit(filename, self.new_fitness_counter, self.population[0])
+
+    def es_init_population(self, individual: ESIndividual, init_workers: int):
+        for _ in range(self.population_size):
+            ind: ESIndividual = individual.es_clone()
+            ind.es_mutate(0)
+            self.population.append(ind)
+
+        es_evaluate_population(self.population, init_workers)
+
+        if self.pareto_archive:
+            # Only keep the non-dominated individuals.
+            # The fitness has already been calculated:
+            for ind in self.population:
+                ind.es_calculate_objectives()
+
+            objectives: list[list[float]] = [ind.objectives for ind in self.population]
+            front: list[int] = es_non_dominated_sort(objectives)[0]
+            self.population = [self.population[i] for i in front]
+
+        self.population.sort(key=lambda ind: ind.fitness)
+
+    def es_individual_from_json(self, data: dict) -> ESIndividual:
+        ind: ESIndividual = self.fitness_data.es_clone()
+        ind.es_from_json_internal(data)
+        ind.fitness_epoch = self.fitness_epoch
+        return ind
+
+    def es_write_checkpoint(self):
+        # Write the whole server state as a new snapshot (compaction).
+        if self.checkpoint is None:
+            return
+
+        record: dict = {
+            "type": "snapshot",
+            "population": [ind.es_to_json_internal() for ind in self.population],
+            "node_stats": {str(node_id.id): count for (node_id, count) in self.node_stats.items()},
+            "new_fitness_counter": self.new_fitness_counter,
+            "fitness_epoch": self.fitness_epoch,
+            "target2_met": self.target2_met,
+        }
+
+        self.checkpoint.es_write_snapshot(record)
+        logger.debug("Checkpoint written: %s", self.checkpoint.filename)
+
+    def es_append_checkpoint(self, ind: ESIndividual, node_id: Optional[PSNodeId]):
+        # Append a new individual of the population.
+        # node_id is only set if it's a new best individual.
+        if self.checkpoint is None:
+            return
+
+        record: dict = {
+            "type": "add",
+            "individual": ind.es_to_json_internal(),
+            "node": None if node_id is None else str(node_id.id),
+            "target2_met": self.target2_met,
+        }
+
+        if self.checkpoint.es_append(record):
+            self.es_write_checkpoint()
+
+    def es_load_checkpoint(self) -> bool:
+        # Resume from the snapshot and replay all the incremental records.
+        # Returns False if there is nothing to resume from.
+        assert self.checkpoint is not None
+
+        records: list[dict] = self.checkpoint.es_read()
+
+        if (not records) or (records[0]["type"] != "snapshot"):
+            logger.warning("No snapshot in checkpoint %s, start from scratch.", self.checkpoint.filename)
+            return False
+
+        snapshot: dict = records[0]
+        node_ids: dict[str, PSNodeId] = {}
+
+        def get_node_id(key: str) -> PSNodeId:
+            # Nodes keep their ID when the server restarts.
+            if key not in node_ids:
+                node_id: PSNodeId = PSNodeId()
+                node_id.id = uuid.UUID(key)
+                node_ids[key] = node_id
+            return node_ids[key]
+
+        self.fitness_epoch = snapshot["fitness_epoch"]
+        self.new_fitness_counter = snapshot["new_fitness_counter"]
+        self.target2_met = snapshot["target2_met"]
+        self.node_stats = Counter({get_node_id(key): count for (key, count) in snapshot["node_stats"].items()})
+        self.population = [self.es_individual_from_json(data) for data in snapshot["population"]]
+        self.population.sort(key=lambda ind: ind.fitness)
+
+        for record in records[1:]:
+            ind: ESIndividual = self.es_individual_from_json(record["individual"])
+
+            if record["target2_met"]:
+                self.target2_met = True
+                self.population[0] = ind
+            elif self.pareto_archive:
+                self.es_pareto_insert(ind)
+            else:
+                replace_index: int = self.es_replace_index(ind)
+
+                if replace_index >= 0:
+                    self.population[replace_index] = ind
+                    self.population.sort(key=lambda ind: ind.fitness)
+
+            if record["node"] is not None:
+                self.new_fitness_counter += 1
+                self.node_stats[get_node_id(record["node"])] += 1
+
+        logger.info("Resumed from checkpoint %s: %d records", self.checkpoint.filename, len(records) - 1)
+        logger.info("Best fitness: %s, new fitness counter: %d", self.population[0].fitness, self.new_fitness_counter)
+
+        return True
+
+    def es_reevaluate_population(self):
+        # Re-evaluate all individuals of the server population, so that
+        # individuals that had a lucky batch on a node do not stay forever.
+        self.fitness_epoch += 1
+
+        for ind in self.population:
+            ind.es_use_fitness_data(self.fitness_data)
+            ind.es_calculate_fitness()
+            ind.fitness_epoch = self.fitness_epoch
+
+        self.population.sort(key=lambda ind: ind.fitness)
+        self.es_write_checkpoint()
+        logger.debug("Population re-evaluated: fitness_epoch=%d, best: %s",
+            self.fitness_epoch, self.population[0].fitness)
 
     @override
     def ps_is_job_done(self) -> bool:
@@ -91,26 +285,112 @@ class ESServer(PSServer):
 
         return job_done
 
+    @override
+    def ps_get_init_data(self, node_id: PSNodeId) -> Optional[list[ESIndividual]]:
+        # A new node gets the best individuals, so it doesn't have
+        # to start with a random population.
+        if self.init_batch_size == 0:
+            return None
+
+        logger.debug("Send %d elite individuals to new node: %s", self.init_batch_size, node_id)
+
+        elite: list[ESIndividual] = sorted(self.population, key=lambda ind: ind.fitness)[:self.init_batch_size]
+        return [ind.es_clone_internal() for ind in elite]
+
     @override
     def ps_get_new_data(self, node_id: PSNodeId) -> Optional[ESIndividual]:
         # logger.debug(f"Request from node: {node_id}")
+        if self.scheduler is not None:
+            return self.es_get_scheduled_data(node_id)
+
         i: int = 0
 
         if not self.share_only_best:
             # Pick a random individual from the current population of best
             # individuals and return it to the node.
             # (avoid to get stuck in a local minimum)
-            i = utils.es_rand_int(self.population_size)
+            i = utils.es_rand_int(len(self.population))
 
         return self.population[i]
 
+    def es_get_scheduled_data(self, node_id: PSNodeId) -> ESIndividual:
+        # The scheduler decides if the node gets the best individual
+        # or a random one and if it should restart.
+        assert self.scheduler is not None
+
+        message: dict = self.scheduler.es_node_request(node_id)
+        i: int = 0
+
+        if not message["share_best"]:
+            i = utils.es_rand_int(len(self.population))
+
+        # The individual in the population may be sent to other nodes
+        # with a different message, so send a clone:
+        ind: ESIndividual = self.population[i].es_clone_internal()
+        ind.server_message = message
+
+        return ind
+
     @override
     def ps_process_result(self, node_id: PSNodeId, result: ESIndividual):
+        new_fitness_counter: int = self.new_fitness_counter
+        self.es_process_result(node_id, result)
+
+        if (self.history is None) and (self.scheduler is None):
+            return
+
+        accepted: bool = any(ind is result for ind in self.population)
+
+        if self.history is not None:
+            self.history.es_record(node_id.id.bytes, result.fitness, result.fitness2, accepted)
+
+        if self.scheduler is not None:
+            self.scheduler.es_node_result(node_id, accepted, self.new_fitness_counter > new_fitness_counter,
+                result.node_message.get("cpu_seconds"))
+
+    @override
+    def ps_check_heartbeat(self) -> None:
+        super().ps_check_heartbeat()
+
+        if self.checkpoint is not None:
+            # Called regularly from the main loop: sync the records that have been
+            # appended since the last sync, so they're not only in the OS cache.
+            # Not called from a locked method:
+            with self.lock:
+                self.checkpoint.es_sync()
+
+    @override
+    def ps_node_timeout(self, node_id: PSNodeId) -> None:
+        logger.info("Node timeout: %s", node_id)
+
+        if self.scheduler is not None:
+            # Not called from a locked method:
+            with self.lock:
+                self.scheduler.es_remove_node(node_id)
+
+    def es_process_result(self, node_id: PSNodeId, result: ESIndividual):
         # logger.debug(f"Got new individual from node: {node_id}")
 
+        if self.metrics is not None:
+            self.metrics.es_increment("results")
+            self.metrics.es_export()
+
         if self.target2_met:
             return
 
+        if self.noisy_fitness:
+            # Nodes may have used different data sets, so compare
+            # all individuals on the data set of the server:
+            result.es_use_fitness_data(self.fitness_data)
+            result.es_calculate_fitness()
+            result.fitness_epoch = self.fitness_epoch
+
+            if self.reevaluate_interval > 0:
+                self.reevaluate_counter += 1
+                if self.reevaluate_counter >= self.reevaluate_interval:
+                    self.reevaluate_counter = 0
+                    self.es_reevaluate_population()
+
         new_fitness: float = result.fitness
         new_fitness2: float = result.fitness2
 
@@ -118,12 +398,17 @@ class ESServer(PSServer):
             # Short cut if target 2 is met.
             self.target2_met = True
             self.population[0] = result
-            logger.info(f"Target 2 is met: {new_fitness2=}, {self.target_fitness2=}")
-            logger.info(f"From node: {node_id}")
+            self.es_append_checkpoint(result, node_id)
+            logger.info("Target 2 is met: new_fitness2=%s, target_fitness2=%s", new_fitness2, self.target_fitness2)
+            logger.info("From node: %s", node_id)
             # User code to do some additional stuff.
             result.es_new_best_individual()
             return
 
+        if self.pareto_archive:
+            self.es_process_result_pareto(node_id, result)
+            return
+
         if new_fitness < self.population[-1].fitness:
             if not self.allow_same_fitness:
                 # Only allow unique individuals:
@@ -131,33 +416,143 @@ class ESServer(PSServer):
                     if ind.fitness == new_fitness:
                         return
 
-            # Overwrite (kill) last (worst) individual:
-            self.population[-1] = result
+            replace_index: int = self.es_replace_index(result)
+
+            if replace_index < 0:
+                return
 
-            actual_fitness: float = result.es_actual_fitness()
-            logger.debug(f"New fitness in population: {new_fitness}, {actual_fitness=}")
+            # Overwrite (kill) the worst individual or the one in the same niche:
+            self.population[replace_index] = result
+
+            if self.metrics is not None:
+                self.metrics.es_increment("results_accepted")
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("New fitness in population: %s, actual_fitness=%s",
+                    new_fitness, result.es_actual_fitness())
 
             current_best_fitness: float = self.population[0].fitness
 
             self.population.sort(key=lambda ind: ind.fitness)
 
+            self.es_append_checkpoint(result, node_id if new_fitness < current_best_fitness else None)
+
             if new_fitness < current_best_fitness:
                 self.new_fitness_counter += 1
 
-                logger.info(f"New best fitness: {new_fitness}, previous: {current_best_fitness}")
-                logger.info(f"From node: {node_id}, new fitness counter: {self.new_fitness_counter}")
-                logger.debug(f"Worst fitness: {self.population[-1].fitness}")
+                logger.info("New best fitness: %s, previous: %s", new_fitness, current_best_fitness)
+                logger.info("From node: %s, new fitness counter: %d", node_id, self.new_fitness_counter)
+                logger.debug("Worst fitness: %s", self.population[-1].fitness)
 
                 self.node_stats[node_id] += 1
-                logger.debug(f"{self.node_stats}")
+                logger.debug("%s", self.node_stats)
+                self.es_record_new_best(node_id)
 
                 # User code to do some additional stuff.
                 result.es_new_best_individual()
 
-                if self.save_new_fitness:
-                    self.es_save_data(f"{self.new_fitness_counter}_{self.result_filename}")
+                self.es_save_new_fitness()
+
+    def es_replace_index(self, result: ESIndividual) -> int:
+        # Returns the index of the individual that is replaced by the result, or -1.
+        # Without niching it's always the worst individual.
+        # With niching the closest individual within the niching radius
+        # is replaced, but only if the result is better. So a niche can
+        # not take over the whole population.
+        if self.niching_radius <= 0.0:
+            return len(self.population) - 1
+
+        closest_index: int = -1
+        closest_distance: float = self.niching_radius
+
+        for (i, ind) in enumerate(self.population):
+            distance: float = result.es_distance(ind)
+
+            if distance < closest_distance:
+                closest_distance = distance
+                closest_index = i
+
+        if closest_index < 0:
+            return len(self.population) - 1
+
+        if result.fitness < self.population[closest_index].fitness:
+            return closest_index
+
+        logger.debug("Result rejected, niche is occupied by a better individual: %d", closest_index)
+
+        return -1
+
+    def es_process_result_pareto(self, node_id: PSNodeId, result: ESIndividual):
+        # Pareto archive: keep all the non-dominated individuals.
+        # If the archive is full, remove the most crowded one.
+        if not result.objectives:
+            result.objectives = [result.fitness, result.fitness2]
+
+        current_best_fitness: float = self.population[0].fitness
+
+        if not self.es_pareto_insert(result):
+            return
+
+        logger.debug("New objectives in archive: %s, archive size: %d", result.objectives, len(self.population))
+
+        self.es_append_checkpoint(result, node_id if result.fitness < current_best_fitness else None)
+
+        if self.metrics is not None:
+            self.metrics.es_increment("results_accepted")
+
+        if result.fitness < current_best_fitness:
+            self.new_fitness_counter += 1
+
+            logger.info("New best fitness: %s, previous: %s", result.fitness, current_best_fitness)
+            logger.info("From node: %s, new fitness counter: %d", node_id, self.new_fitness_counter)
+
+            self.node_stats[node_id] += 1
+            self.es_record_new_best(node_id)
+            result.es_new_best_individual()
+
+            self.es_save_new_fitness()
+
+    def es_pareto_insert(self, result: ESIndividual) -> bool:
+        # Returns False if the result is dominated by (or equal to) a member of the archive,
+        # or if it's the most crowded one and removed again.
+        for ind in self.population:
+            if (ind.objectives == result.objectives) or es_dominates(ind.objectives, result.objectives):
+                return False
+
+        self.population = [ind for ind in self.population if not es_dominates(result.objectives, ind.objectives)]
+        self.population.append(result)
+        accepted: bool = True
+
+        if len(self.population) > self.population_size:
+            objectives: list[list[float]] = [ind.objectives for ind in self.population]
+            distance: dict[int, float] = es_crowding_distance(objectives, list(range(len(self.population))))
+            most_crowded: int = min(distance, key=lambda i: distance[i])
+            # The result is the last one:
+            accepted = most_crowded < len(self.population) - 1
+            del self.population[most_crowded]
+
+        self.population.sort(key=lambda ind: ind.fitness)
+
+        return accepted
+
+    def es_record_new_best(self, node_id: PSNodeId):
+        # The improvement rate per node is the rate of node_improvements.
+        if self.metrics is not None:
+            self.metrics.es_increment("new_best")
+            self.metrics.es_increment("node_improvements", label=str(node_id.id))
+            self.metrics.es_set_gauge("best_fitness", self.population[0].fitness)
 
     @override
     def ps_save_data(self) -> None:
+        if self.result_writer is not None:
+            self.result_writer.es_stop()
+
+        if self.history is not None:
+            self.history.es_flush()
+
+        if self.scheduler is not None:
+            self.scheduler.es_log_stats()
+
         self.es_save_data(self.result_filename)
+        self.es_write_checkpoint()
 
@@ -0,0 +1,327 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the Sudoku problem.
+ESSudokuPuzzle contains the given numbers of the puzzle, the empty cells
+and the missing digits of each unit (row, column and block).
+It's shared by all individuals.
+ESSudokuIndividual stores the grid as a flat array with 81 cells
+(index = row * 9 + column, 0 = empty) and for each of the 27 units how often
+each digit is used. The errors of a unit are the number of cells that are empty
+or contain a duplicate, that is 9 minus the number of different digits in it.
+Setting a cell updates the three units of the cell and the errors in O(1),
+so es_calculate_fitness() does not have to check the whole grid.
+The changes of a move can be recorded and undone with es_undo(),
+mutation operation 7 uses this to reject moves that increase the errors.
+"""
+
+# Python std lib:
+import logging
+from array import array
+from typing import override, Self
+
+# Local imports:
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_distance import es_hamming_distance
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+# Units 0 - 8 are the rows, 9 - 17 the columns and 18 - 26 the blocks.
+# The three units of each cell:
+ES_SUDOKU_CELL_UNITS: list[tuple[int, int, int]] = [
+    (row, 9 + col, 18 + ((row // 3) * 3) + (col // 3)) for row in range(9) for col in range(9)]
+
+# The nine cells of each unit:
+ES_SUDOKU_UNIT_CELLS: list[list[int]] = [[] for _ in range(27)]
+
+for (cell, units) in enumerate(ES_SUDOKU_CELL_UNITS):
+    for unit in units:
+        ES_SUDOKU_UNIT_CELLS[unit].append(cell)
+
+# The maximum errors, all cells are empty:
+ES_SUDOKU_MAX_ERRORS: int = 27 * 9
+
+
+class ESSudokuPuzzle:
+    def __init__(self, numbers: list[int]):
+        if len(numbers) != 81:
+            raise ValueError(f"A Sudoku puzzle must have 81 cells, {len(numbers)}")
+
+        for n in numbers:
+            if (n < 0) or (n > 9):
+                raise ValueError(f"Invalid number in Sudoku puzzle: {n}")
+
+        self.numbers: list[int] = list(numbers)
+        self.empty_positions: list[int] = [cell for (cell, n) in enumerate(self.numbers) if n == 0]
+
+        if not self.empty_positions:
+            raise ValueError("The Sudoku puzzle has no empty cells")
+
+        # The empty cells and the digits that are not given in each unit:
+        self.unit_empty: list[list[int]] = []
+        self.unit_missing: list[list[int]] = []
+
+        for cells in ES_SUDOKU_UNIT_CELLS:
+            given: set[int] = {self.numbers[cell] for cell in cells}
+            self.unit_empty.append([cell for cell in cells if self.numbers[cell] == 0])
+            self.unit_missing.append([n for n in range(1, 10) if n not in given])
+
+        # The counters for the grid with only the given numbers,
+        # every new individual starts with a copy:
+        self.counts: bytearray = bytearray(27 * 10)
+        self.errors: int = ES_SUDOKU_MAX_ERRORS
+
+        for (cell, n) in enumerate(self.numbers):
+            if n > 0:
+                for unit in ES_SUDOKU_CELL_UNITS[cell]:
+                    self.counts[(unit * 10) + n] += 1
+
+                    if self.counts[(unit * 10) + n] == 1:
+                        self.errors -= 1
+
+        logger.debug(f"Empty cells: {len(self.empty_positions)}, {self.errors=}")
+
+
+class ESSudokuIndividual(ESIndividual):
+    def __init__(self, puzzle: ESSudokuPuzzle):
+        super().__init__()
+
+        self.puzzle: ESSudokuPuzzle = puzzle
+        self.numbers2: array = array("b", puzzle.numbers)
+        # counts[(unit * 10) + n] is the number of cells in the unit that contain n:
+        self.counts: bytearray = bytearray(puzzle.counts)
+        self.errors: int = puzzle.errors
+        # The old values of the changed cells, only recorded after es_begin_move():
+        self.undo_log: list[tuple[int, int]] = []
+        self.record_undo: bool = False
+
+    def es_count_errors(self):
+        # Calculates all the counters from the grid, O(81).
+        numbers2: array = self.numbers2
+        self.numbers2 = array("b", [0] * 81)
+        self.counts = bytearray(27 * 10)
+        self.errors = ES_SUDOKU_MAX_ERRORS
+
+        for (cell, n) in enumerate(numbers2):
+            self.es_update_cell(cell, n)
+
+    def es_update_cell(self, cell: int, n: int):
+        old: int = self.numbers2[cell]
+        counts: bytearray = self.counts
+
+        for unit in ES_SUDOKU_CELL_UNITS[cell]:
+            base: int = unit * 10
+
+            # A digit that is no longer used in the unit is an additional error:
+            if old > 0:
+                counts[base + old] -= 1
+
+                if counts[base + old] == 0:
+                    self.errors += 1
+
+            # A digit that is new in the unit removes an error:
+            if n > 0:
+                counts[base + n] += 1
+
+                if counts[base + n] == 1:
+                    self.errors -= 1
+
+        self.numbers2[cell] = n
+
+    def es_set_cell(self, cell: int, n: int):
+        old: int = self.numbers2[cell]
+
+        if old == n:
+            return
+
+        if self.record_undo:
+            self.undo_log.append((cell, old))
+
+        self.es_update_cell(cell, n)
+
+    def es_begin_move(self):
+        # Start recording the changes, so that they can be undone.
+        self.undo_log.clear()
+        self.record_undo = True
+
+    def es_commit_move(self):
+        # Keep the changes since es_begin_move().
+        self.undo_log.clear()
+        self.record_undo = False
+
+    def es_undo(self):
+        # Restore the grid and the counters from before es_begin_move(),
+        # in O(1) for each changed cell.
+        while self.undo_log:
+            (cell, old) = self.undo_log.pop()
+            self.es_update_cell(cell, old)
+
+        self.record_undo = False
+
+    def es_is_possible(self, cell: int, n: int) -> bool:
+        # The digit is not used in any unit of the cell.
+        counts: bytearray = self.counts
+
+        for unit in ES_SUDOKU_CELL_UNITS[cell]:
+            if counts[(unit * 10) + n] > 0:
+                return False
+
+        return True
+
+    def es_possible_numbers(self, cell: int) -> list[int]:
+        # The cell itself is not taken into account.
+        old: int = self.numbers2[cell]
+        self.es_update_cell(cell, 0)
+        result: list[int] = [n for n in range(1, 10) if self.es_is_possible(cell, n)]
+        self.es_update_cell(cell, old)
+
+        return result
+
+    def fill_unit(self, unit: int):
+        # Fill the empty cells of the unit with the missing digits in random order.
+        missing: list[int] = self.puzzle.unit_missing[unit][:]
+        utils.es_shuffle_list(missing)
+
+        for (cell, n) in zip(self.puzzle.unit_empty[unit], missing):
+            self.es_set_cell(cell, n)
+
+    def set_random_number(self):
+        cell: int = utils.es_choice(self.puzzle.empty_positions)
+        self.es_set_cell(cell, utils.es_rand_int(9) + 1)
+
+    def swap_two_numbers(self):
+        cell1: int = utils.es_choice(self.puzzle.empty_positions)
+        cell2: int = utils.es_choice(self.puzzle.empty_positions)
+
+        n1: int = self.numbers2[cell1]
+        n2: int = self.numbers2[cell2]
+
+        self.es_set_cell(cell1, n2)
+        self.es_set_cell(cell2, n1)
+
+    def set_possible_number(self):
+        # Use a digit that is not in conflict with any other cell, if there is one.
+        cell: int = utils.es_choice(self.puzzle.empty_positions)
+        numbers: list[int] = self.es_possible_numbers(cell)
+
+        if numbers:
+            self.es_set_cell(cell, utils.es_choice(numbers))
+        else:
+            self.es_set_cell(cell, utils.es_rand_int(9) + 1)
+
+    def try_possible_number(self):
+        # Like set_possible_number(), but the move is undone if it increases the errors.
+        errors: int = self.errors
+
+        self.es_begin_move()
+        self.set_possible_number()
+
+        if self.errors > errors:
+            self.es_undo()
+        else:
+            self.es_commit_move()
+
+    def random_row(self):
+        cell: int = utils.es_choice(self.puzzle.empty_positions)
+        self.fill_unit(ES_SUDOKU_CELL_UNITS[cell][0])
+
+    def random_col(self):
+        cell: int = utils.es_choice(self.puzzle.empty_positions)
+        self.fill_unit(ES_SUDOKU_CELL_UNITS[cell][1])
+
+    def random_block(self):
+        cell: int = utils.es_choice(self.puzzle.empty_positions)
+        self.fill_unit(ES_SUDOKU_CELL_UNITS[cell][2])
+
+    def use_possible_numbers(self):
+        # Clear the grid and fill it again in random order,
+        # each cell gets one of its possible digits.
+        positions: list[int] = self.puzzle.empty_positions[:]
+        utils.es_shuffle_list(positions)
+
+        for cell in positions:
+            self.es_set_cell(cell, 0)
+
+        for cell in positions:
+            numbers: list[int] = [n for n in range(1, 10) if self.es_is_possible(cell, n)]
+
+            if numbers:
+                self.es_set_cell(cell, utils.es_choice(numbers))
+
+    @override
+    def es_mutate(self, mut_op: int):
+        match mut_op:
+            case 0:
+                self.set_random_number()
+            case 1:
+                self.swap_two_numbers()
+            case 2:
+                self.set_possible_number()
+            case 3:
+                self.random_col()
+            case 4:
+                self.random_row()
+            case 5:
+                self.random_block()
+            case 6:
+                self.use_possible_numbers()
+            case 7:
+                self.try_possible_number()
+            case _:
+                raise ValueError(f"Unknown mutation operation: {mut_op}")
+
+    @override
+    def es_randomize(self):
+        for cell in self.puzzle.empty_positions:
+            self.es_set_cell(cell, utils.es_rand_int(9) + 1)
+
+    @override
+    def es_calculate_fitness(self):
+        self.fitness = float(self.errors)
+
+    @override
+    def es_genome_hash(self) -> int:
+        return hash(self.numbers2.tobytes())
+
+    @override
+    def es_distance(self, other) -> float:
+        return es_hamming_distance(self.numbers2, other.numbers2)  # type: ignore
+
+    @override
+    def es_clone(self) -> Self:
+        new = ESSudokuIndividual(self.puzzle)
+        new.es_copy_from(self)
+
+        return new  # type: ignore
+
+    def es_copy_from(self, other):
+        # The arrays are copied, so the clone does not share any state.
+        # The recorded changes are not copied.
+        self.numbers2 = array("b", other.numbers2)
+        self.counts = bytearray(other.counts)
+        self.errors = other.errors
+
+    @override
+    def es_from_server(self, other):
+        self.es_copy_from(other)
+
+    @override
+    def es_to_json(self) -> dict:
+        data = {
+            "numbers1": self.puzzle.numbers,
+            "numbers2": self.numbers2.tolist()
+        }
+
+        return data
+
+    @override
+    def es_from_json(self, data: dict):
+        if "numbers1" in data:
+            self.puzzle = ESSudokuPuzzle(data["numbers1"])
+
+        self.numbers2 = array("b", data["numbers2"])
+        self.es_count_errors()
@@ -0,0 +1,478 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines the travelling salesman problem (TSP).
+ESTSPInstance contains the city positions, the distances (as a matrix for
+small instances) and for each city a list of its nearest neighbours.
+It's shared by all individuals.
+ESTSPIndividual stores the tour as a list of city indices together with
+the position of each city in the tour, so the change of the tour length
+for a 2-opt, swap or or-opt move is calculated in O(1).
+The mutations only connect cities that are near neighbours.
+The tour length is updated after each move, so es_calculate_fitness()
+does not have to go through the whole tour. To avoid the accumulation of
+rounding errors es_calculate_fitness() calculates it again from the whole
+tour after num_of_cities moves (at least ES_TSP_RECALCULATE_MOVES),
+which is still O(1) per move on average.
+"""
+
+# Python std lib:
+import logging
+import math
+import heapq
+from typing import override, Optional, Self, Any
+
+# Local imports:
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_crossover import es_order_crossover
+from evolusnake.es_distance import es_permutation_distance
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+# Up to this number of cities all the distances are calculated in advance:
+ES_TSP_MATRIX_LIMIT: int = 1000
+
+# Maximum length of a segment for the or-opt move:
+ES_TSP_OR_OPT_LENGTH: int = 3
+
+# Minimum number of moves before the tour length is calculated again from the whole tour:
+ES_TSP_RECALCULATE_MOVES: int = 1000
+
+# Instances that have been unpickled (from the server or a node),
+# so the matrix and the neighbour lists are only calculated once:
+ES_TSP_INSTANCES: dict[tuple, "ESTSPInstance"] = {}
+
+
+def es_tsp_instance(positions: list[tuple[float, float]], num_of_neighbours: int) -> "ESTSPInstance":
+    key: tuple = (tuple(positions), num_of_neighbours)
+    instance: Optional[ESTSPInstance] = ES_TSP_INSTANCES.get(key)
+
+    if instance is None:
+        instance = ESTSPInstance(positions, num_of_neighbours)
+        ES_TSP_INSTANCES[key] = instance
+
+    return instance
+
+
+class ESTSPInstance:
+    def __init__(self, positions: list[tuple[float, float]], num_of_neighbours: int = 10):
+        if len(positions) < 5:
+            raise ValueError(f"At least five cities are needed, {len(positions)}")
+
+        if num_of_neighbours < 1:
+            raise ValueError(f"Number of neighbours must be at least 1, {num_of_neighbours}")
+
+        self.positions: list[tuple[float, float]] = [(float(x), float(y)) for (x, y) in positions]
+        self.num_of_cities: int = len(self.positions)
+        self.num_of_neighbours: int = min(num_of_neighbours, self.num_of_cities - 1)
+        self.xs: list[float] = [x for (x, _) in self.positions]
+        self.ys: list[float] = [y for (_, y) in self.positions]
+        self.matrix: Optional[list[list[float]]] = None
+
+        if self.num_of_cities <= ES_TSP_MATRIX_LIMIT:
+            self.matrix = [[math.hypot(x0 - x1, y0 - y1) for (x1, y1) in self.positions]
+                for (x0, y0) in self.positions]
+
+        self.neighbours: list[list[int]] = self.es_nearest_neighbours()
+
+        logger.debug(f"{self.num_of_cities=}, {self.num_of_neighbours=}, matrix: {self.matrix is not None}")
+
+    @staticmethod
+    def from_file(filename: str, num_of_neighbours: int = 10) -> "ESTSPInstance":
+        # One city per line: x y
+        positions: list[tuple[float, float]] = []
+
+        with open(filename, "r") as f:
+            for line in f:
+                items: list[str] = line.split()
+
+                if len(items) >= 2:
+                    positions.append((float(items[0]), float(items[1])))
+
+        return es_tsp_instance(positions, num_of_neighbours)
+
+    def __reduce__(self):
+        # Only send the positions, the receiver calculates the rest once.
+        return (es_tsp_instance, (self.positions, self.num_of_neighbours))
+
+    def es_distance(self, city1: int, city2: int) -> float:
+        if self.matrix is not None:
+            return self.matrix[city1][city2]
+
+        return math.hypot(self.xs[city1] - self.xs[city2], self.ys[city1] - self.ys[city2])
+
+    def es_tour_length(self, tour: list[int]) -> float:
+        length: float = 0.0
+        city0: int = tour[-1]
+
+        for city1 in tour:
+            length += self.es_distance(city0, city1)
+            city0 = city1
+
+        return length
+
+    def es_nearest_neighbours(self) -> list[list[int]]:
+        # For each city the nearest num_of_neighbours cities, sorted by distance.
+        num_of_cities: int = self.num_of_cities
+        k: int = self.num_of_neighbours
+
+        if self.matrix is not None:
+            return [heapq.nsmallest(k, (j for j in range(num_of_cities) if j != i), key=row.__getitem__)
+                for (i, row) in enumerate(self.matrix)]
+
+        # Large instance: put the cities into a grid, so that each cell contains
+        # about k cities and only search the cells around each city.
+        min_x: float = min(self.xs)
+        min_y: float = min(self.ys)
+        width: float = max(max(self.xs) - min_x, 1e-9)
+        height: float = max(max(self.ys) - min_y, 1e-9)
+        cell_size: float = math.sqrt((width * height * k) / num_of_cities) or 1e-9
+        grid_x: int = int(width / cell_size) + 1
+        grid_y: int = int(height / cell_size) + 1
+        grid: dict[tuple[int, int], list[int]] = {}
+        cells: list[tuple[int, int]] = []
+
+        for i in range(num_of_cities):
+            cell: tuple[int, int] = (int((self.xs[i] - min_x) / cell_size), int((self.ys[i] - min_y) / cell_size))
+            grid.setdefault(cell, []).append(i)
+            cells.append(cell)
+
+        neighbours: list[list[int]] = []
+
+        for i in range(num_of_cities):
+            (cx, cy) = cells[i]
+            candidates: list[tuple[float, int]] = []
+            ring: int = 0
+
+            while True:
+                for gx in range(cx - ring, cx + ring + 1):
+                    for gy in range(cy - ring, cy + ring + 1):
+                        if max(abs(gx - cx), abs(gy - cy)) != ring:
+                            continue
+
+                        for j in grid.get((gx, gy), ()):
+                            if j != i:
+                                candidates.append((self.es_distance(i, j), j))
+
+                # Cities in the next ring are at least ring * cell_size away:
+                if len(candidates) >= k:
+                    candidates = heapq.nsmallest(k, candidates)
+
+                    if candidates[-1][0] <= ring * cell_size:
+                        break
+
+                if (ring > grid_x) and (ring > grid_y):
+                    break
+
+                ring += 1
+
+            neighbours.append([j for (_, j) in sorted(candidates)[:k]])
+
+        return neighbours
+
+
+class ESTSPIndividual(ESIndividual):
+    def __init__(self, instance: ESTSPInstance):
+        super().__init__()
+
+        self.instance: ESTSPInstance = instance
+        self.num_of_cities: int = instance.num_of_cities
+        self.tour: list[int] = list(range(self.num_of_cities))
+        # position[city] is the index of the city in the tour:
+        self.position: list[int] = self.tour[:]
+        # Updated by the moves, None means: calculate it from the whole tour.
+        self.length: Optional[float] = None
+        # Number of moves since the length has been calculated from the whole tour:
+        self.num_of_moves: int = 0
+        self.recalculate_moves: int = max(ES_TSP_RECALCULATE_MOVES, self.num_of_cities)
+
+    def es_set_tour(self, tour: list[int]):
+        self.tour = tour
+        self.position = [0] * self.num_of_cities
+
+        for (i, city) in enumerate(tour):
+            self.position[city] = i
+
+        self.length = None
+
+    def es_add_delta(self, delta: float):
+        if self.length is not None:
+            self.length += delta
+            self.num_of_moves += 1
+
+    def es_set_city(self, i: int, city: int):
+        i %= self.num_of_cities
+        self.tour[i] = city
+        self.position[city] = i
+
+    def es_read_cities(self, start: int, length: int) -> list[int]:
+        # The cities at the positions start ... start + length - 1 (around the end of the tour).
+        start %= self.num_of_cities
+        end: int = start + length
+
+        if end <= self.num_of_cities:
+            return self.tour[start:end]
+
+        return self.tour[start:] + self.tour[:end - self.num_of_cities]
+
+    def es_write_cities(self, start: int, cities: list[int]):
+        # Writes the cities to the positions start ... (around the end of the tour).
+        n: int = self.num_of_cities
+        start %= n
+        first: int = min(len(cities), n - start)
+        position: list[int] = self.position
+
+        self.tour[start:start + first] = cities[:first]
+        self.tour[:len(cities) - first] = cities[first:]
+
+        for (k, city) in enumerate(cities[:first], start):
+            position[city] = k
+
+        for (k, city) in enumerate(cities[first:]):
+            position[city] = k
+
+    def es_delta_2opt(self, i: int, j: int) -> float:
+        # Remove the edges after position i and j, connect tour[i] with tour[j]
+        # and tour[i + 1] with tour[j + 1].
+        n: int = self.num_of_cities
+        tour: list[int] = self.tour
+        dist = self.instance.es_distance
+        a: int = tour[i % n]
+        b: int = tour[(i + 1) % n]
+        c: int = tour[j % n]
+        d: int = tour[(j + 1) % n]
+
+        if (b == c) or (a == d) or (a == c):
+            return 0.0
+
+        return dist(a, c) + dist(b, d) - dist(a, b) - dist(c, d)
+
+    def es_apply_2opt(self, i: int, j: int):
+        # Reverses the path from position i + 1 to j.
+        # The shorter side of the tour is reversed, the result is the same tour.
+        n: int = self.num_of_cities
+        self.es_add_delta(self.es_delta_2opt(i, j))
+
+        start: int = (i + 1) % n
+        end: int = j % n
+        length: int = ((end - start) % n) + 1
+
+        if 2 * length > n:
+            (start, end) = ((end + 1) % n, i % n)
+            length = n - length
+
+        cities: list[int] = self.es_read_cities(start, length)
+        cities.reverse()
+        self.es_write_cities(start, cities)
+
+    def es_delta_swap(self, i: int, j: int) -> float:
+        # Swap the cities at position i and j.
+        n: int = self.num_of_cities
+        i %= n
+        j %= n
+
+        if i == j:
+            return 0.0
+
+        tour: list[int] = self.tour
+        dist = self.instance.es_distance
+
+        def city_after(k: int) -> int:
+            k %= n
+
+            if k == i:
+                return tour[j]
+            if k == j:
+                return tour[i]
+            return tour[k]
+
+        delta: float = 0.0
+
+        # Edges that start at these positions are affected:
+        for k in {(i - 1) % n, i, (j - 1) % n, j}:
+            delta += dist(city_after(k), city_after(k + 1)) - dist(tour[k], tour[(k + 1) % n])
+
+        return delta
+
+    def es_apply_swap(self, i: int, j: int):
+        self.es_add_delta(self.es_delta_swap(i, j))
+
+        city1: int = self.tour[i % self.num_of_cities]
+        city2: int = self.tour[j % self.num_of_cities]
+        self.es_set_city(i, city2)
+        self.es_set_city(j, city1)
+
+    def es_or_opt_valid(self, i: int, seg_len: int, p: int) -> bool:
+        # The insertion edge (p, p + 1) must be outside of the segment
+        # and not next to it.
+        n: int = self.num_of_cities
+        return (seg_len + 2 < n) and (((p - i + 1) % n) > seg_len)
+
+    def es_delta_or_opt(self, i: int, seg_len: int, p: int, reverse: bool) -> float:
+        # Move the segment of seg_len cities starting at position i
+        # between the cities at position p and p + 1.
+        n: int = self.num_of_cities
+        tour: list[int] = self.tour
+        dist = self.instance.es_distance
+        prev: int = tour[(i - 1) % n]
+        first: int = tour[i % n]
+        last: int = tour[(i + seg_len - 1) % n]
+        after: int = tour[(i + seg_len) % n]
+        x: int = tour[p % n]
+        y: int = tour[(p + 1) % n]
+
+        removed: float = dist(prev, first) + dist(last, after) + dist(x, y)
+
+        if reverse:
+            added: float = dist(prev, after) + dist(x, last) + dist(first, y)
+        else:
+            added = dist(prev, after) + dist(x, first) + dist(last, y)
+
+        return added - removed
+
+    def es_apply_or_opt(self, i: int, seg_len: int, p: int, reverse: bool):
+        # The cities between the segment and the insertion point are shifted,
+        # the shorter way around the tour is used.
+        n: int = self.num_of_cities
+        self.es_add_delta(self.es_delta_or_opt(i, seg_len, p, reverse))
+
+        segment: list[int] = self.es_read_cities(i, seg_len)
+
+        if reverse:
+            segment.reverse()
+
+        # Number of cities between the segment and the insertion point:
+        forward: int = (p - (i + seg_len - 1)) % n
+        backward: int = (i - 1 - p) % n
+
+        if forward <= backward:
+            self.es_write_cities(i, self.es_read_cities(i + seg_len, forward) + segment)
+        else:
+            self.es_write_cities(p + 1, segment + self.es_read_cities(p + 1, backward))
+
+    def es_random_city_and_neighbour(self) -> tuple[int, int]:
+        city1: int = utils.es_rand_int(self.num_of_cities)
+        city2: int = utils.es_choice(self.instance.neighbours[city1])
+        return (city1, city2)
+
+    def es_move_2opt(self):
+        # Connect a city with one of its neighbours.
+        (city1, city2) = self.es_random_city_and_neighbour()
+        i: int = self.position[city1]
+        j: int = self.position[city2]
+
+        if utils.es_rand_int(2) == 0:
+            # Use the successors:
+            self.es_apply_2opt(i, j)
+        else:
+            # Use the predecessors:
+            self.es_apply_2opt(j - 1, i - 1)
+
+    def es_move_swap(self):
+        # Move a neighbour next to the city.
+        (city1, city2) = self.es_random_city_and_neighbour()
+        self.es_apply_swap(self.position[city1] + 1, self.position[city2])
+
+    def es_move_or_opt(self):
+        # Move a segment that starts with a neighbour next to the city.
+        (city1, city2) = self.es_random_city_and_neighbour()
+        seg_len: int = utils.es_rand_int(ES_TSP_OR_OPT_LENGTH) + 1
+        i: int = self.position[city2]
+        p: int = self.position[city1] - utils.es_rand_int(2)
+
+        if not self.es_or_opt_valid(i, seg_len, p):
+            return
+
+        # Insert the segment in the better direction:
+        reverse: bool = self.es_delta_or_opt(i, seg_len, p, True) < self.es_delta_or_opt(i, seg_len, p, False)
+        self.es_apply_or_opt(i, seg_len, p, reverse)
+
+    def es_move_random_2opt(self):
+        # Reverse a random part of the tour, not restricted to neighbours.
+        i: int = utils.es_rand_int(self.num_of_cities)
+        j: int = utils.es_rand_int(self.num_of_cities)
+        self.es_apply_2opt(i, j)
+
+    @override
+    def es_mutate(self, mut_op: int):
+        match mut_op:
+            case 0:
+                self.es_move_2opt()
+            case 1:
+                self.es_move_swap()
+            case 2:
+                self.es_move_or_opt()
+            case 3:
+                self.es_move_random_2opt()
+            case _:
+                raise ValueError(f"Unknown mutation operation: {mut_op}")
+
+    @override
+    def es_randomize(self):
+        tour: list[int] = self.tour[:]
+        utils.es_shuffle_list(tour)
+        self.es_set_tour(tour)
+
+    @override
+    def es_calculate_fitness(self):
+        # The rounding errors of the deltas add up:
+        if (self.length is None) or (self.num_of_moves >= self.recalculate_moves):
+            self.length = self.instance.es_tour_length(self.tour)
+            self.num_of_moves = 0
+
+        self.fitness = self.length
+
+    @override
+    def es_get_evaluated_state(self) -> Any:
+        # The length is also needed for the parallel evaluation:
+        return (self.fitness, self.length, self.num_of_moves)
+
+    @override
+    def es_set_evaluated_state(self, state: Any):
+        (self.fitness, self.length, self.num_of_moves) = state
+
+    @override
+    def es_crossover(self, other) -> Self:
+        new = ESTSPIndividual(self.instance)
+        new.es_set_tour(es_order_crossover(self.tour, other.tour))
+
+        return new  # type: ignore
+
+    @override
+    def es_distance(self, other) -> float:
+        return es_permutation_distance(self.tour, other.tour)
+
+    @override
+    def es_clone(self) -> Self:
+        new = ESTSPIndividual(self.instance)
+        new.tour = self.tour[:]
+        new.position = self.position[:]
+        new.length = self.length
+        new.num_of_moves = self.num_of_moves
+
+        return new  # type: ignore
+
+    @override
+    def es_from_server(self, other):
+        self.tour = other.tour[:]
+        self.position = other.position[:]
+        self.length = other.length
+        self.num_of_moves = other.num_of_moves
+
+    @override
+    def es_to_json(self) -> dict:
+        data = {
+            "tour": self.tour,
+            "positions": [self.instance.positions[city] for city in self.tour],
+            "length": self.instance.es_tour_length(self.tour)
+        }
+
+        return data
+
+    @override
+    def es_from_json(self, data: dict):
+        self.es_set_tour(data["tour"])
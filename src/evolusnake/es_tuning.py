@@ -0,0 +1,138 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+"""
+This module defines a tuning harness for the configuration of population nodes.
+Candidate configurations are drawn from a parameter space and run as short,
+seeded trials in a local process pool (no server needed).
+Successive halving keeps only the best candidates and gives them a larger
+budget in the next round, so bad configurations are stopped early.
+The best configuration can be saved with ESConfiguration.to_json().
+"""
+
+# Python std lib:
+import logging
+import copy
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_select_population import es_select_population
+import evolusnake.es_utils as utils
+
+logger = logging.getLogger(__name__)
+
+# Best fitness and time in seconds:
+ESTrialResult = tuple[float, float]
+
+
+def es_run_trial(config: ESConfiguration, individual: ESIndividual, budget: int) -> ESTrialResult:
+    # Runs the population node for budget exchanges, the node gets its own
+    # best individual back like from a server with a single node.
+    utils.es_init_seed(config.random_seed)
+
+    # There is no server to protect, the delay would only be measured
+    # as the time of the candidate:
+    config = copy.copy(config)
+    config.early_exit_delay = 0.0
+
+    start: float = time.perf_counter()
+    node = es_select_population(config, individual)
+    best: ESIndividual = individual.es_clone()
+
+    for _ in range(budget):
+        best = node.ps_process_data(best).es_clone_internal()
+
+        if best.fitness <= config.target_fitness:
+            break
+
+    return (best.fitness, time.perf_counter() - start)
+
+
+def es_candidate_configs(config: ESConfiguration, space: dict[str, list],
+        num_of_candidates: int, seed: int) -> list[ESConfiguration]:
+    # All combinations of the parameter space if there are not too many,
+    # otherwise a random sample.
+    for key in space:
+        if not hasattr(config, key):
+            raise ValueError(f"Unknown option in parameter space: {key}")
+
+    keys: list[str] = list(space)
+    combinations: list[tuple] = list(itertools.product(*(space[key] for key in keys)))
+
+    if len(combinations) > num_of_candidates:
+        combinations = random.Random(seed).sample(combinations, num_of_candidates)
+
+    candidates: list[ESConfiguration] = []
+
+    for values in combinations:
+        candidate: ESConfiguration = copy.copy(config)
+        candidate.random_seed = seed
+
+        for (key, value) in zip(keys, values):
+            setattr(candidate, key, value)
+
+        candidates.append(candidate)
+
+    return candidates
+
+
+def es_tune(config: ESConfiguration, individual: ESIndividual, space: dict[str, list],
+        num_of_candidates: int = 16, min_budget: int = 1, eta: int = 2,
+        num_of_workers: int = 0, seed: int = 1) -> tuple[ESConfiguration, ESTrialResult]:
+    # space: option name and list of values, for example:
+    # {"num_of_mutations": [1, 2, 4], "node_population_size": [10, 20]}
+    # In each round only the best 1 / eta candidates survive and the budget
+    # (number of exchanges) is multiplied by eta.
+    # All candidates in a round use the same seed, so they are compared fairly.
+    # num_of_workers: 0 means one worker for each CPU, 1 runs all trials in this process.
+    if num_of_candidates < 1:
+        raise ValueError(f"Number of candidates must be at least 1, {num_of_candidates}")
+
+    if min_budget < 1:
+        raise ValueError(f"Minimum budget must be at least 1, {min_budget}")
+
+    if eta < 2:
+        raise ValueError(f"Eta must be at least 2, {eta}")
+
+    candidates: list[ESConfiguration] = es_candidate_configs(config, space, num_of_candidates, seed)
+    budget: int = min_budget
+    num_of_workers = num_of_workers or (os.cpu_count() or 1)
+
+    logger.info("Tuning: %d candidates, min_budget=%d, eta=%d, workers=%d",
+        len(candidates), min_budget, eta, num_of_workers)
+
+    executor = ProcessPoolExecutor(num_of_workers) if num_of_workers > 1 else None
+
+    try:
+        while True:
+            individuals: list[ESIndividual] = [individual] * len(candidates)
+            budgets: list[int] = [budget] * len(candidates)
+
+            if executor is None:
+                results: list[ESTrialResult] = list(map(es_run_trial, candidates, individuals, budgets))
+            else:
+                results = list(executor.map(es_run_trial, candidates, individuals, budgets))
+
+            # Lower fitness is better, if it's the same the faster one wins:
+            ranking: list[int] = sorted(range(len(candidates)), key=lambda i: results[i])
+            logger.info("Tuning round with budget %d: best result %s", budget, results[ranking[0]])
+
+            keep: int = math.ceil(len(candidates) / eta)
+
+            if keep <= 1:
+                return (candidates[ranking[0]], results[ranking[0]])
+
+            candidates = [candidates[i] for i in ranking[:keep]]
+            budget *= eta
+    finally:
+        if executor is not None:
+            executor.shutdown()
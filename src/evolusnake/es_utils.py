@@ -6,14 +6,18 @@
 
 # Python std lib:
 import time
+import math
 
 # External imports:
 import fastrand
 
 
-def es_init_seed():
-    current_time: float = time.time()
-    fastrand.pcg32_seed(int(current_time))
+def es_init_seed(seed: int = 0):
+    # A seed of 0 means: use the current time.
+    if seed == 0:
+        seed = int(time.time())
+
+    fastrand.pcg32_seed(seed)
 
 
 def es_uniform1() -> float:
@@ -42,6 +46,14 @@ def es_uniform5(lower: float, upper: float) -> float:
     return (fastrand.pcg32_uniform() * diff) + lower
 
 
+def es_gauss() -> float:
+    # Random float with standard normal distribution (mean 0.0, sigma 1.0)
+    # using the Box-Muller transform.
+    u1: float = 1.0 - fastrand.pcg32_uniform()
+    u2: float = fastrand.pcg32_uniform()
+    return math.sqrt(-2.0 * math.log(u1)) * math.cos(math.tau * u2)
+
+
 def es_rand_int(limit: int) -> int:
     return fastrand.pcg32bounded(limit)
 
@@ -4,10 +4,12 @@
 # See: https://github.com/willi-kappler/evolusnake
 
 # Python std lib:
-from typing import override, Self
+from typing import override, Self, Any
 
 # Local imports:
 from evolusnake.es_individual import ESIndividual
+from evolusnake.es_crossover import es_uniform_crossover
+from evolusnake.es_distance import es_hamming_distance
 import evolusnake.es_utils as utils
 
 
@@ -17,6 +19,7 @@ class TestIndividual(ESIndividual):
 
         self.mutate_called: int = 0
         self.calc_fitness_called: int = 0
+        self.calc_fitness2_called: int = 0
         self.clone_called: int = 0
         self.randomize_called: int = 0
 
@@ -61,6 +64,27 @@ class TestIndividual(ESIndividual):
         self.fitness = float(sum(self.data))
         self.calc_fitness_called += 1
 
+    @override
+    def es_calculate_fitness2(self):
+        self.fitness2 = float(sum(self.data))
+        self.calc_fitness2_called += 1
+
+    @override
+    def es_crossover(self, other) -> Self:
+        new: TestIndividual = TestIndividual()
+        new.data = es_uniform_crossover(self.data, other.data)
+        new.data_size = self.data_size
+
+        return new  # type: ignore
+
+    @override
+    def es_genome_hash(self) -> int:
+        return hash(tuple(self.data))
+
+    @override
+    def es_distance(self, other) -> float:
+        return es_hamming_distance(self.data, other.data)
+
     @override
     def es_clone(self) -> Self:
         new: TestIndividual = TestIndividual()
@@ -89,3 +113,108 @@ class TestIndividual(ESIndividual):
         self.fitness = data["fitness"]
 
 
+class TestDataIndividual(TestIndividual):
+    def __init__(self, offset: float):
+        super().__init__()
+
+        # Stands for the data set (mini batch) that is used for the fitness:
+        self.offset: float = offset
+
+    @override
+    def es_use_fitness_data(self, other):
+        self.offset = other.offset
+
+    @override
+    def es_calculate_fitness(self):
+        self.fitness = float(sum(self.data)) + self.offset
+        self.calc_fitness_called += 1
+
+    @override
+    def es_clone(self) -> Self:
+        new: TestDataIndividual = TestDataIndividual(self.offset)
+        new.data = self.data[:]
+        new.data_size = self.data_size
+        new.fitness = self.fitness
+
+        return new  # type: ignore
+
+
+class TestVectorIndividual(ESIndividual):
+    def __init__(self):
+        super().__init__()
+
+        self.calc_fitness_called: int = 0
+        self.values: list[float] = [1.0, 1.0, 1.0, 1.0, 1.0]
+
+    @override
+    def es_mutate(self, mut_op: int):
+        i: int = utils.es_rand_int(len(self.values))
+        self.values[i] += utils.es_uniform1()
+
+    @override
+    def es_randomize(self):
+        self.values = [utils.es_uniform5(-5.0, 5.0) for _ in self.values]
+
+    @override
+    def es_calculate_fitness(self):
+        # Sphere function, minimum at 0.0
+        self.fitness = sum(v * v for v in self.values)
+        self.calc_fitness_called += 1
+
+    @override
+    def es_calculate_fitness_matrix(self, matrix: Any) -> Any:
+        return (matrix**2.0).sum(axis=1)
+
+    @override
+    def es_get_vector(self) -> list[float]:
+        return self.values
+
+    @override
+    def es_set_vector(self, values: list[float]):
+        self.values = values
+
+    @override
+    def es_vector_bounds(self) -> tuple[float, float]:
+        return (-5.0, 5.0)
+
+    @override
+    def es_clone(self) -> Self:
+        new: TestVectorIndividual = TestVectorIndividual()
+        new.values = self.values[:]
+        new.fitness = self.fitness
+
+        return new  # type: ignore
+
+    @override
+    def es_from_server(self, other):
+        self.values = other.values[:]
+        self.fitness = other.fitness
+
+    @override
+    def es_to_json(self) -> dict:
+        return {"values": self.values, "fitness": self.fitness}
+
+    @override
+    def es_from_json(self, data: dict):
+        self.values = data["values"]
+        self.fitness = data["fitness"]
+
+
+class TestMultiIndividual(TestIndividual):
+    def __init__(self):
+        super().__init__()
+
+    @override
+    def es_calculate_objectives(self):
+        # Two conflicting objectives: number of ones and
+        # number of zeros in the first half.
+        self.objectives = [self.fitness, float(5 - sum(self.data[:5]))]
+
+    @override
+    def es_clone(self) -> Self:
+        new: TestMultiIndividual = TestMultiIndividual()
+        new.data = self.data[:]
+        new.data_size = self.data_size
+        new.fitness = self.fitness
+
+        return new  # type: ignore
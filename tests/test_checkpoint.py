@@ -0,0 +1,135 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import os
+from unittest.mock import patch
+
+# Local imports:
+from evolusnake.es_checkpoint import ESCheckpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.filename: str = "test_checkpoint1.bin"
+
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_invalid_compact_count(self):
+        """
+        Test checkpoint init with an invalid compact count.
+        """
+
+        with self.assertRaises(ValueError):
+            checkpoint1: ESCheckpoint = ESCheckpoint(self.filename, 0)
+            del checkpoint1
+
+    def test_invalid_sync_interval(self):
+        """
+        Test checkpoint init with an invalid sync interval.
+        """
+
+        with self.assertRaises(ValueError):
+            checkpoint1: ESCheckpoint = ESCheckpoint(self.filename, 10, -1.0)
+            del checkpoint1
+
+    def test_sync_interval(self):
+        """
+        Test that appended records are only synced every sync interval.
+        """
+
+        checkpoint1: ESCheckpoint = ESCheckpoint(self.filename, 10, 1000.0)
+        checkpoint1.es_write_snapshot({"type": "snapshot", "value": 1})
+        self.assertFalse(checkpoint1.unsynced)
+
+        with patch("evolusnake.es_checkpoint.os.fsync") as fsync1:
+            checkpoint1.es_append({"type": "add", "value": 2})
+            checkpoint1.es_append({"type": "add", "value": 3})
+            fsync1.assert_not_called()
+            self.assertTrue(checkpoint1.unsynced)
+
+            checkpoint1.es_sync()
+            fsync1.assert_called_once()
+            self.assertFalse(checkpoint1.unsynced)
+
+            checkpoint1.es_sync()
+            fsync1.assert_called_once()
+
+        # Records are written even if they are not synced yet:
+        records: list[dict] = checkpoint1.es_read()
+        self.assertEqual([r["value"] for r in records], [1, 2, 3])
+
+        # Sync every record:
+        checkpoint2: ESCheckpoint = ESCheckpoint(self.filename, 10)
+
+        with patch("evolusnake.es_checkpoint.os.fsync") as fsync2:
+            checkpoint2.es_append({"type": "add", "value": 4})
+            fsync2.assert_called_once()
+            self.assertFalse(checkpoint2.unsynced)
+
+    def test_snapshot_and_append(self):
+        """
+        Test writing a snapshot followed by incremental records.
+        """
+
+        checkpoint1: ESCheckpoint = ESCheckpoint(self.filename, 10)
+        self.assertFalse(checkpoint1.es_exists())
+
+        checkpoint1.es_write_snapshot({"type": "snapshot", "value": 1})
+        self.assertFalse(checkpoint1.es_append({"type": "add", "value": 2}))
+        self.assertFalse(checkpoint1.es_append({"type": "add", "value": 3}))
+
+        self.assertTrue(checkpoint1.es_exists())
+        self.assertFalse(os.path.exists(f"{self.filename}.tmp"))
+
+        checkpoint2: ESCheckpoint = ESCheckpoint(self.filename, 10)
+        records: list[dict] = checkpoint2.es_read()
+
+        self.assertEqual([r["value"] for r in records], [1, 2, 3])
+        self.assertEqual(checkpoint2.append_count, 2)
+
+    def test_incomplete_record(self):
+        """
+        Test that an incomplete record at the end of the file is ignored.
+        """
+
+        checkpoint1: ESCheckpoint = ESCheckpoint(self.filename, 10)
+        checkpoint1.es_write_snapshot({"type": "snapshot", "value": 1})
+        checkpoint1.es_append({"type": "add", "value": 2})
+
+        # Simulate a crash while writing the next record:
+        data: bytes = checkpoint1.es_encode({"type": "add", "value": 3})
+
+        with open(self.filename, "ab") as f:
+            f.write(data[:-3])
+
+        records: list[dict] = checkpoint1.es_read()
+        self.assertEqual([r["value"] for r in records], [1, 2])
+
+    def test_compaction(self):
+        """
+        Test that a new snapshot replaces all previous records.
+        """
+
+        checkpoint1: ESCheckpoint = ESCheckpoint(self.filename, 2)
+        checkpoint1.es_write_snapshot({"type": "snapshot", "value": 1})
+        self.assertFalse(checkpoint1.es_append({"type": "add", "value": 2}))
+        self.assertTrue(checkpoint1.es_append({"type": "add", "value": 3}))
+
+        checkpoint1.es_write_snapshot({"type": "snapshot", "value": 4})
+        self.assertEqual(checkpoint1.append_count, 0)
+
+        records: list[dict] = checkpoint1.es_read()
+        self.assertEqual([r["value"] for r in records], [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
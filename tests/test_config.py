@@ -7,6 +7,7 @@
 import unittest
 import json
 import os
+from unittest.mock import patch
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
@@ -41,6 +42,10 @@ class TestConfiguration(unittest.TestCase):
             "sine_amplitude": 33.4,
             "sine_frequency": 0.23,
             "limit_range": 1.23,
+            "fitness_cache_size": 1000,
+            "fitness2_threshold": 0.5,
+            "fitness2_top_k": 4,
+            "early_exit_delay": 0.5,
             "user_options": "some_options_1"
         }
 
@@ -73,6 +78,10 @@ class TestConfiguration(unittest.TestCase):
         self.assertAlmostEqual(config1.sine_amplitude, 33.4)
         self.assertAlmostEqual(config1.sine_frequency, 0.23)
         self.assertAlmostEqual(config1.limit_range, 1.23)
+        self.assertEqual(config1.fitness_cache_size, 1000)
+        self.assertAlmostEqual(config1.fitness2_threshold, 0.5)
+        self.assertEqual(config1.fitness2_top_k, 4)
+        self.assertAlmostEqual(config1.early_exit_delay, 0.5)
         self.assertEqual(config1.user_options, "some_options_1")
 
     def test_load_config2(self):
@@ -103,6 +112,7 @@ class TestConfiguration(unittest.TestCase):
             "sine_amplitude": 13.89,
             "sine_frequency": 0.043,
             "limit_range": 6.88,
+            "fitness_cache_size": 0,
             "user_options": "some_other_options_2"
         }
 
@@ -135,8 +145,38 @@ class TestConfiguration(unittest.TestCase):
         self.assertAlmostEqual(config1.sine_amplitude, 13.89)
         self.assertAlmostEqual(config1.sine_frequency, 0.043)
         self.assertAlmostEqual(config1.limit_range, 6.88)
+        self.assertEqual(config1.fitness_cache_size, 0)
         self.assertEqual(config1.user_options, "some_other_options_2")
 
+    def test_command_line(self):
+        """
+        Test setting options from the command line.
+        """
+
+        argv: list[str] = ["main.py", "-p", "20", "--metrics_interval", "2.5", "--init_workers", "4",
+            "--checkpoint_filename", "test.bin", "--noisy_fitness", "--no-accept_new_best"]
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.fitness_cache_size = 100
+
+        with patch("sys.argv", argv):
+            config1.from_command_line()
+
+        self.assertEqual(config1.node_population_size, 20)
+        self.assertAlmostEqual(config1.metrics_interval, 2.5)
+        self.assertEqual(config1.init_workers, 4)
+        self.assertEqual(config1.checkpoint_filename, "test.bin")
+        self.assertEqual(config1.noisy_fitness, True)
+        self.assertEqual(config1.accept_new_best, False)
+        # Not given on the command line:
+        self.assertEqual(config1.fitness_cache_size, 100)
+        self.assertEqual(config1.deferred_init, False)
+
+        # Only options with a simple type:
+        self.assertIn("fitness_cache_size", config1.es_other_options())
+        self.assertNotIn("portfolio", config1.es_other_options())
+        self.assertNotIn("node_population_size", config1.es_other_options())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+
+# Local imports:
+import evolusnake.es_crossover as crossover
+
+
+class TestCrossover(unittest.TestCase):
+    def test_uniform_crossover(self):
+        """
+        Test that each element comes from one of the parents.
+        """
+
+        parent1: list = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        parent2: list = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+
+        for _ in range(10):
+            child: list = crossover.es_uniform_crossover(parent1, parent2)
+            self.assertEqual(len(child), 10)
+            for i in range(10):
+                self.assertIn(child[i], (parent1[i], parent2[i]))
+
+        self.assertEqual(parent1, [0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(parent2, [1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+
+    def test_n_point_crossover(self):
+        """
+        Test that the child changes the parent at most n times.
+        """
+
+        parent1: list = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        parent2: list = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+
+        for _ in range(10):
+            child: list = crossover.es_n_point_crossover(parent1, parent2, 2)
+            self.assertEqual(len(child), 10)
+
+            changes: int = 0
+            for i in range(1, 10):
+                if child[i] != child[i - 1]:
+                    changes += 1
+
+            self.assertLessEqual(changes, 2)
+
+        with self.assertRaises(ValueError):
+            crossover.es_n_point_crossover(parent1, parent2, 0)
+
+    def test_order_crossover(self):
+        """
+        Test that the child is a valid permutation.
+        """
+
+        parent1: list = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+        parent2: list = [9, 3, 7, 1, 5, 0, 8, 2, 6, 4]
+
+        for _ in range(20):
+            child: list = crossover.es_order_crossover(parent1, parent2)
+            self.assertEqual(sorted(child), parent1)
+
+    def test_pmx_crossover(self):
+        """
+        Test that the child is a valid permutation.
+        """
+
+        parent1: list = [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (5, 5)]
+        parent2: list = [(5, 5), (3, 3), (1, 1), (0, 0), (4, 4), (2, 2)]
+
+        for _ in range(20):
+            child: list = crossover.es_pmx_crossover(parent1, parent2)
+            self.assertEqual(sorted(child), parent1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+
+# Local imports:
+from evolusnake.es_distance import es_hamming_distance, es_euclidean_distance, es_permutation_distance
+
+
+class TestDistance(unittest.TestCase):
+    def test_hamming_distance(self):
+        """
+        Test the number of different positions.
+        """
+
+        self.assertAlmostEqual(es_hamming_distance([0, 1, 1, 0], [0, 1, 1, 0]), 0.0)
+        self.assertAlmostEqual(es_hamming_distance([0, 1, 1, 0], [1, 1, 0, 0]), 2.0)
+
+    def test_euclidean_distance(self):
+        """
+        Test the euclidean distance of two vectors.
+        """
+
+        self.assertAlmostEqual(es_euclidean_distance([0.0, 0.0], [3.0, 4.0]), 5.0)
+
+    def test_permutation_distance(self):
+        """
+        Test the number of different edges of two tours.
+        """
+
+        self.assertAlmostEqual(es_permutation_distance([0, 1, 2, 3, 4], [0, 1, 2, 3, 4]), 0.0)
+        # Rotated and reversed:
+        self.assertAlmostEqual(es_permutation_distance([0, 1, 2, 3, 4], [2, 3, 4, 0, 1]), 0.0)
+        self.assertAlmostEqual(es_permutation_distance([0, 1, 2, 3, 4], [4, 3, 2, 1, 0]), 0.0)
+        # Swap two neighbours:
+        self.assertAlmostEqual(es_permutation_distance([0, 1, 2, 3, 4], [0, 2, 1, 3, 4]), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_fitness_cache import ESFitnessCache
+from evolusnake.es_population import ESPopulation, ESIterationCallBack
+
+from tests.common import TestIndividual
+
+
+class TestFitnessCache(unittest.TestCase):
+    def test_cache_invalid_size(self):
+        """
+        Test cache init with an invalid size.
+        """
+
+        with self.assertRaises(ValueError):
+            cache: ESFitnessCache = ESFitnessCache(0)
+            del cache
+
+    def test_cache_lookup_and_store(self):
+        """
+        Test storing and looking up fitness values.
+        """
+
+        cache: ESFitnessCache = ESFitnessCache(10)
+
+        self.assertIsNone(cache.es_lookup(1))
+        cache.es_store(1, 5.0)
+        self.assertAlmostEqual(cache.es_lookup(1), 5.0)  # type: ignore
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertAlmostEqual(cache.es_hit_rate(), 0.5)
+
+    def test_cache_lru(self):
+        """
+        Test that the least recently used entry is removed.
+        """
+
+        cache: ESFitnessCache = ESFitnessCache(2)
+
+        cache.es_store(1, 1.0)
+        cache.es_store(2, 2.0)
+        # Use key 1, so key 2 is the least recently used:
+        cache.es_lookup(1)
+        cache.es_store(3, 3.0)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.es_lookup(1))
+        self.assertIsNone(cache.es_lookup(2))
+        self.assertIsNotNone(cache.es_lookup(3))
+
+    def test_cache_invalidate(self):
+        """
+        Test invalidating the cache.
+        """
+
+        cache: ESFitnessCache = ESFitnessCache(10)
+
+        cache.es_store(1, 1.0)
+        cache.es_invalidate()
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.invalidations, 1)
+        self.assertIsNone(cache.es_lookup(1))
+
+    def test_population_with_cache(self):
+        """
+        Test that the population uses the cache for identical genomes.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.fitness_cache_size = 100
+        ind1: TestIndividual = TestIndividual()
+
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+        self.assertIsNotNone(population1.fitness_cache)
+        population1.es_invalidate_fitness_cache()
+
+        ind2: TestIndividual = TestIndividual()
+        ind3: TestIndividual = TestIndividual()
+
+        population1.es_calculate_fitness(ind2)
+        population1.es_calculate_fitness(ind3)
+
+        self.assertAlmostEqual(ind2.fitness, 10.0)
+        self.assertAlmostEqual(ind3.fitness, 10.0)
+        self.assertEqual(ind2.calc_fitness_called + ind3.calc_fitness_called, 1)
+
+        population1.es_invalidate_fitness_cache()
+        population1.es_calculate_fitness(ind3)
+        self.assertEqual(ind3.calc_fitness_called, 1)
+
+    def test_population_without_cache(self):
+        """
+        Test that the cache is disabled by default.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        ind1: TestIndividual = TestIndividual()
+
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+        self.assertIsNone(population1.fitness_cache)
+
+        ind2: TestIndividual = TestIndividual()
+        population1.es_calculate_fitness(ind2)
+        population1.es_calculate_fitness(ind2)
+
+        self.assertEqual(ind2.calc_fitness_called, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import os
+import uuid
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_history import ESHistoryRecorder, ES_HISTORY_RECORD, es_read_history
+from evolusnake.es_server import ESServer
+
+from tests.common import TestIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+from parasnake.ps_nodeid import PSNodeId
+
+
+class TestHistory(unittest.TestCase):
+    def test_invalid_buffer_size(self):
+        """
+        Test history init with an invalid buffer size.
+        """
+
+        with self.assertRaises(ValueError):
+            history1: ESHistoryRecorder = ESHistoryRecorder("test_history0.bin", 0)
+            del history1
+
+    def test_record_and_read(self):
+        """
+        Test buffered writing and reading the history as NumPy arrays.
+        """
+
+        filename: str = "test_history1.bin"
+        node_id1: uuid.UUID = uuid.uuid4()
+
+        history1: ESHistoryRecorder = ESHistoryRecorder(filename, 2)
+        history1.es_record(node_id1.bytes, 3.0, 30.0, True)
+        self.assertEqual(os.path.getsize(filename), 8)
+
+        history1.es_record(node_id1.bytes, 2.0, 20.0, False)
+        history1.es_record(node_id1.bytes, 1.0, 10.0, True)
+        self.assertEqual(history1.total_count, 2)
+
+        history1.es_flush()
+        self.assertEqual(history1.total_count, 3)
+
+        # An incomplete record at the end is ignored:
+        with open(filename, "ab") as f:
+            f.write(b"\x00" * (ES_HISTORY_RECORD.size - 1))
+
+        data: dict = es_read_history(filename)
+        os.remove(filename)
+
+        self.assertEqual(list(data["fitness"]), [3.0, 2.0, 1.0])
+        self.assertEqual(list(data["fitness2"]), [30.0, 20.0, 10.0])
+        self.assertEqual(list(data["accepted"]), [True, False, True])
+        self.assertEqual(uuid.UUID(bytes=bytes(data["node_id"][1])), node_id1)
+        self.assertTrue(data["time"][0] <= data["time"][2])
+
+    def test_server_history(self):
+        """
+        Test recording all the results on the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.fitness_history_filename = "test_history2.bin"
+        config1.result_filename = "test_history2.json"
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind2)
+
+        ind3: TestIndividual = TestIndividual()
+        ind3.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind3)
+
+        server1.ps_save_data()
+        data: dict = es_read_history(config1.fitness_history_filename)
+        os.remove(config1.fitness_history_filename)
+        os.remove(config1.result_filename)
+
+        self.assertEqual(list(data["fitness"]), [0.0, 10.0])
+        self.assertEqual(list(data["accepted"]), [True, False])
+
+    def test_resume(self):
+        """
+        Test that a resumed history keeps the old records.
+        """
+
+        filename: str = "test_history3.bin"
+        node_id1: uuid.UUID = uuid.uuid4()
+
+        history1: ESHistoryRecorder = ESHistoryRecorder(filename, 10)
+        history1.es_record(node_id1.bytes, 3.0, 30.0, True)
+        history1.es_flush()
+
+        # Crash while writing:
+        with open(filename, "ab") as f:
+            f.write(b"\x00" * (ES_HISTORY_RECORD.size - 1))
+
+        history2: ESHistoryRecorder = ESHistoryRecorder(filename, 10, True)
+        history2.es_record(node_id1.bytes, 2.0, 20.0, False)
+        history2.es_flush()
+
+        data: dict = es_read_history(filename)
+        self.assertEqual(list(data["fitness"]), [3.0, 2.0])
+        self.assertEqual(list(data["accepted"]), [True, False])
+
+        # Without resume a new history is started:
+        history3: ESHistoryRecorder = ESHistoryRecorder(filename, 10)
+        history3.es_flush()
+
+        data = es_read_history(filename)
+        os.remove(filename)
+
+        self.assertEqual(len(data["fitness"]), 0)
+
+    def test_server_history_resume(self):
+        """
+        Test that the server continues the history when it resumes from a checkpoint.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.fitness_history_filename = "test_history4.bin"
+        config1.result_filename = "test_history4.json"
+        config1.checkpoint_filename = "test_history4_checkpoint.bin"
+        ind1: TestIndividual = TestIndividual()
+        node_id1: PSNodeId = PSNodeId()
+
+        server1: ESServer = ESServer(config1, ind1)
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind2)
+        server1.ps_save_data()
+
+        # Server restart:
+        server2: ESServer = ESServer(config1, ind1)
+        ind3: TestIndividual = TestIndividual()
+        ind3.es_calculate_fitness()
+        server2.ps_process_result(node_id1, ind3)
+        server2.ps_save_data()
+
+        data: dict = es_read_history(config1.fitness_history_filename)
+        os.remove(config1.fitness_history_filename)
+        os.remove(config1.result_filename)
+        os.remove(config1.checkpoint_filename)
+
+        self.assertEqual(list(data["fitness"]), [0.0, 10.0])
+        self.assertEqual(list(data["accepted"]), [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import logging
+import logging.handlers
+import os
+
+# Local imports:
+from evolusnake.es_logging import es_setup_logging, es_stop_logging
+
+
+class TestLogging(unittest.TestCase):
+    def test_setup_logging(self):
+        """
+        Test writing log messages to a file with a background thread.
+        """
+
+        test_log_file: str = "test_logging1.log"
+        root_logger: logging.Logger = logging.getLogger()
+        old_level: int = root_logger.level
+        old_handlers: list = root_logger.handlers[:]
+
+        listener: logging.handlers.QueueListener = es_setup_logging(test_log_file, logging.INFO)
+
+        logger = logging.getLogger("evolusnake.test")
+        logger.info("New best fitness: %s", 1.5)
+        logger.debug("Not written: %s", 2.5)
+        logging.getLogger("parasnake.test").info("Not written")
+
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+
+        # Writes all remaining messages:
+        es_stop_logging(listener)
+
+        for handler in root_logger.handlers[:]:
+            if handler not in old_handlers:
+                root_logger.removeHandler(handler)
+
+        root_logger.setLevel(old_level)
+
+        for handler in listener.handlers:
+            handler.close()
+
+        with open(test_log_file, "r") as f:
+            lines: list[str] = f.readlines()
+
+        os.remove(test_log_file)
+
+        self.assertEqual(len(lines), 1)
+        self.assertIn("INFO - evolusnake.test - New best fitness: 1.5", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
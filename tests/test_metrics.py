@@ -0,0 +1,204 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import json
+import os
+import socket
+import urllib.request
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_metrics import ESMetrics, es_create_metrics
+from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population_node3 import ESPopulationNode3
+
+from tests.common import TestIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+class TestMetrics(unittest.TestCase):
+    def test_metrics_disabled(self):
+        """
+        Test that no metrics object is created by default.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        self.assertIsNone(es_create_metrics(config1, "node"))
+
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+        self.assertIsNone(population1.metrics)
+
+        population1.es_get_mut_op()
+        self.assertEqual(population1.pending_mut_ops, [])
+
+    def test_counters_and_histograms(self):
+        """
+        Test counters, gauges and histograms in the snapshot.
+        """
+
+        metrics1: ESMetrics = ESMetrics("node")
+        metrics1.es_increment("evaluations")
+        metrics1.es_increment("evaluations", 2.0)
+        metrics1.es_increment("mutations_accepted", label="1")
+        metrics1.es_set_gauge("best_fitness", 3.5)
+        metrics1.es_observe("evaluate_seconds", 0.5)
+        metrics1.es_observe("evaluate_seconds", 0.00001)
+        metrics1.es_observe("evaluate_seconds", 100.0)
+
+        self.assertAlmostEqual(metrics1.es_get_counter("evaluations"), 3.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("mutations_accepted", "1"), 1.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("unknown"), 0.0)
+
+        snapshot: dict = metrics1.es_snapshot()
+
+        self.assertEqual(snapshot["source"], "node")
+        self.assertAlmostEqual(snapshot["counters"]["evaluations"][""], 3.0)
+        self.assertGreater(snapshot["rates"]["evaluations"][""], 0.0)
+        self.assertAlmostEqual(snapshot["gauges"]["best_fitness"][""], 3.5)
+
+        histogram: dict = snapshot["histograms"]["evaluate_seconds"][""]
+        self.assertEqual(histogram["count"], 3)
+        self.assertAlmostEqual(histogram["min"], 0.00001)
+        self.assertAlmostEqual(histogram["max"], 100.0)
+        self.assertEqual(histogram["buckets"][0], 1)
+        self.assertEqual(histogram["buckets"][5], 1)
+        self.assertEqual(histogram["buckets"][-1], 1)
+
+    def test_write_jsonl(self):
+        """
+        Test exporting the snapshots to a JSONL file.
+        """
+
+        test_metrics_file: str = "test_metrics1.jsonl"
+
+        if os.path.exists(test_metrics_file):
+            os.remove(test_metrics_file)
+
+        metrics1: ESMetrics = ESMetrics("server", test_metrics_file, 0.0)
+        metrics1.es_increment("results")
+        metrics1.es_export()
+        metrics1.es_increment("results")
+        metrics1.es_export()
+
+        with open(test_metrics_file, "r") as f:
+            lines: list[str] = f.readlines()
+
+        os.remove(test_metrics_file)
+
+        self.assertEqual(len(lines), 2)
+        self.assertAlmostEqual(json.loads(lines[0])["counters"]["results"][""], 1.0)
+        self.assertAlmostEqual(json.loads(lines[1])["counters"]["results"][""], 2.0)
+
+    def test_prometheus_text(self):
+        """
+        Test the Prometheus text format and the HTTP endpoint.
+        """
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port: int = s.getsockname()[1]
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.metrics_port = port
+        metrics1 = es_create_metrics(config1, "node")
+        assert metrics1 is not None
+
+        metrics1.es_increment("evaluations", 5.0)
+        metrics1.es_observe("sort_seconds", 0.002)
+
+        text: str = metrics1.es_prometheus_text()
+        self.assertIn("evolusnake_evaluations_total{source=\"node\"} 5.0", text)
+        self.assertIn("evolusnake_sort_seconds_bucket{source=\"node\",le=\"0.01\"} 1", text)
+        self.assertIn("evolusnake_sort_seconds_count{source=\"node\"} 1", text)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body: str = response.read().decode("utf-8")
+
+        metrics1.es_stop_http_server()
+
+        self.assertIn("evolusnake_evaluations_total{source=\"node\"} 5.0", body)
+
+    def test_population_metrics(self):
+        """
+        Test collecting metrics in the population.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.metrics_filename = "test_metrics2.jsonl"
+        config1.metrics_interval = 1000.0
+        config1.num_of_iterations = 10
+        config1.mutation_operations = [0, 1, 2]
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        population1: ESPopulationNode3 = ESPopulationNode3(config1, ind1)
+        metrics1 = population1.population.metrics
+        assert metrics1 is not None
+
+        population1.ps_process_data(ind1)
+
+        evaluations: float = metrics1.es_get_counter("evaluations")
+        self.assertGreater(evaluations, population1.population.population_size)
+        self.assertAlmostEqual(metrics1.es_get_counter("exchanges"), 1.0)
+
+        mutations: float = 0.0
+
+        for mut_op in ("0", "1", "2"):
+            mutations += metrics1.es_get_counter("mutations_accepted", mut_op)
+            mutations += metrics1.es_get_counter("mutations_rejected", mut_op)
+
+        self.assertGreater(mutations, 0.0)
+        self.assertEqual(population1.population.pending_mut_ops, [])
+
+        self.assertGreater(metrics1.es_get_counter("clones"), 0.0)
+        self.assertGreaterEqual(metrics1.es_get_counter("mutations"), mutations)
+
+        snapshot: dict = metrics1.es_snapshot()
+        self.assertGreater(snapshot["rates"]["clones"][""], 0.0)
+        self.assertEqual(snapshot["histograms"]["clone_seconds"][""]["count"], metrics1.es_get_counter("clones"))
+        self.assertGreater(snapshot["histograms"]["mutate_seconds"][""]["count"], 0)
+
+        # The interval has not passed yet:
+        self.assertFalse(os.path.exists(config1.metrics_filename))
+
+    def test_crossover_metrics(self):
+        """
+        Test that the mutations of a new individual from crossover are not counted.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.metrics_filename = "test_metrics3.jsonl"
+        config1.metrics_interval = 1000.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+        metrics1 = population1.metrics
+        assert metrics1 is not None
+
+        child = population1.population[0].es_crossover_internal(population1.population[1])
+        population1.es_mutate_individual(child, 3)
+        population1.es_calculate_fitness(child)
+
+        self.assertAlmostEqual(metrics1.es_get_counter("mutations_accepted", "0"), 0.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("mutations_rejected", "0"), 0.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("mutations"), 3.0)
+        self.assertEqual(population1.pending_mut_ops, [])
+
+        # An evaluated individual is counted:
+        population1.es_mutate_individual(child, 1)
+        population1.es_calculate_fitness(child)
+        counted: float = (metrics1.es_get_counter("mutations_accepted", "0") +
+            metrics1.es_get_counter("mutations_rejected", "0"))
+        self.assertAlmostEqual(counted, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+from typing import override
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_parallel import es_evaluate_population
+from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_server import ESServer
+from evolusnake.es_tsp import ESTSPInstance, ESTSPIndividual
+
+from tests.common import TestIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+class TestBatchIndividual(TestIndividual):
+    @override
+    def es_calculate_fitness_batch(self, individuals):
+        for ind in individuals:
+            ind.fitness = float(sum(ind.data)) + 100.0
+
+
+class TestParallel(unittest.TestCase):
+    def test_evaluate_population(self):
+        """
+        Test evaluating individuals in a process pool.
+        """
+
+        individuals: list[TestIndividual] = []
+
+        for _ in range(50):
+            ind: TestIndividual = TestIndividual()
+            ind.es_randomize()
+            individuals.append(ind)
+
+        es_evaluate_population(individuals, 2)  # type: ignore
+
+        for ind in individuals:
+            self.assertEqual(ind.fitness, float(sum(ind.data)))
+
+        with self.assertRaises(ValueError):
+            es_evaluate_population(individuals, -1)  # type: ignore
+
+    def test_evaluate_batch(self):
+        """
+        Test using the batched fitness hook, in this process and in the process pool.
+        """
+
+        for num_of_workers in (1, 3):
+            individuals: list[TestBatchIndividual] = [TestBatchIndividual() for _ in range(10)]
+
+            es_evaluate_population(individuals, num_of_workers)  # type: ignore
+
+            for ind in individuals:
+                self.assertEqual(ind.fitness, 110.0)
+
+    def test_evaluated_state(self):
+        """
+        Test that the state of the evaluation is sent back from the process pool.
+        """
+
+        instance: ESTSPInstance = ESTSPInstance([(float(i % 7), float(i // 7)) for i in range(30)])
+        individuals: list[ESTSPIndividual] = []
+
+        for _ in range(10):
+            ind: ESTSPIndividual = ESTSPIndividual(instance)
+            ind.es_randomize()
+            individuals.append(ind)
+
+        es_evaluate_population(individuals, 2)  # type: ignore
+
+        for ind in individuals:
+            self.assertIsNotNone(ind.length)
+            self.assertAlmostEqual(ind.fitness, instance.es_tour_length(ind.tour))
+            self.assertEqual(ind.length, ind.fitness)
+
+    def test_parallel_init(self):
+        """
+        Test the parallel initial population of the server and the node.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.server_population_size = 20
+        config1.init_workers = 2
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        self.assertEqual(len(server1.population), 20)
+
+        for ind in server1.population:
+            self.assertEqual(ind.fitness, float(sum(ind.data)))  # type: ignore
+
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+        self.assertEqual(len(population1.population), config1.node_population_size)
+
+        for ind in population1.population:
+            self.assertEqual(ind.fitness, float(sum(ind.data)))  # type: ignore
+
+        config1.init_workers = -1
+
+        with self.assertRaises(ValueError):
+            ESPopulation(config1, ind1, ESIterationCallBack())
+
+    def test_parallel_bookkeeping(self):
+        """
+        Test that the parallel evaluation uses the fitness cache, the metrics and the fitness epoch.
+        """
+
+        results: list[tuple] = []
+
+        for init_workers in (1, 2):
+            config1: ESConfiguration = ESConfiguration()
+            config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+            config1.metrics_filename = "test_parallel_metrics.jsonl"
+            config1.metrics_interval = 1000.0
+            config1.fitness_cache_size = 100
+            config1.init_workers = init_workers
+            ind1: TestIndividual = TestIndividual()
+
+            population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+            metrics1 = population1.metrics
+            cache1 = population1.fitness_cache
+            assert metrics1 is not None
+            assert cache1 is not None
+
+            population1.fitness_epoch = 3
+            evaluations: float = metrics1.es_get_counter("evaluations")
+            hits: int = cache1.hits
+
+            # All of them are in the cache already:
+            individuals: list[TestIndividual] = [ind.es_clone() for ind in population1.population]  # type: ignore
+            population1.es_calculate_fitness_all(individuals)  # type: ignore
+
+            for ind in individuals:
+                self.assertEqual(ind.fitness, float(sum(ind.data)))
+                self.assertEqual(ind.fitness_epoch, 3)
+
+            results.append((metrics1.es_get_counter("evaluations") - evaluations, cache1.hits - hits))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], (10.0, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
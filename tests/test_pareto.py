@@ -0,0 +1,71 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+from sys import float_info
+
+# Local imports:
+import evolusnake.es_pareto as pareto
+
+
+class TestPareto(unittest.TestCase):
+    def test_dominates(self):
+        """
+        Test Pareto dominance for minimization.
+        """
+
+        self.assertTrue(pareto.es_dominates([1.0, 1.0], [2.0, 2.0]))
+        self.assertTrue(pareto.es_dominates([1.0, 2.0], [2.0, 2.0]))
+        self.assertFalse(pareto.es_dominates([1.0, 3.0], [2.0, 2.0]))
+        self.assertFalse(pareto.es_dominates([2.0, 2.0], [2.0, 2.0]))
+        self.assertFalse(pareto.es_dominates([2.0, 2.0], [1.0, 1.0]))
+
+    def test_non_dominated_sort(self):
+        """
+        Test splitting the objectives into fronts.
+        """
+
+        objectives: list[list[float]] = [
+            [3.0, 3.0],
+            [1.0, 4.0],
+            [4.0, 1.0],
+            [2.0, 2.0],
+            [5.0, 5.0],
+        ]
+
+        fronts: list[list[int]] = pareto.es_non_dominated_sort(objectives)
+
+        self.assertEqual(len(fronts), 3)
+        self.assertEqual(sorted(fronts[0]), [1, 2, 3])
+        self.assertEqual(fronts[1], [0])
+        self.assertEqual(fronts[2], [4])
+
+    def test_crowding_distance(self):
+        """
+        Test that the boundary individuals get the maximum distance.
+        """
+
+        objectives: list[list[float]] = [
+            [1.0, 4.0],
+            [2.0, 3.0],
+            [3.5, 1.5],
+            [4.0, 1.0],
+        ]
+
+        distance: dict[int, float] = pareto.es_crowding_distance(objectives, [0, 1, 2, 3])
+
+        self.assertEqual(distance[0], float_info.max)
+        self.assertEqual(distance[3], float_info.max)
+        self.assertAlmostEqual(distance[1], 2.5 / 3.0 + 2.5 / 3.0)
+        self.assertAlmostEqual(distance[2], 2.0 / 3.0 + 2.0 / 3.0)
+
+        distance = pareto.es_crowding_distance(objectives, [1, 2])
+        self.assertEqual(distance[1], float_info.max)
+        self.assertEqual(distance[2], float_info.max)
+
+
+if __name__ == "__main__":
+    unittest.main()
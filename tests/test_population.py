@@ -5,14 +5,29 @@
 
 # Python std lib:
 import unittest
+import os
+from collections import Counter
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
-from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_population import ESPopulation, ESPopulationView, ESIterationCallBack
 from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population_node1 import ESPopulationNode1
 
 from tests.common import TestIndividual
 
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+class PhaseCallBack(ESIterationCallBack):
+    def __init__(self):
+        super().__init__()
+        self.reports: list[tuple[dict, dict]] = []
+
+    def es_phase_times(self, population: ESPopulationView, phase_times: Counter, phase_calls: Counter):
+        self.reports.append((dict(phase_times), dict(phase_calls)))
+
 
 class TestPopulation(unittest.TestCase):
     def test_population_valid_config(self):
@@ -93,6 +108,19 @@ class TestPopulation(unittest.TestCase):
             population: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
             del population
 
+    def test_population_invalid_config4(self):
+        """
+        Test population init with an invalid config: early exit delay.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.early_exit_delay = -1.0
+        ind1: TestIndividual = TestIndividual()
+
+        with self.assertRaises(ValueError):
+            population: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+            del population
+
     def test_population_find_worst_individual(self):
         """
         Test finding the worst individual in a population.
@@ -384,6 +412,189 @@ class TestPopulation(unittest.TestCase):
 
         # TODO: Find a way to check logs via assert.
 
+    def test_new_fitness_epoch1(self):
+        """
+        Test re-evaluating the whole population in a new fitness epoch.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+
+        population1.es_new_fitness_epoch()
+
+        self.assertEqual(population1.fitness_epoch, 1)
+
+        for ind in population1.population:
+            self.assertEqual(ind.calc_fitness_called, 2)  # type: ignore
+            self.assertFalse(population1.es_is_stale(ind))
+
+    def test_new_fitness_epoch2(self):
+        """
+        Test re-evaluating only the top k individuals in a new fitness epoch.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.reevaluate_top_k = 3
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+
+        population1.es_new_fitness_epoch()
+        population1.es_sort_population()
+
+        stale_counter: int = 0
+
+        for i in range(population1.population_size):
+            ind = population1.population[i]
+            if population1.es_is_stale(ind):
+                stale_counter += 1
+                self.assertEqual(ind.calc_fitness_called, 1)  # type: ignore
+            else:
+                self.assertEqual(ind.calc_fitness_called, 2)  # type: ignore
+
+        self.assertEqual(stale_counter, population1.population_size - 3)
+
+    def test_stale_fitness(self):
+        """
+        Test that an individual with a stale fitness is never preferred.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.reevaluate_top_k = 3
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+
+        population1.es_new_fitness_epoch()
+
+        # A lucky fitness from the previous epoch:
+        stale_ind: ESIndividual = next(ind for ind in population1.population if population1.es_is_stale(ind))
+        stale_ind.fitness = -100.0
+
+        population1.es_find_best_and_worst_individual()
+        self.assertTrue(population1.es_is_stale(population1.population[population1.worst_index]))
+        self.assertFalse(population1.es_is_stale(population1.es_get_best()))
+
+        # The three re-evaluated individuals come first:
+        population1.es_sort_population()
+        self.assertIs(population1.population[3], stale_ind)
+
+        for i in range(3):
+            self.assertFalse(population1.es_is_stale(population1.population[i]))
+
+        ind2: TestIndividual = TestIndividual()
+        population1.es_calculate_fitness(ind2)
+        self.assertTrue(population1.es_is_better(ind2, stale_ind))
+        self.assertFalse(population1.es_is_better(stale_ind, ind2))
+
+        population1.es_check_limit(ind2, 0.0, population1.population_size - 1)
+        self.assertIs(population1.population[-1], ind2)
+
+    def test_profile_phases(self):
+        """
+        Test collecting the time spent in each phase of ps_process_data().
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.profile_phases = True
+        config1.num_of_iterations = 10
+        # No early exit:
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+        callback1: PhaseCallBack = PhaseCallBack()
+
+        population1: ESPopulationNode1 = ESPopulationNode1(config1, ind1, callback1)
+        population1.ps_process_data(ind1)
+        population1.ps_process_data(ind1)
+
+        self.assertEqual(len(callback1.reports), 2)
+
+        (phase_times, phase_calls) = callback1.reports[1]
+        offset: int = population1.offset
+
+        for phase in ("clone", "mutate", "evaluate", "selection", "fitness2"):
+            self.assertIn(phase, phase_times)
+            self.assertGreater(phase_times[phase], 0)
+
+        self.assertEqual(phase_calls["clone"], 10 * offset)
+        self.assertEqual(phase_calls["mutate"], 10 * offset)
+        self.assertEqual(phase_calls["evaluate"], 10 * offset)
+        self.assertEqual(phase_calls["selection"], 10)
+        self.assertEqual(phase_calls["fitness2"], 1)
+
+        # Reset after each report:
+        self.assertEqual(len(population1.population.phase_times), 0)
+
+    def test_profile_phases_disabled(self):
+        """
+        Test that nothing is collected by default.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+        callback1: PhaseCallBack = PhaseCallBack()
+
+        population1: ESPopulationNode1 = ESPopulationNode1(config1, ind1, callback1)
+        population1.ps_process_data(ind1)
+
+        self.assertEqual(callback1.reports, [])
+        self.assertEqual(len(population1.population.phase_times), 0)
+
+    def test_node_checkpoint(self):
+        """
+        Test the warm start from a node checkpoint without calculating the fitness again.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.node_checkpoint_filename = "test_node_checkpoint1.bin"
+        config1.node_checkpoint_interval = 2
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        if os.path.exists(config1.node_checkpoint_filename):
+            os.remove(config1.node_checkpoint_filename)
+
+        population1: ESPopulationNode1 = ESPopulationNode1(config1, ind1)
+        population1.ps_process_data(ind1)
+        self.assertFalse(os.path.exists(config1.node_checkpoint_filename))
+
+        population1.ps_process_data(ind1)
+        self.assertTrue(os.path.exists(config1.node_checkpoint_filename))
+
+        ind2: TestIndividual = TestIndividual()
+        population2: ESPopulationNode1 = ESPopulationNode1(config1, ind2)
+        os.remove(config1.node_checkpoint_filename)
+
+        data1: list = [ind.data for ind in population1.population.population]  # type: ignore
+        data2: list = [ind.data for ind in population2.population.population]  # type: ignore
+        fitness1: list[float] = [ind.fitness for ind in population1.population.population]
+        fitness2: list[float] = [ind.fitness for ind in population2.population.population]
+
+        self.assertEqual(data1, data2)
+        self.assertEqual(fitness1, fitness2)
+        self.assertEqual(ind2.clone_called, population2.population.population_size)
+
+        for ind in population2.population.population:
+            self.assertEqual(ind.calc_fitness_called, 0)  # type: ignore
+
+    def test_node_checkpoint_invalid_interval(self):
+        """
+        Test population init with an invalid node checkpoint interval.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.node_checkpoint_filename = "test_node_checkpoint2.bin"
+        config1.node_checkpoint_interval = 0
+        ind1: TestIndividual = TestIndividual()
+
+        with self.assertRaises(ValueError):
+            population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+            del population1
+
     def test_new_best_callback(self):
         raise NotImplementedError("Test case not written yet.")
 
@@ -394,7 +605,62 @@ class TestPopulation(unittest.TestCase):
         raise NotImplementedError("Test case not written yet.")
 
     def test_calculate_fitness2(self):
-        raise NotImplementedError("Test case not written yet.")
+        """
+        Test calculating fitness2 only once for each genome and only below the threshold.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.fitness2_threshold = 3.0
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+
+        for i in range(population1.population_size):
+            population1.population[i].data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]  # type: ignore
+            population1.population[i].data[0:i] = [1] * i  # type: ignore
+            population1.es_calculate_fitness(population1.population[i])
+
+        population1.es_calculate_fitness2()
+        population1.es_calculate_fitness2()
+
+        for i in range(population1.population_size):
+            ind = population1.population[i]
+            if i < 3:
+                self.assertEqual(ind.calc_fitness2_called, 1)  # type: ignore
+                self.assertFalse(ind.fitness2_dirty)
+            else:
+                self.assertEqual(ind.calc_fitness2_called, 0)  # type: ignore
+
+        self.assertEqual(population1.best_index, 0)
+
+        population1.population[0].es_mutate_internal(0)
+        self.assertTrue(population1.population[0].fitness2_dirty)
+
+        population1.es_calculate_fitness2()
+        self.assertEqual(population1.population[0].calc_fitness2_called, 2)  # type: ignore
+        self.assertEqual(population1.population[1].calc_fitness2_called, 1)  # type: ignore
+
+    def test_calculate_fitness2_top_k(self):
+        """
+        Test calculating fitness2 only for the top k individuals.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.fitness2_threshold = 100.0
+        config1.fitness2_top_k = 2
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+
+        population1.es_calculate_fitness2()
+        population1.es_sort_population()
+
+        calculated: int = 0
+
+        for ind in population1.population:
+            if not ind.fitness2_dirty:
+                calculated += 1
+
+        self.assertEqual(calculated, 2)
+        self.assertFalse(population1.population[0].fitness2_dirty)
 
     def test_randomize_count(self):
         raise NotImplementedError("Test case not written yet.")
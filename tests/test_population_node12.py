@@ -0,0 +1,303 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import os
+from collections import Counter
+from typing import override, Self
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_population_node12 import ESPopulationNode12
+from evolusnake.es_select_population import es_select_population
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+import evolusnake.es_utils as utils
+
+from tests.common import TestVectorIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+import numpy as np
+
+
+class TestCallBack(ESIterationCallBack):
+    def __init__(self):
+        super().__init__()
+
+        self.calls: list[str] = []
+
+    @override
+    def es_get_iteration_factor(self) -> int:
+        return 2
+
+    @override
+    def es_before_iteration(self, population):
+        self.calls.append("before")
+
+    @override
+    def es_fraction_iteration(self, population):
+        self.calls.append("fraction")
+        population.es_new_fitness_epoch()
+
+    @override
+    def es_after_of_iteration(self, population):
+        self.calls.append("after")
+
+
+class TestPhaseCallBack(ESIterationCallBack):
+    def __init__(self):
+        super().__init__()
+
+        self.phase_calls: Counter = Counter()
+
+    @override
+    def es_phase_times(self, population, phase_times: Counter, phase_calls: Counter):
+        self.phase_calls.update(phase_calls)
+
+
+class TestAliasVectorIndividual(TestVectorIndividual):
+    # The clones share the vector and es_randomize() changes it in place.
+    @override
+    def es_randomize(self):
+        for i in range(len(self.values)):
+            self.values[i] = utils.es_uniform5(-5.0, 5.0)
+
+    @override
+    def es_clone(self) -> Self:
+        new: TestAliasVectorIndividual = TestAliasVectorIndividual()
+        new.values = self.values
+        new.fitness = self.fitness
+
+        return new  # type: ignore
+
+
+class TestPopulation(unittest.TestCase):
+    def test_population_init(self):
+        """
+        Test the matrix of the population.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.node_population_size = 9
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, ind1)
+
+        self.assertEqual(population1.matrix.shape, (9, 5))
+        self.assertEqual(population1.fitness.shape, (9,))
+        self.assertEqual(population1.parent_size + population1.child_size, 9)
+
+        best: ESIndividual = population1.es_get_best()
+        self.assertAlmostEqual(best.fitness, float(population1.fitness.min()))
+
+    def test_population_init_alias(self):
+        """
+        Test that the rows of the matrix are different if the individual shares its vector.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.node_population_size = 6
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestAliasVectorIndividual = TestAliasVectorIndividual()
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, ind1)
+        self.assertEqual(len(np.unique(population1.matrix, axis=0)), 6)
+
+        population1.es_random_population()
+        self.assertEqual(len(np.unique(population1.matrix, axis=0)), 6)
+
+    def test_population_process_data1(self):
+        """
+        Test optimizing the population.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.num_of_mutations = 2
+        config1.num_of_iterations = 100
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        ind1.es_calculate_fitness()
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, ind1)
+        previous_fitness: float = population1.es_get_best().fitness
+
+        for _ in range(10):
+            ind2: ESIndividual = population1.ps_process_data(ind1)
+            self.assertLessEqual(ind2.fitness, previous_fitness)
+            previous_fitness = ind2.fitness
+
+        self.assertLess(ind2.fitness, 1.0)
+
+        # The returned fitness must match the vector:
+        ind2.es_calculate_fitness()
+        self.assertAlmostEqual(ind2.fitness, previous_fitness)
+
+    def test_population_restart(self):
+        """
+        Test the restart signal from the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.num_of_iterations = 1
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        ind1.values = [0.0, 0.0, 0.0, 0.0, 0.0]
+        ind1.es_calculate_fitness()
+        ind1.server_message = {"restart": True}
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, ind1)
+        population1.randomize_iteration = 3
+        population1.es_randomize_or_accept_best(ind1)
+
+        # The best individual from the server is not accepted:
+        self.assertEqual(population1.randomize_iteration, 0)
+        self.assertGreater(float(population1.fitness.min()), 0.0)
+
+        ind1.server_message = {}
+        population1.es_randomize_or_accept_best(ind1)
+        self.assertAlmostEqual(float(population1.fitness.min()), 0.0)
+
+    def test_population_noisy_fitness(self):
+        """
+        Test that the fitness of the individual from the server is calculated again.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.noisy_fitness = True
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        # Lucky batch somewhere else:
+        ind1.fitness = -10.0
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, ind1)
+        population1.es_randomize_or_accept_best(ind1)
+
+        self.assertGreater(float(population1.fitness.min()), 0.0)
+        self.assertIn(5.0, population1.fitness.tolist())
+
+    def test_iteration_callback(self):
+        """
+        Test calling the iteration callback.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        callback1: TestCallBack = TestCallBack()
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, ind1, callback1)
+        population1.ps_process_data(ind1)
+
+        self.assertEqual(callback1.calls, ["before", "fraction", "after"])
+        self.assertEqual(population1.fitness_epoch, 1)
+
+        # Still the fitness of each row:
+        np.testing.assert_allclose(population1.fitness, (population1.matrix**2.0).sum(axis=1))
+
+    def test_population_view(self):
+        """
+        Test the individuals that the iteration callback gets.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.node_population_size = 4
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, TestVectorIndividual())
+
+        individuals: list[ESIndividual] = population1.population
+        self.assertEqual(len(individuals), 4)
+
+        for (ind, row, fitness) in zip(individuals, population1.matrix, population1.fitness):
+            self.assertEqual(ind.es_get_vector(), row.tolist())
+            self.assertEqual(ind.fitness, fitness)
+
+    def test_profile_and_metrics(self):
+        """
+        Test the phase times and the metrics of kind 12.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.profile_phases = True
+        config1.metrics_filename = "test_node12_metrics.jsonl"
+        config1.metrics_interval = 1000.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        callback1: TestPhaseCallBack = TestPhaseCallBack()
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, TestVectorIndividual(), callback1)
+        metrics1 = population1.metrics
+        assert metrics1 is not None
+
+        population1.ps_process_data(TestVectorIndividual())
+
+        self.assertEqual(callback1.phase_calls["mutate"], 10)
+        self.assertEqual(callback1.phase_calls["selection"], 10)
+        # The initial matrix is evaluated as well:
+        self.assertEqual(callback1.phase_calls["evaluate"], 11)
+        self.assertEqual(len(population1.phase_times), 0)
+
+        # The initial matrix and 10 times the children:
+        self.assertAlmostEqual(metrics1.es_get_counter("evaluations"),
+            config1.node_population_size + (10 * population1.child_size))
+        self.assertAlmostEqual(metrics1.es_get_counter("exchanges"), 1.0)
+        self.assertGreater(metrics1.es_get_counter("phase_seconds", "evaluate"), 0.0)
+
+    def test_node_checkpoint(self):
+        """
+        Test the warm start from the node checkpoint.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.node_checkpoint_filename = "test_node12_checkpoint.bin"
+        config1.node_checkpoint_interval = 1
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+
+        if os.path.exists(config1.node_checkpoint_filename):
+            os.remove(config1.node_checkpoint_filename)
+
+        population1: ESPopulationNode12 = ESPopulationNode12(config1, TestVectorIndividual())
+        population1.ps_process_data(TestVectorIndividual())
+        self.assertTrue(os.path.exists(config1.node_checkpoint_filename))
+
+        population2: ESPopulationNode12 = ESPopulationNode12(config1, TestVectorIndividual())
+        os.remove(config1.node_checkpoint_filename)
+
+        np.testing.assert_allclose(population2.matrix, population1.matrix)
+        np.testing.assert_allclose(population2.fitness, population1.fitness)
+
+        config1.node_checkpoint_interval = 0
+
+        with self.assertRaises(ValueError):
+            ESPopulationNode12(config1, TestVectorIndividual())
+
+    def test_select_population(self):
+        """
+        Test selecting population kind 12.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.population_kind = 12
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+
+        population1 = es_select_population(config1, ind1)
+        self.assertIsInstance(population1, ESPopulationNode12)
+
+
+if __name__ == "__main__":
+    unittest.main()
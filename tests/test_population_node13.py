@@ -0,0 +1,196 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+from typing import override
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_population_node13 import ESPopulationNode13
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population import ESIterationCallBack
+
+from tests.common import TestVectorIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+class TestCallBack(ESIterationCallBack):
+    def __init__(self):
+        super().__init__()
+
+        self.calls: list[str] = []
+
+    @override
+    def es_get_iteration_factor(self) -> int:
+        return 2
+
+    @override
+    def es_before_iteration(self, population):
+        self.calls.append("before")
+
+    @override
+    def es_fraction_iteration(self, population):
+        self.calls.append("fraction")
+        population.es_new_fitness_epoch()
+
+    @override
+    def es_after_of_iteration(self, population):
+        self.calls.append("after")
+
+
+class TestPopulation(unittest.TestCase):
+    def test_population_process_data1(self):
+        """
+        Test optimizing the population.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.num_of_iterations = 100
+        config1.vector_sigma = 1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        ind1.es_calculate_fitness()
+
+        population1: ESPopulationNode13 = ESPopulationNode13(config1, ind1)
+        self.assertEqual(population1.lambda_size, 10)
+        self.assertEqual(population1.mu_size, 2)
+
+        for _ in range(5):
+            ind2: ESIndividual = population1.ps_process_data(ind1)
+
+        self.assertLess(ind2.fitness, 0.001)
+
+        # The returned fitness must match the vector:
+        fitness: float = ind2.fitness
+        ind2.es_calculate_fitness()
+        self.assertAlmostEqual(ind2.fitness, fitness)
+
+    def test_population_restart(self):
+        """
+        Test restarting with a doubled population (IPOP).
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 5
+        config1.restart_stagnation = 1
+        # Restart in every generation, since the step size is too small:
+        config1.vector_sigma = 1e-13
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+
+        population1: ESPopulationNode13 = ESPopulationNode13(config1, ind1)
+        population1.es_restart(population1.es_random_vector(), True)
+
+        self.assertEqual(population1.restart_counter, 1)
+        self.assertEqual(population1.lambda_size, 20)
+        self.assertEqual(population1.mu_size, 5)
+        self.assertAlmostEqual(population1.sigma, config1.vector_sigma)
+
+        population1.ps_process_data(ind1)
+        self.assertEqual(population1.restart_counter, 6)
+
+    def test_population_restart_signal(self):
+        """
+        Test the restart signal from the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        ind1.values = [0.0, 0.0, 0.0, 0.0, 0.0]
+        ind1.es_calculate_fitness()
+
+        population1: ESPopulationNode13 = ESPopulationNode13(config1, ind1)
+        population1.sigma = 0.5
+        population1.stagnation_counter = 5
+        ind1.server_message = {"restart": True}
+        population1.es_randomize_or_accept_best(ind1)
+
+        # The best individual from the server is not accepted:
+        self.assertNotEqual(population1.mean, ind1.values)
+        self.assertAlmostEqual(population1.sigma, config1.vector_sigma)
+        self.assertEqual(population1.stagnation_counter, 0)
+
+        ind1.server_message = {}
+        population1.es_randomize_or_accept_best(ind1)
+        self.assertEqual(population1.mean, ind1.values)
+
+    def test_iteration_callback(self):
+        """
+        Test the iteration callback and a new fitness epoch.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+        callback1: TestCallBack = TestCallBack()
+
+        population1: ESPopulationNode13 = ESPopulationNode13(config1, ind1, callback1)
+        ind2: ESIndividual = population1.ps_process_data(ind1)
+
+        self.assertEqual(callback1.calls, ["before", "fraction", "after"])
+        self.assertEqual(population1.fitness_epoch, 1)
+        self.assertEqual(population1.population, [ind2])
+        self.assertEqual(ind2.fitness_epoch, 1)
+
+    def test_population_stale_best(self):
+        """
+        Test that the best individual of a previous call is not returned again.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = False
+        config1.num_of_iterations = 5
+        config1.target_fitness = -200.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+
+        population1: ESPopulationNode13 = ESPopulationNode13(config1, ind1)
+        population1.ps_process_data(ind1)
+
+        # The fitness of the best individual has been calculated on a different data set:
+        population1.best_individual.fitness = -100.0
+        ind2: ESIndividual = population1.ps_process_data(ind1)
+
+        fitness: float = ind2.fitness
+        ind2.es_calculate_fitness()
+        self.assertAlmostEqual(ind2.fitness, fitness)
+        self.assertGreaterEqual(fitness, 0.0)
+
+    def test_accept_noisy_fitness(self):
+        """
+        Test that the fitness from the server is calculated again with noisy_fitness.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.noisy_fitness = True
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestVectorIndividual = TestVectorIndividual()
+
+        population1: ESPopulationNode13 = ESPopulationNode13(config1, ind1)
+
+        ind2: TestVectorIndividual = TestVectorIndividual()
+        ind2.values = [0.1, 0.0, 0.0, 0.0, 0.0]
+        ind2.fitness = -1.0
+        population1.es_randomize_or_accept_best(ind2)
+
+        self.assertEqual(population1.mean, ind2.values)
+        self.assertAlmostEqual(population1.run_best_fitness, 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
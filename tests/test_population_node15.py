@@ -0,0 +1,131 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_population_node15 import ESPopulationNode15
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_pareto import es_dominates
+
+from tests.common import TestIndividual, TestMultiIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+class TestPopulation(unittest.TestCase):
+    def test_population_process_data1(self):
+        """
+        Test optimizing the population, default objectives.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = True
+        config1.num_of_mutations = 1
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        population1: ESPopulationNode15 = ESPopulationNode15(config1, ind1)
+
+        while True:
+            ind2: ESIndividual = population1.ps_process_data(ind1)
+            if ind2.fitness < 1.0:
+                break
+
+        self.assertAlmostEqual(ind2.fitness, 0.0)
+        self.assertEqual(ind2.data, [0, 0, 0, 0, 0, 0, 0, 0, 0, 0])  # type: ignore
+        self.assertAlmostEqual(ind2.objectives[0], 0.0)
+
+    def test_population_process_data2(self):
+        """
+        Test that the population keeps a front of non-dominated individuals.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.randomize_population = False
+        config1.accept_new_best = False
+        config1.num_of_mutations = 1
+        config1.num_of_iterations = 200
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestMultiIndividual = TestMultiIndividual()
+
+        population1: ESPopulationNode15 = ESPopulationNode15(config1, ind1)
+        population1.ps_process_data(ind1)
+
+        size: int = population1.population.population_size
+        self.assertEqual(len(population1.population.population), size)
+        self.assertEqual(len(population1.rank), size)
+        self.assertEqual(population1.rank[0], 0)
+        self.assertEqual(population1.rank, sorted(population1.rank))
+
+        front: list[ESIndividual] = [ind for (ind, rank) in
+            zip(population1.population.population, population1.rank) if rank == 0]
+
+        for ind_a in front:
+            for ind_b in population1.population.population:
+                self.assertFalse(es_dominates(ind_b.objectives, ind_a.objectives))
+
+        # Different trade offs between the objectives must survive:
+        self.assertGreater(len({tuple(ind.objectives) for ind in front}), 1)
+
+    def test_population_evaluate_once(self):
+        """
+        Test that the objectives are calculated together with the fitness and
+        that every individual is only evaluated once.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestMultiIndividual = TestMultiIndividual()
+
+        population1: ESPopulationNode15 = ESPopulationNode15(config1, ind1)
+
+        for ind in population1.population.population:
+            self.assertEqual(ind.calc_fitness_called, 1)  # type: ignore
+            self.assertEqual(len(ind.objectives), 2)
+            self.assertAlmostEqual(ind.objectives[0], ind.fitness)
+
+    def test_population_deferred_init(self):
+        """
+        Test creating the population from the elite individuals of the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.init_batch_size = 2
+        config1.num_of_iterations = 5
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestMultiIndividual = TestMultiIndividual()
+
+        population1: ESPopulationNode15 = ESPopulationNode15(config1, ind1)
+        self.assertFalse(population1.population.es_is_complete())
+        self.assertEqual(population1.rank, [])
+
+        elite: list[ESIndividual] = []
+
+        for data in ([0, 0, 0, 0, 0, 0, 0, 0, 1, 1], [1, 1, 1, 1, 1, 0, 0, 0, 0, 0]):
+            ind2: TestMultiIndividual = TestMultiIndividual()
+            ind2.data = data
+            ind2.es_calculate_fitness()
+            ind2.es_calculate_objectives()
+            elite.append(ind2)
+
+        population1.ps_init(elite)
+        population1.ps_process_data(ind1)
+
+        size: int = population1.population.population_size
+        self.assertTrue(population1.population.es_is_complete())
+        self.assertEqual(len(population1.rank), size)
+
+        for ind in population1.population.population:
+            self.assertEqual(len(ind.objectives), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
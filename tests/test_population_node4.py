@@ -5,6 +5,7 @@
 
 # Python std lib:
 import unittest
+import os
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
@@ -75,6 +76,30 @@ class TestPopulation(unittest.TestCase):
 
         self.assertGreater(mut_counter, 0)
 
+    def test_population_checkpoint(self):
+        """
+        Test restoring the global fitness from the node checkpoint.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.node_checkpoint_filename = "test_node4_checkpoint.bin"
+        config1.node_checkpoint_interval = 1
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        if os.path.exists(config1.node_checkpoint_filename):
+            os.remove(config1.node_checkpoint_filename)
+
+        population1: ESPopulationNode4 = ESPopulationNode4(config1, ind1)
+        population1.ps_process_data(ind1)
+
+        population2: ESPopulationNode4 = ESPopulationNode4(config1, ind1)
+        os.remove(config1.node_checkpoint_filename)
+
+        self.assertAlmostEqual(population2.global_fitness, population1.global_fitness)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -75,6 +75,30 @@ class TestPopulation(unittest.TestCase):
 
         self.assertGreater(mut_counter, 0)
 
+    def test_population_stale_fitness(self):
+        """
+        Test that individuals with a stale fitness from a previous epoch are replaced.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 1
+        config1.target_fitness = -1000.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        population1: ESPopulationNode6 = ESPopulationNode6(config1, TestIndividual())
+
+        # Lucky fitness values from the previous epoch:
+        population1.population.fitness_epoch = 1
+
+        for ind in population1.population.population:
+            ind.fitness = -100.0
+
+        population1.es_before_steps()
+        population1.es_step(0)
+
+        fresh: list[ESIndividual] = [ind for ind in population1.population.population
+            if not population1.population.es_is_stale(ind)]
+        self.assertGreater(len(fresh), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
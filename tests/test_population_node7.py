@@ -5,6 +5,7 @@
 
 # Python std lib:
 import unittest
+from unittest.mock import Mock
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
@@ -75,6 +76,42 @@ class TestPopulation(unittest.TestCase):
 
         self.assertGreater(mut_counter, 0)
 
+    def test_population_deferred_init(self):
+        """
+        Test creating the population from the elite individuals of the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.init_batch_size = 2
+        config1.num_of_iterations = 5
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        population1: ESPopulationNode7 = ESPopulationNode7(config1, ind1)
+        self.assertFalse(population1.population.es_is_complete())
+
+        elite: list[ESIndividual] = []
+
+        for data in ([0, 0, 0, 0, 0, 0, 0, 0, 1, 1], [0, 0, 0, 0, 0, 0, 0, 1, 1, 1]):
+            ind2: TestIndividual = TestIndividual()
+            ind2.data = data
+            ind2.es_calculate_fitness()
+            elite.append(ind2)
+
+        population1.ps_init(elite)
+        ind3: ESIndividual = population1.ps_process_data(ind1)
+
+        # The first call is not randomized, the best individual is kept:
+        self.assertTrue(population1.population.es_is_complete())
+        self.assertLessEqual(ind3.fitness, elite[0].fitness)
+        self.assertTrue(population1.stagnated)
+
+        # Stagnation, the next call starts with a random population:
+        population1.population.es_random_population = Mock()  # type: ignore
+        population1.ps_process_data(ind1)
+        population1.population.es_random_population.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
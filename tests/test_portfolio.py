@@ -0,0 +1,142 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_portfolio import ESPortfolioNode, es_portfolio_config
+from evolusnake.es_population_node4 import ESPopulationNode4
+from evolusnake.es_population_node5 import ESPopulationNode5
+from evolusnake.es_scheduler import ESNodeScheduler
+from evolusnake.es_select_population import es_select_population
+from evolusnake.es_individual import ESIndividual
+
+from tests.common import TestIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+from parasnake.ps_nodeid import PSNodeId
+
+
+class TestPortfolio(unittest.TestCase):
+    def test_portfolio_config(self):
+        """
+        Test overriding options from a portfolio entry.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.portfolio = [{"population_kind": 4}]
+
+        config2: ESConfiguration = es_portfolio_config(config1, {"population_kind": 4, "num_of_mutations": 3})
+        self.assertEqual(config2.population_kind, 4)
+        self.assertEqual(config2.num_of_mutations, 3)
+        self.assertEqual(config2.portfolio, [])
+        self.assertEqual(config1.population_kind, 1)
+
+        with self.assertRaises(ValueError):
+            es_portfolio_config(config1, {"unknown_option": 1})
+
+    def test_portfolio_node(self):
+        """
+        Test switching the population kind on request of the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.portfolio = [{"population_kind": 4}, {"population_kind": 5}]
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        ind1: TestIndividual = TestIndividual()
+
+        node1 = es_select_population(config1, ind1)
+        assert isinstance(node1, ESPortfolioNode)
+        self.assertIsNone(node1.node)
+
+        ind2: ESIndividual = TestIndividual()
+        ind2.server_message = {"portfolio": {"population_kind": 4}}
+        result1: ESIndividual = node1.ps_process_data(ind2)
+
+        self.assertIsInstance(node1.node, ESPopulationNode4)
+        self.assertGreaterEqual(result1.node_message["cpu_seconds"], 0.0)
+
+        ind2.server_message = {"portfolio": {"population_kind": 5}}
+        node1.ps_process_data(ind2)
+        self.assertIsInstance(node1.node, ESPopulationNode5)
+
+    def test_portfolio_switch_seed(self):
+        """
+        Test that the best fitness does not regress when the population kind is switched.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.portfolio = [{"population_kind": 4}, {"population_kind": 5}]
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+
+        node1 = es_select_population(config1, TestIndividual())
+        assert isinstance(node1, ESPortfolioNode)
+
+        ind1: ESIndividual = TestIndividual()
+        ind1.es_calculate_fitness()
+        ind1.server_message = {"portfolio": {"population_kind": 4}}
+
+        for _ in range(3):
+            node1.ps_process_data(ind1)
+
+        node2 = node1.node
+        assert isinstance(node2, ESPopulationNode4)
+        best_fitness: float = min(ind.fitness for ind in node2.population.population)
+
+        # The new population is created from the previous one:
+        node1.es_switch({"population_kind": 5})
+        node3 = node1.node
+        assert isinstance(node3, ESPopulationNode5)
+
+        self.assertFalse(node3.population.es_is_complete())
+        self.assertEqual(node3.init_data[0].fitness, best_fitness)
+        self.assertIsNone(node1.init_data)
+
+        ind1.server_message = {"portfolio": {"population_kind": 5}}
+        result1: ESIndividual = node1.ps_process_data(ind1)
+
+        self.assertIs(node1.node, node3)
+        self.assertTrue(node3.population.es_is_complete())
+        self.assertLessEqual(result1.fitness, best_fitness)
+        self.assertLessEqual(min(ind.fitness for ind in node3.population.population), best_fitness)
+
+    def test_select_entry(self):
+        """
+        Test assigning the portfolio entries to nodes.
+        """
+
+        portfolio: list[dict] = [{"population_kind": 1}, {"population_kind": 2}]
+        scheduler1: ESNodeScheduler = ESNodeScheduler(100, portfolio, 1)
+        scheduler1.EXPLORE_PROBABILITY = 0.0
+        node_id1: PSNodeId = PSNodeId()
+        node_id2: PSNodeId = PSNodeId()
+
+        # Try all entries first:
+        self.assertEqual(scheduler1.es_node_request(node_id1)["portfolio"], portfolio[0])
+        self.assertEqual(scheduler1.es_node_request(node_id2)["portfolio"], portfolio[1])
+
+        scheduler1.es_node_result(node_id1, False, False, 1.0)
+        scheduler1.es_node_result(node_id2, True, False, 1.0)
+
+        self.assertAlmostEqual(scheduler1.portfolio_stats[1].es_score(), 1.0)
+
+        # The second entry has the better score:
+        self.assertEqual(scheduler1.es_node_request(node_id1)["portfolio"], portfolio[1])
+        self.assertEqual(scheduler1.es_node_request(node_id2)["portfolio"], portfolio[1])
+
+        with self.assertRaises(ValueError):
+            scheduler2: ESNodeScheduler = ESNodeScheduler(100, portfolio, 0)
+            del scheduler2
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import pickle
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_population_node2 import ESPopulationNode2
+from evolusnake.es_queens import ESQueensIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+def count_conflicts(rows: list[int]) -> int:
+    # Check all pairs of queens.
+    conflicts: int = 0
+
+    for i in range(len(rows)):
+        for j in range(i + 1, len(rows)):
+            if (rows[i] == rows[j]) or (abs(rows[i] - rows[j]) == j - i):
+                conflicts += 1
+
+    return conflicts
+
+
+class TestQueens(unittest.TestCase):
+    def test_conflicts(self):
+        """
+        Test that the counted conflicts match the check of all pairs.
+        """
+
+        ind1: ESQueensIndividual = ESQueensIndividual(12)
+        self.assertEqual(ind1.conflicts, count_conflicts(list(ind1.rows)))
+
+        ind1.es_count_conflicts()
+        self.assertEqual(ind1.conflicts, count_conflicts(list(ind1.rows)))
+
+        ind1.es_randomize()
+        self.assertEqual(ind1.conflicts, count_conflicts(list(ind1.rows)))
+
+        for mut_op in (0, 1):
+            for _ in range(200):
+                ind1.es_mutate(mut_op)
+                self.assertEqual(ind1.conflicts, count_conflicts(list(ind1.rows)))
+
+        ind1.es_from_json({"rows": [1, 3, 0, 2]})
+        ind1.es_calculate_fitness()
+        self.assertEqual(ind1.fitness, 0.0)
+
+        with self.assertRaises(ValueError):
+            ESQueensIndividual(3)
+
+        with self.assertRaises(ValueError):
+            ind1.es_mutate(2)
+
+    def test_clone(self):
+        """
+        Test that a clone does not share the genome.
+        """
+
+        ind1: ESQueensIndividual = ESQueensIndividual(8)
+        ind1.es_randomize()
+        ind1.es_calculate_fitness()
+
+        ind2: ESQueensIndividual = ind1.es_clone()
+        rows: list[int] = list(ind1.rows)
+
+        for _ in range(20):
+            ind2.es_mutate(0)
+
+        self.assertEqual(list(ind1.rows), rows)
+        self.assertEqual(ind1.conflicts, count_conflicts(rows))
+        self.assertEqual(ind2.conflicts, count_conflicts(list(ind2.rows)))
+
+        ind3: ESQueensIndividual = pickle.loads(pickle.dumps(ind2))
+        ind4: ESQueensIndividual = ESQueensIndividual(8)
+        ind4.es_from_server(ind3)
+        self.assertEqual(ind4.rows, ind2.rows)
+        self.assertEqual(ind4.es_genome_hash(), ind2.es_genome_hash())
+        self.assertEqual(ind4.es_distance(ind2), 0.0)
+
+    def test_node(self):
+        """
+        Test that a population node reduces the conflicts.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 100
+        config1.num_of_mutations = 1
+        config1.mutation_operations = [0, 1]
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+
+        ind1: ESQueensIndividual = ESQueensIndividual(20)
+        ind1.es_calculate_fitness()
+
+        node1: ESPopulationNode2 = ESPopulationNode2(config1, ind1)
+        ind2 = node1.ps_process_data(ind1)
+
+        self.assertLess(ind2.fitness, ind1.fitness)
+        self.assertEqual(ind2.fitness, float(count_conflicts(list(ind2.rows))))  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import json
+import os
+from unittest.mock import patch
+
+# Local imports:
+from evolusnake.es_result_writer import ESResultWriter
+
+from tests.common import TestIndividual
+
+
+class TestResultWriter(unittest.TestCase):
+    def test_invalid_queue_size(self):
+        """
+        Test result writer init with an invalid queue size.
+        """
+
+        with self.assertRaises(ValueError):
+            writer1: ESResultWriter = ESResultWriter(queue_size=0)
+            del writer1
+
+    def test_write_files(self):
+        """
+        Test writing each result into its own file.
+        """
+
+        ind1: TestIndividual = TestIndividual()
+        ind1.fitness = 1.0
+
+        writer1: ESResultWriter = ESResultWriter()
+        writer1.es_start()
+        writer1.es_submit("test_result_writer1.json", 1, ind1)
+        writer1.es_stop()
+
+        with open("test_result_writer1.json", "r") as f:
+            data: dict = json.load(f)
+
+        os.remove("test_result_writer1.json")
+
+        self.assertAlmostEqual(data["fitness"], 1.0)
+        self.assertEqual(data["data"], ind1.data)
+        self.assertFalse(os.path.exists("test_result_writer1.json.tmp"))
+        self.assertEqual(writer1.written, 1)
+
+    def test_coalesce(self):
+        """
+        Test that only the newest waiting result is written.
+        """
+
+        history_filename: str = "test_result_writer2.jsonl"
+
+        if os.path.exists(history_filename):
+            os.remove(history_filename)
+
+        writer1: ESResultWriter = ESResultWriter(history_filename, queue_size=3)
+
+        # Not started yet, so all results are waiting in the queue:
+        for i in range(5):
+            ind1: TestIndividual = TestIndividual()
+            ind1.fitness = float(i)
+            writer1.es_submit("", i, ind1)
+
+        writer1.es_start()
+        writer1.es_stop()
+
+        with open(history_filename, "r") as f:
+            lines: list[str] = f.readlines()
+
+        os.remove(history_filename)
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["counter"], 4)
+        self.assertAlmostEqual(json.loads(lines[0])["individual"]["fitness"], 4.0)
+        self.assertEqual(writer1.coalesced, 4)
+
+    def test_json_in_writer_thread(self):
+        """
+        Test that the individual is converted to JSON by the writer and
+        that the fitness values are the ones from es_submit().
+        """
+
+        history_filename: str = "test_result_writer3.jsonl"
+
+        if os.path.exists(history_filename):
+            os.remove(history_filename)
+
+        ind1: TestIndividual = TestIndividual()
+        ind1.fitness = 1.0
+        ind1.fitness2 = 2.0
+
+        writer1: ESResultWriter = ESResultWriter(history_filename)
+
+        with patch.object(ind1, "es_to_json", wraps=ind1.es_to_json) as to_json1:
+            writer1.es_submit("", 1, ind1)
+            to_json1.assert_not_called()
+
+            # Re-evaluated on the server after it has been submitted:
+            ind1.fitness = 5.0
+
+            writer1.es_start()
+            writer1.es_stop()
+            to_json1.assert_called_once()
+
+        with open(history_filename, "r") as f:
+            data: dict = json.loads(f.readline())["individual"]
+
+        os.remove(history_filename)
+
+        self.assertAlmostEqual(data["fitness"], 1.0)
+        self.assertAlmostEqual(data["fitness2"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_scheduler import ESNodeScheduler
+from evolusnake.es_server import ESServer
+from evolusnake.es_population import ESPopulation, ESIterationCallBack
+from evolusnake.es_individual import ESIndividual
+
+from tests.common import TestIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+from parasnake.ps_nodeid import PSNodeId
+
+
+class TestScheduler(unittest.TestCase):
+    def test_invalid_stagnation_limit(self):
+        """
+        Test scheduler init with an invalid stagnation limit.
+        """
+
+        with self.assertRaises(ValueError):
+            scheduler1: ESNodeScheduler = ESNodeScheduler(0)
+            del scheduler1
+
+    def test_node_stats(self):
+        """
+        Test tracking results and improvements per node.
+        """
+
+        scheduler1: ESNodeScheduler = ESNodeScheduler(10)
+        node_id1: PSNodeId = PSNodeId()
+        node_id2: PSNodeId = PSNodeId()
+
+        scheduler1.es_node_request(node_id1)
+        scheduler1.es_node_result(node_id1, True, True)
+        scheduler1.es_node_request(node_id1)
+        scheduler1.es_node_result(node_id1, False, False)
+        scheduler1.es_node_request(node_id2)
+        scheduler1.es_node_result(node_id2, False, False)
+
+        stats1 = scheduler1.node_stats[node_id1]
+        self.assertEqual(stats1.results, 2)
+        self.assertEqual(stats1.accepted, 1)
+        self.assertEqual(stats1.improvements, 1)
+        self.assertAlmostEqual(stats1.es_improvement_rate(), 0.5)
+        self.assertGreaterEqual(stats1.es_latency(), 0.0)
+        self.assertGreater(stats1.es_throughput(), 0.0)
+
+        # The first node is more productive:
+        self.assertTrue(scheduler1.es_node_request(node_id1)["share_best"])
+        self.assertFalse(scheduler1.es_node_request(node_id2)["share_best"])
+
+        scheduler1.es_remove_node(node_id2)
+        self.assertNotIn(node_id2, scheduler1.node_stats)
+
+    def test_restart_signal(self):
+        """
+        Test sending the restart signal to a stagnant node.
+        """
+
+        scheduler1: ESNodeScheduler = ESNodeScheduler(2)
+        node_id1: PSNodeId = PSNodeId()
+
+        self.assertNotIn("restart", scheduler1.es_node_request(node_id1))
+        scheduler1.es_node_result(node_id1, False, False)
+        self.assertNotIn("restart", scheduler1.es_node_request(node_id1))
+        scheduler1.es_node_result(node_id1, False, False)
+        self.assertTrue(scheduler1.es_node_request(node_id1)["restart"])
+        self.assertNotIn("restart", scheduler1.es_node_request(node_id1))
+
+    def test_server_scheduler(self):
+        """
+        Test sending the message with a clone of the individual.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.node_scheduler = True
+        config1.node_stagnation_limit = 1
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        ind2 = server1.ps_get_new_data(node_id1)
+        assert ind2 is not None
+        self.assertEqual(ind2.server_message, {"share_best": True})
+        self.assertEqual(server1.population[0].server_message, {})
+
+        ind3: TestIndividual = TestIndividual()
+        ind3.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind3)
+
+        ind4 = server1.ps_get_new_data(node_id1)
+        assert ind4 is not None
+        self.assertTrue(ind4.server_message["restart"])
+
+    def test_population_restart(self):
+        """
+        Test randomizing the node population on a restart signal.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        ind1: TestIndividual = TestIndividual()
+        population1: ESPopulation = ESPopulation(config1, ind1, ESIterationCallBack())
+
+        randomize_called: list[int] = [ind.randomize_called for ind in population1.population]  # type: ignore
+        ind2: ESIndividual = TestIndividual()
+        ind2.server_message = {"share_best": True, "restart": True}
+        population1.es_randomize_or_accept_best(ind2)
+
+        for (ind, count) in zip(population1.population, randomize_called):
+            self.assertEqual(ind.randomize_called, count + 1)  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
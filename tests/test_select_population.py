@@ -0,0 +1,201 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import subprocess
+import sys
+import time
+from typing import override
+from unittest.mock import patch
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_individual import ESIndividual
+from evolusnake.es_population_node1 import ESPopulationNode1
+from evolusnake.es_population_node4 import ESPopulationNode4
+from evolusnake.es_population_node_base import ESPopulationNodeBase
+from evolusnake.es_select_population import es_select_population, es_register_population, ES_POPULATION_KINDS
+
+from tests.common import TestIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+class TestPopulationNode(ESPopulationNodeBase):
+    # Mutates only the best individual and keeps it if it's better.
+    @override
+    def es_step(self, iteration: int):
+        best: ESIndividual = self.population.es_get_best()
+        tmp_ind: ESIndividual = self.population.es_clone_individual(best)
+
+        self.population.es_mutate_individual(tmp_ind, self.population.num_of_mutations)
+        self.population.es_calculate_fitness(tmp_ind)
+
+        if tmp_ind.fitness < best.fitness:
+            self.population.es_replace_best(tmp_ind)
+
+            if tmp_ind.fitness <= self.population.target_fitness:
+                self.population.es_early_exit(iteration)
+
+
+class TestSelectPopulation(unittest.TestCase):
+    def setUp(self):
+        self.config: ESConfiguration = ESConfiguration()
+        self.config.num_of_iterations = 10
+        self.config.target_fitness = -1.0
+        self.config.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+
+    def test_builtin_kind(self):
+        """
+        Test selecting a built-in population kind.
+        """
+
+        node = es_select_population(self.config, TestIndividual())
+        self.assertIsInstance(node, ESPopulationNode1)
+
+    def test_unknown_kind(self):
+        """
+        Test selecting a population kind that does not exist.
+        """
+
+        self.config.population_kind = 9999
+
+        with self.assertRaises(ValueError):
+            es_select_population(self.config, TestIndividual())
+
+    def test_register_population(self):
+        """
+        Test registering a new population kind.
+        """
+
+        es_register_population(1000, TestPopulationNode)
+        self.addCleanup(ES_POPULATION_KINDS.pop, 1000)
+
+        with self.assertRaises(ValueError):
+            es_register_population(1000, TestPopulationNode)
+
+        with self.assertRaises(ValueError):
+            es_register_population(1, TestPopulationNode)
+
+        self.config.population_kind = 1000
+        node = es_select_population(self.config, TestIndividual())
+        assert isinstance(node, TestPopulationNode)
+
+        ind1: ESIndividual = TestIndividual()
+        ind1.es_calculate_fitness()
+        ind2: ESIndividual = node.ps_process_data(ind1)
+
+        self.assertLessEqual(ind2.fitness, ind1.fitness)
+        self.assertEqual(ind2.fitness, node.population.es_get_best_fitness())
+
+    def test_base_step(self):
+        """
+        Test that the base class needs an implementation of es_step().
+        """
+
+        node: ESPopulationNodeBase = ESPopulationNodeBase(self.config, TestIndividual())
+
+        with self.assertRaises(NotImplementedError):
+            node.ps_process_data(TestIndividual())
+
+    def test_deferred_init(self):
+        """
+        Test creating the population from the first individual of the server.
+        """
+
+        self.config.population_kind = 4
+        self.config.deferred_init = True
+        node = es_select_population(self.config, TestIndividual())
+        assert isinstance(node, ESPopulationNode4)
+
+        self.assertEqual(len(node.population.population), 0)
+        self.assertFalse(node.population.es_is_complete())
+
+        ind1: ESIndividual = TestIndividual()
+        ind1.es_randomize()
+        ind1.es_calculate_fitness()
+        ind2: ESIndividual = node.ps_process_data(ind1)
+
+        self.assertTrue(node.population.es_is_complete())
+        self.assertEqual(len(node.population.population), self.config.node_population_size)
+        self.assertLessEqual(ind2.fitness, ind1.fitness)
+        self.assertGreater(node.global_fitness, 0.0)
+
+    def test_init_batch(self):
+        """
+        Test creating the population from the elite individuals of the server.
+        """
+
+        self.config.init_batch_size = 3
+        node = es_select_population(self.config, TestIndividual())
+        assert isinstance(node, ESPopulationNode1)
+
+        self.assertFalse(node.population.es_is_complete())
+
+        elite: list[ESIndividual] = []
+
+        for data in ([0, 0, 0, 0, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 0, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1, 0]):
+            ind: TestIndividual = TestIndividual()
+            ind.data = data
+            ind.es_calculate_fitness()
+            elite.append(ind)
+
+        # The population is not created on the asyncio loop of ps_init():
+        node.ps_init(elite)
+        self.assertFalse(node.population.es_is_complete())
+        self.assertEqual(node.init_data, elite)
+
+        with patch.object(node.population, "es_seed_population",
+                wraps=node.population.es_seed_population) as seed1:
+            ind1: ESIndividual = node.ps_process_data(elite[1])
+            seed1.assert_called_once_with(elite)
+
+        self.assertTrue(node.population.es_is_complete())
+        self.assertEqual(len(node.population.population), self.config.node_population_size)
+        self.assertEqual(node.init_data, [])
+        # Node 1 sorts the population:
+        self.assertLessEqual(node.population.population[0].fitness, elite[0].fitness)
+        self.assertLessEqual(ind1.fitness, elite[0].fitness)
+
+        # No elite from the server, the first individual is used:
+        node2 = es_select_population(self.config, TestIndividual())
+        node2.ps_init(None)
+        self.assertFalse(node2.population.es_is_complete())
+
+        ind2: ESIndividual = node2.ps_process_data(elite[0])
+        self.assertTrue(node2.population.es_is_complete())
+        self.assertLessEqual(ind2.fitness, elite[0].fitness)
+
+    def test_import_time(self):
+        """
+        Test that importing es_select_population does not import the population kinds.
+        """
+
+        code: str = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import evolusnake.es_select_population\n"
+            "print(time.perf_counter() - start)\n"
+            "lazy = ['evolusnake.es_population_node1', 'evolusnake.es_population_node12',\n"
+            "    'numpy', 'http.server', 'importlib.metadata']\n"
+            "print(','.join(name for name in lazy if name in sys.modules))\n")
+
+        start: float = time.perf_counter()
+        output: str = subprocess.run([sys.executable, "-c", code], capture_output=True,
+            text=True, check=True).stdout
+        total: float = time.perf_counter() - start
+
+        lines: list[str] = output.splitlines()
+        import_time: float = float(lines[0])
+        print(f"Import time: {import_time:.3f} s, with interpreter startup: {total:.3f} s")
+
+        loaded: str = lines[1] if len(lines) > 1 else ""
+        self.assertEqual(loaded, "")
+        self.assertLess(import_time, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
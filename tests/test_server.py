@@ -7,13 +7,15 @@
 import unittest
 import json
 import os
+from unittest.mock import patch
 
 # Local imports:
 from evolusnake.es_config import ESConfiguration
 # from evolusnake.es_population import ESPopulation
 
 from evolusnake.es_server import ESServer
-from tests.common import TestIndividual
+from evolusnake.es_pareto import es_dominates
+from tests.common import TestIndividual, TestMultiIndividual, TestDataIndividual
 
 # External imports:
 from parasnake.ps_config import PSConfiguration
@@ -255,6 +257,399 @@ class TestServer(unittest.TestCase):
         self.assertAlmostEqual(data["fitness"], ind1.fitness)
         self.assertEqual(data["data"], ind1.data)
 
+    def test_server_noisy_fitness(self):
+        """
+        Test re-evaluating results and elites on the server for noisy fitness.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.noisy_fitness = True
+        config1.reevaluate_interval = 2
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        # Lucky batch on the node:
+        ind2.fitness = -5.0
+
+        server1.ps_process_result(node_id1, ind2)
+        self.assertAlmostEqual(server1.population[0].fitness, 0.0)
+        self.assertEqual(ind2.calc_fitness_called, 1)
+
+        ind3: TestIndividual = TestIndividual()
+        server1.ps_process_result(node_id1, ind3)
+        self.assertEqual(server1.fitness_epoch, 1)
+        self.assertEqual(ind2.calc_fitness_called, 2)
+
+        for ind in server1.population:
+            self.assertEqual(ind.fitness_epoch, 1)
+
+    def test_server_noisy_fitness_data(self):
+        """
+        Test that noisy results are evaluated on the data of the server and not on the data of the node.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.noisy_fitness = True
+        config1.reevaluate_interval = 2
+        ind1: TestDataIndividual = TestDataIndividual(0.0)
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        # Lucky batch on the node:
+        ind2: TestDataIndividual = TestDataIndividual(-100.0)
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 1]
+        ind2.es_calculate_fitness()
+        self.assertAlmostEqual(ind2.fitness, -99.0)
+
+        server1.ps_process_result(node_id1, ind2)
+        self.assertIs(server1.population[0], ind2)
+        self.assertAlmostEqual(ind2.fitness, 1.0)
+        self.assertAlmostEqual(ind2.offset, 0.0)
+
+        # The server changes its data, all individuals are re-evaluated on it:
+        ind1.offset = 10.0
+        server1.ps_process_result(node_id1, TestDataIndividual(-100.0))
+        self.assertEqual(server1.fitness_epoch, 1)
+
+        for ind in server1.population:
+            self.assertAlmostEqual(ind.fitness, float(sum(ind.data)) + 10.0)  # type: ignore
+
+    def test_server_pareto_archive(self):
+        """
+        Test that the server keeps an archive of non-dominated individuals.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.pareto_archive = True
+        config1.server_population_size = 3
+        ind1: TestMultiIndividual = TestMultiIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        for ind in server1.population:
+            for other in server1.population:
+                self.assertFalse(es_dominates(other.objectives, ind.objectives))
+
+        for ind in server1.population:
+            # The fitness is not calculated again for the objectives:
+            self.assertEqual(ind.calc_fitness_called, 1)  # type: ignore
+
+        ind1.es_calculate_fitness()
+        ind1.es_calculate_objectives()
+        server1.population = [ind1]
+
+        ind2: TestMultiIndividual = TestMultiIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        ind2.es_calculate_objectives()
+        server1.ps_process_result(node_id1, ind2)
+
+        self.assertEqual(len(server1.population), 2)
+        self.assertEqual(server1.new_fitness_counter, 1)
+        self.assertAlmostEqual(server1.population[0].fitness, 0.0)
+
+        # Dominated:
+        ind3: TestMultiIndividual = TestMultiIndividual()
+        ind3.data = [1, 1, 1, 1, 1, 1, 1, 1, 1, 0]
+        ind3.es_calculate_fitness()
+        ind3.es_calculate_objectives()
+        server1.ps_process_result(node_id1, ind3)
+        self.assertEqual(len(server1.population), 2)
+
+        # Dominates [10.0, 0.0]:
+        ind4: TestMultiIndividual = TestMultiIndividual()
+        ind4.data = [1, 1, 1, 1, 1, 0, 0, 0, 0, 0]
+        ind4.es_calculate_fitness()
+        ind4.es_calculate_objectives()
+        server1.ps_process_result(node_id1, ind4)
+        self.assertEqual(len(server1.population), 2)
+        self.assertEqual(server1.population[1].objectives, [5.0, 0.0])
+
+        for data in ([1, 1, 0, 0, 0, 0, 0, 0, 0, 0], [1, 1, 1, 0, 0, 0, 0, 0, 0, 0]):
+            ind5: TestMultiIndividual = TestMultiIndividual()
+            ind5.data = data
+            ind5.es_calculate_fitness()
+            ind5.es_calculate_objectives()
+            server1.ps_process_result(node_id1, ind5)
+
+        # The archive is full, the boundary individuals are kept:
+        self.assertEqual(len(server1.population), 3)
+        self.assertEqual(server1.population[0].objectives, [0.0, 5.0])
+        self.assertEqual(server1.population[-1].objectives, [5.0, 0.0])
+
+    def test_server_pareto_evicted(self):
+        """
+        Test that a result that is removed from the full archive right away is not accepted.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.pareto_archive = True
+        config1.server_population_size = 3
+        config1.metrics_filename = "test_server_pareto_metrics.jsonl"
+        config1.metrics_interval = 1000.0
+        config1.checkpoint_filename = "test_server_pareto_checkpoint.bin"
+
+        if os.path.exists(config1.checkpoint_filename):
+            os.remove(config1.checkpoint_filename)
+
+        server1: ESServer = ESServer(config1, TestMultiIndividual())
+        os.remove(config1.checkpoint_filename)
+        node_id1: PSNodeId = PSNodeId()
+        metrics1 = server1.metrics
+        assert metrics1 is not None
+        assert server1.checkpoint is not None
+
+        server1.population = []
+
+        for objectives in ([0.0, 10.0], [5.0, 5.0], [10.0, 0.0]):
+            ind: TestMultiIndividual = TestMultiIndividual()
+            ind.objectives = objectives
+            ind.fitness = objectives[0]
+            server1.population.append(ind)
+
+        # Closer to its neighbours than [5.0, 5.0]:
+        ind2: TestMultiIndividual = TestMultiIndividual()
+        ind2.objectives = [5.1, 4.9]
+        ind2.fitness = 5.1
+        server1.ps_process_result(node_id1, ind2)
+
+        self.assertEqual([ind.objectives for ind in server1.population], [[0.0, 10.0], [5.0, 5.0], [10.0, 0.0]])
+        self.assertAlmostEqual(metrics1.es_get_counter("results"), 1.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("results_accepted"), 0.0)
+        self.assertEqual(server1.checkpoint.append_count, 0)
+
+    def test_server_metrics(self):
+        """
+        Test counting results and improvements per node on the server.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.metrics_filename = "test_server_metrics.jsonl"
+        config1.metrics_interval = 1000.0
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+        metrics1 = server1.metrics
+        assert metrics1 is not None
+
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind2)
+
+        ind3: TestIndividual = TestIndividual()
+        ind3.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind3)
+
+        self.assertAlmostEqual(metrics1.es_get_counter("results"), 2.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("results_accepted"), 1.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("new_best"), 1.0)
+        self.assertAlmostEqual(metrics1.es_get_counter("node_improvements", str(node_id1.id)), 1.0)
+        self.assertAlmostEqual(metrics1.es_snapshot()["gauges"]["best_fitness"][""], 0.0)
+
+    def test_server_save_new_fitness(self):
+        """
+        Test saving each new best individual in the background.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.save_new_fitness = True
+        config1.result_filename = "test_new_fitness.json"
+        config1.result_history_filename = "test_new_fitness.jsonl"
+        ind1: TestIndividual = TestIndividual()
+
+        if os.path.exists(config1.result_history_filename):
+            os.remove(config1.result_history_filename)
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind2)
+        server1.ps_save_data()
+
+        with open(config1.result_history_filename, "r") as f:
+            lines: list[str] = f.readlines()
+
+        os.remove(config1.result_history_filename)
+        os.remove(config1.result_filename)
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["counter"], 1)
+        self.assertEqual(json.loads(lines[0])["individual"]["data"], ind2.data)
+
+    def test_server_niching(self):
+        """
+        Test replacing the closest individual within the niching radius.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.server_population_size = 3
+        config1.niching_radius = 2.0
+        config1.allow_same_fitness = True
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        population: list[TestIndividual] = []
+
+        for data in ([0, 0, 0, 0, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 0, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1, 0]):
+            ind2: TestIndividual = TestIndividual()
+            ind2.data = data
+            ind2.es_calculate_fitness()
+            population.append(ind2)
+
+        server1.population = population  # type: ignore
+
+        # Close to the best one but worse, rejected:
+        ind3: TestIndividual = TestIndividual()
+        ind3.data = [0, 0, 0, 1, 1, 1, 1, 1, 1, 1]
+        ind3.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind3)
+        self.assertEqual([ind.fitness for ind in server1.population], [6.0, 7.0, 9.0])
+
+        # Close to the second one and better, replaces it instead of the worst:
+        ind4: TestIndividual = TestIndividual()
+        ind4.data = [1, 1, 1, 1, 1, 1, 0, 0, 0, 0]
+        ind4.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind4)
+        self.assertEqual([ind.fitness for ind in server1.population], [6.0, 6.0, 9.0])
+        self.assertEqual(server1.population[1].data, ind4.data)  # type: ignore
+
+        # Far away from all, replaces the worst:
+        ind5: TestIndividual = TestIndividual()
+        ind5.data = [0, 1, 0, 1, 0, 1, 0, 1, 0, 1]
+        ind5.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind5)
+        self.assertEqual(server1.population[0].data, ind5.data)  # type: ignore
+        self.assertEqual(len(server1.population), 3)
+
+    def test_server_init_data(self):
+        """
+        Test sending the elite individuals to a new node.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.server_population_size = 5
+        ind1: TestIndividual = TestIndividual()
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        self.assertIsNone(server1.ps_get_init_data(node_id1))
+
+        server1.init_batch_size = 3
+        init_data = server1.ps_get_init_data(node_id1)
+        assert init_data is not None
+
+        best_fitness: list[float] = sorted(ind.fitness for ind in server1.population)[:3]
+        self.assertEqual([ind.fitness for ind in init_data], best_fitness)
+
+        for ind in init_data:
+            self.assertFalse(any(ind is ind2 for ind2 in server1.population))
+
+        config1.init_batch_size = -1
+
+        with self.assertRaises(ValueError):
+            ESServer(config1, ind1)
+
+    def test_server_checkpoint(self):
+        """
+        Test resuming the server population from a checkpoint.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.checkpoint_filename = "test_server_checkpoint.bin"
+        config1.checkpoint_compact = 3
+        ind1: TestIndividual = TestIndividual()
+        ind1.es_calculate_fitness()
+
+        if os.path.exists(config1.checkpoint_filename):
+            os.remove(config1.checkpoint_filename)
+
+        server1: ESServer = ESServer(config1, ind1)
+        server1.population = [ind1.es_clone() for _ in range(server1.population_size)]
+        server1.es_write_checkpoint()
+        node_id1: PSNodeId = PSNodeId()
+
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind2)
+
+        ind3: TestIndividual = TestIndividual()
+        ind3.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 1]
+        ind3.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind3)
+
+        # Not compacted yet:
+        assert server1.checkpoint is not None
+        self.assertEqual(server1.checkpoint.append_count, 2)
+
+        # Simulate a restart of the server, no new population is evaluated:
+        with patch("evolusnake.es_server.es_evaluate_population") as evaluate1:
+            server2: ESServer = ESServer(config1, TestIndividual())
+            evaluate1.assert_not_called()
+
+        os.remove(config1.checkpoint_filename)
+
+        self.assertEqual([ind.fitness for ind in server2.population], [ind.fitness for ind in server1.population])
+        self.assertEqual(server2.population[0].data, ind2.data)
+        self.assertEqual(server2.new_fitness_counter, 1)
+        self.assertEqual(server2.node_stats[node_id1], 1)
+
+    def test_server_checkpoint_sync(self):
+        """
+        Test that the appended checkpoint records are synced regularly.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+        config1.checkpoint_filename = "test_server_checkpoint_sync.bin"
+        config1.checkpoint_sync_interval = 1000.0
+        ind1: TestIndividual = TestIndividual()
+
+        if os.path.exists(config1.checkpoint_filename):
+            os.remove(config1.checkpoint_filename)
+
+        server1: ESServer = ESServer(config1, ind1)
+        node_id1: PSNodeId = PSNodeId()
+
+        ind2: TestIndividual = TestIndividual()
+        ind2.data = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ind2.es_calculate_fitness()
+        server1.ps_process_result(node_id1, ind2)
+
+        assert server1.checkpoint is not None
+        self.assertTrue(server1.checkpoint.unsynced)
+
+        with patch("evolusnake.es_checkpoint.os.fsync") as fsync1:
+            server1.ps_check_heartbeat()
+            fsync1.assert_called_once()
+
+        self.assertFalse(server1.checkpoint.unsynced)
+
+        os.remove(config1.checkpoint_filename)
+
 
 if __name__ == "__main__":
     unittest.main()
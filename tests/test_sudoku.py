@@ -0,0 +1,208 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import pickle
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_population_node2 import ESPopulationNode2
+from evolusnake.es_sudoku import ESSudokuPuzzle, ESSudokuIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+PUZZLE: list[int] = [
+    0, 8, 0,   0, 9, 4,   0, 0, 0,
+    2, 0, 3,   0, 0, 0,   9, 4, 0,
+    0, 0, 0,   0, 0, 2,   1, 0, 3,
+
+    0, 0, 8,   0, 0, 0,   7, 9, 0,
+    9, 2, 0,   0, 0, 0,   0, 5, 6,
+    0, 7, 6,   0, 0, 0,   3, 0, 0,
+
+    0, 5, 7,   0, 0, 0,   2, 0, 1,
+    3, 0, 2,   1, 0, 0,   0, 0, 0,
+    0, 0, 0,   2, 6, 0,   0, 3, 0
+]
+
+SOLUTION: list[int] = [
+    7, 8, 1,   3, 9, 4,   6, 2, 5,
+    2, 6, 3,   5, 1, 7,   9, 4, 8,
+    4, 9, 5,   6, 8, 2,   1, 7, 3,
+
+    1, 3, 8,   4, 5, 6,   7, 9, 2,
+    9, 2, 4,   7, 3, 1,   8, 5, 6,
+    5, 7, 6,   8, 2, 9,   3, 1, 4,
+
+    6, 5, 7,   9, 4, 3,   2, 8, 1,
+    3, 4, 2,   1, 7, 8,   5, 6, 9,
+    8, 1, 9,   2, 6, 5,   4, 3, 7
+]
+
+
+def count_errors(numbers: list[int]) -> int:
+    # Check all rows, columns and blocks.
+    errors: int = 0
+    units: list[list[int]] = []
+
+    for i in range(9):
+        units.append([(i * 9) + j for j in range(9)])
+        units.append([(j * 9) + i for j in range(9)])
+        units.append([((((i // 3) * 3) + (j // 3)) * 9) + ((i % 3) * 3) + (j % 3) for j in range(9)])
+
+    for unit in units:
+        in_use: set[int] = set()
+
+        for cell in unit:
+            n: int = numbers[cell]
+
+            if (n == 0) or (n in in_use):
+                errors += 1
+            else:
+                in_use.add(n)
+
+    return errors
+
+
+class TestSudoku(unittest.TestCase):
+    def test_errors(self):
+        """
+        Test that the counted errors match the check of the whole grid.
+        """
+
+        puzzle: ESSudokuPuzzle = ESSudokuPuzzle(PUZZLE)
+        ind1: ESSudokuIndividual = ESSudokuIndividual(puzzle)
+        self.assertEqual(ind1.errors, count_errors(PUZZLE))
+
+        ind1.es_randomize()
+        self.assertEqual(ind1.errors, count_errors(list(ind1.numbers2)))
+
+        for mut_op in range(8):
+            for _ in range(100):
+                ind1.es_mutate(mut_op)
+                self.assertEqual(ind1.errors, count_errors(list(ind1.numbers2)))
+
+        # Given numbers are never changed:
+        for (n1, n2) in zip(PUZZLE, ind1.numbers2):
+            if n1 > 0:
+                self.assertEqual(n1, n2)
+
+        ind1.es_from_json({"numbers2": SOLUTION})
+        ind1.es_calculate_fitness()
+        self.assertEqual(ind1.fitness, 0.0)
+
+        with self.assertRaises(ValueError):
+            ind1.es_mutate(8)
+
+        with self.assertRaises(ValueError):
+            ESSudokuPuzzle(PUZZLE[1:])
+
+        with self.assertRaises(ValueError):
+            ESSudokuPuzzle(SOLUTION)
+
+    def test_undo(self):
+        """
+        Test that undo restores the grid and the errors.
+        """
+
+        ind1: ESSudokuIndividual = ESSudokuIndividual(ESSudokuPuzzle(PUZZLE))
+        ind1.es_randomize()
+
+        for mut_op in range(7):
+            numbers: list[int] = list(ind1.numbers2)
+            counts: bytes = bytes(ind1.counts)
+            errors: int = ind1.errors
+
+            ind1.es_begin_move()
+
+            for _ in range(5):
+                ind1.es_mutate(mut_op)
+
+            ind1.es_undo()
+            self.assertEqual(list(ind1.numbers2), numbers)
+            self.assertEqual(bytes(ind1.counts), counts)
+            self.assertEqual(ind1.errors, errors)
+
+        # Nothing is recorded without es_begin_move() and after es_commit_move():
+        ind1.es_mutate(3)
+        self.assertEqual(len(ind1.undo_log), 0)
+
+        ind1.es_begin_move()
+        ind1.es_mutate(5)
+        ind1.es_commit_move()
+        numbers = list(ind1.numbers2)
+        ind1.es_undo()
+        self.assertEqual(list(ind1.numbers2), numbers)
+
+    def test_try_possible_number(self):
+        """
+        Test that mutation operation 7 never increases the errors.
+        """
+
+        ind1: ESSudokuIndividual = ESSudokuIndividual(ESSudokuPuzzle(PUZZLE))
+        ind1.es_randomize()
+
+        for _ in range(200):
+            errors: int = ind1.errors
+            ind1.es_mutate(7)
+
+            self.assertLessEqual(ind1.errors, errors)
+            self.assertEqual(ind1.errors, count_errors(list(ind1.numbers2)))
+            self.assertEqual(len(ind1.undo_log), 0)
+            self.assertFalse(ind1.record_undo)
+
+    def test_clone(self):
+        """
+        Test that a clone does not share the grid.
+        """
+
+        ind1: ESSudokuIndividual = ESSudokuIndividual(ESSudokuPuzzle(PUZZLE))
+        ind1.es_randomize()
+
+        ind2: ESSudokuIndividual = ind1.es_clone()
+        numbers: list[int] = list(ind1.numbers2)
+
+        for _ in range(20):
+            ind2.es_mutate(0)
+
+        self.assertEqual(list(ind1.numbers2), numbers)
+        self.assertEqual(ind1.errors, count_errors(numbers))
+        self.assertEqual(ind2.errors, count_errors(list(ind2.numbers2)))
+
+        ind3: ESSudokuIndividual = pickle.loads(pickle.dumps(ind2))
+        ind4: ESSudokuIndividual = ESSudokuIndividual(ind1.puzzle)
+        ind4.es_from_server(ind3)
+        self.assertEqual(ind4.numbers2, ind2.numbers2)
+        self.assertEqual(ind4.errors, ind2.errors)
+        self.assertEqual(ind4.es_genome_hash(), ind2.es_genome_hash())
+        self.assertEqual(ind4.es_distance(ind2), 0.0)
+
+    def test_node(self):
+        """
+        Test that a population node reduces the errors.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 100
+        config1.num_of_mutations = 1
+        config1.mutation_operations = [0, 1, 2, 3, 4, 5]
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+
+        ind1: ESSudokuIndividual = ESSudokuIndividual(ESSudokuPuzzle(PUZZLE))
+        ind1.es_calculate_fitness()
+
+        node1: ESPopulationNode2 = ESPopulationNode2(config1, ind1)
+        ind2 = node1.ps_process_data(ind1)
+
+        self.assertLess(ind2.fitness, ind1.fitness)
+        self.assertEqual(ind2.fitness, float(count_errors(list(ind2.numbers2))))  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
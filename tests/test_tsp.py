@@ -0,0 +1,211 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import math
+import pickle
+import random
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_population_node2 import ESPopulationNode2
+import evolusnake.es_tsp as tsp
+from evolusnake.es_tsp import ESTSPInstance, ESTSPIndividual
+
+# External imports:
+from parasnake.ps_config import PSConfiguration
+
+
+def random_positions(num_of_cities: int) -> list[tuple[float, float]]:
+    rng: random.Random = random.Random(num_of_cities)
+    return [(rng.uniform(0.0, 100.0), rng.uniform(0.0, 100.0)) for _ in range(num_of_cities)]
+
+
+class TestTSP(unittest.TestCase):
+    def check_tour(self, ind: ESTSPIndividual):
+        self.assertEqual(sorted(ind.tour), list(range(ind.num_of_cities)))
+
+        for (i, city) in enumerate(ind.tour):
+            self.assertEqual(ind.position[city], i)
+
+        assert ind.length is not None
+        self.assertAlmostEqual(ind.length, ind.instance.es_tour_length(ind.tour), places=6)
+
+    def test_instance(self):
+        """
+        Test the distances and the nearest neighbours.
+        """
+
+        positions: list[tuple[float, float]] = random_positions(50)
+        instance: ESTSPInstance = ESTSPInstance(positions, 5)
+
+        self.assertEqual(instance.num_of_cities, 50)
+        self.assertIsNotNone(instance.matrix)
+        self.assertAlmostEqual(instance.es_distance(3, 7), math.dist(positions[3], positions[7]))
+
+        for i in range(50):
+            expected: list[int] = sorted((j for j in range(50) if j != i),
+                key=lambda j: math.dist(positions[i], positions[j]))[:5]
+            self.assertEqual(instance.neighbours[i], expected)
+
+        with self.assertRaises(ValueError):
+            ESTSPInstance(positions[:4])
+
+        with self.assertRaises(ValueError):
+            ESTSPInstance(positions, 0)
+
+    def test_grid_neighbours(self):
+        """
+        Test the neighbour lists of large instances without distance matrix.
+        """
+
+        positions: list[tuple[float, float]] = random_positions(300)
+        instance1: ESTSPInstance = ESTSPInstance(positions, 8)
+
+        matrix_limit: int = tsp.ES_TSP_MATRIX_LIMIT
+        tsp.ES_TSP_MATRIX_LIMIT = 100
+
+        try:
+            instance2: ESTSPInstance = ESTSPInstance(positions, 8)
+        finally:
+            tsp.ES_TSP_MATRIX_LIMIT = matrix_limit
+
+        self.assertIsNone(instance2.matrix)
+        self.assertAlmostEqual(instance2.es_distance(3, 7), instance1.es_distance(3, 7))
+
+        for i in range(300):
+            distances1: list[float] = [instance1.es_distance(i, j) for j in instance1.neighbours[i]]
+            distances2: list[float] = [instance2.es_distance(i, j) for j in instance2.neighbours[i]]
+            self.assertEqual(distances1, distances2)
+
+    def test_moves(self):
+        """
+        Test that the updated tour length matches the full calculation for all moves.
+        """
+
+        instance: ESTSPInstance = ESTSPInstance(random_positions(40), 6)
+        ind: ESTSPIndividual = ESTSPIndividual(instance)
+        ind.es_randomize()
+        ind.es_calculate_fitness()
+        self.check_tour(ind)
+
+        for mut_op in (0, 1, 2, 3):
+            for _ in range(300):
+                ind.es_mutate(mut_op)
+
+            self.check_tour(ind)
+
+        # Explicit moves, including the ones over the end of the tour:
+        for (i, j) in ((38, 2), (0, 39), (5, 6), (10, 3)):
+            delta: float = ind.es_delta_2opt(i, j)
+            length: float = ind.instance.es_tour_length(ind.tour)
+            ind.es_apply_2opt(i, j)
+            self.assertAlmostEqual(ind.instance.es_tour_length(ind.tour), length + delta, places=6)
+            self.check_tour(ind)
+
+            delta = ind.es_delta_swap(i, j)
+            length = ind.instance.es_tour_length(ind.tour)
+            ind.es_apply_swap(i, j)
+            self.assertAlmostEqual(ind.instance.es_tour_length(ind.tour), length + delta, places=6)
+            self.check_tour(ind)
+
+        for (i, seg_len, p, reverse) in ((38, 3, 10, False), (2, 2, 30, True), (20, 1, 19 + 3, True), (5, 3, 1, False)):
+            self.assertTrue(ind.es_or_opt_valid(i, seg_len, p))
+            delta = ind.es_delta_or_opt(i, seg_len, p, reverse)
+            length = ind.instance.es_tour_length(ind.tour)
+            ind.es_apply_or_opt(i, seg_len, p, reverse)
+            self.assertAlmostEqual(ind.instance.es_tour_length(ind.tour), length + delta, places=6)
+            self.check_tour(ind)
+
+        self.assertFalse(ind.es_or_opt_valid(10, 3, 9))
+        self.assertFalse(ind.es_or_opt_valid(10, 3, 12))
+
+    def test_recalculate_length(self):
+        """
+        Test that the tour length is calculated again from the whole tour after some moves.
+        """
+
+        instance: ESTSPInstance = ESTSPInstance(random_positions(30))
+        ind1: ESTSPIndividual = ESTSPIndividual(instance)
+        ind1.es_randomize()
+        ind1.es_calculate_fitness()
+        self.assertEqual(ind1.recalculate_moves, tsp.ES_TSP_RECALCULATE_MOVES)
+
+        # Rounding errors of the previous moves:
+        assert ind1.length is not None
+        ind1.length += 1.0
+        ind1.num_of_moves = ind1.recalculate_moves - 2
+
+        ind2: ESTSPIndividual = ind1.es_clone()
+        self.assertEqual(ind2.num_of_moves, ind1.num_of_moves)
+
+        ind2.es_apply_swap(3, 10)
+        ind2.es_calculate_fitness()
+        self.assertNotAlmostEqual(ind2.fitness, instance.es_tour_length(ind2.tour))
+
+        ind2.es_apply_swap(5, 20)
+        ind2.es_calculate_fitness()
+        self.assertEqual(ind2.num_of_moves, 0)
+        self.assertAlmostEqual(ind2.fitness, instance.es_tour_length(ind2.tour))
+        self.check_tour(ind2)
+
+    def test_clone_and_pickle(self):
+        """
+        Test cloning, crossover, JSON and sending the individual to another process.
+        """
+
+        instance: ESTSPInstance = ESTSPInstance(random_positions(30))
+        ind1: ESTSPIndividual = ESTSPIndividual(instance)
+        ind1.es_randomize()
+        ind1.es_calculate_fitness()
+
+        ind2: ESTSPIndividual = ind1.es_clone()
+        ind2.es_mutate(0)
+        ind2.es_calculate_fitness()
+        self.check_tour(ind1)
+        self.check_tour(ind2)
+
+        ind3: ESTSPIndividual = ind1.es_crossover(ind2)
+        ind3.es_calculate_fitness()
+        self.check_tour(ind3)
+
+        ind4: ESTSPIndividual = ESTSPIndividual(instance)
+        ind4.es_from_json(ind1.es_to_json())
+        ind4.es_calculate_fitness()
+        self.assertEqual(ind4.tour, ind1.tour)
+        self.assertAlmostEqual(ind4.fitness, ind1.fitness)
+
+        ind5: ESTSPIndividual = pickle.loads(pickle.dumps(ind1))
+        ind6: ESTSPIndividual = pickle.loads(pickle.dumps(ind2))
+        self.assertEqual(ind5.tour, ind1.tour)
+        self.assertIs(ind5.instance, ind6.instance)
+        self.assertEqual(ind5.instance.neighbours, instance.neighbours)
+
+    def test_node(self):
+        """
+        Test that a population node improves the tour.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 50
+        config1.num_of_mutations = 1
+        config1.mutation_operations = [0, 1, 2, 3]
+        config1.target_fitness = -1.0
+        config1.parasnake_config = PSConfiguration("12345678901234567890123456789012")
+
+        ind1: ESTSPIndividual = ESTSPIndividual(ESTSPInstance(random_positions(30)))
+        ind1.es_randomize()
+        ind1.es_calculate_fitness()
+
+        node1: ESPopulationNode2 = ESPopulationNode2(config1, ind1)
+        ind2 = node1.ps_process_data(ind1)
+
+        self.assertLess(ind2.fitness, ind1.fitness)
+        self.check_tour(ind2)  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# This file is part of Evolusnake, evolutionary algorithms in Python.
+# written by Willi Kappler, MIT license.
+#
+# See: https://github.com/willi-kappler/evolusnake
+
+# Python std lib:
+import unittest
+import os
+from unittest.mock import patch
+
+# Local imports:
+from evolusnake.es_config import ESConfiguration
+from evolusnake.es_tuning import es_tune, es_run_trial, es_candidate_configs
+
+from tests.common import TestIndividual
+
+
+class TestTuning(unittest.TestCase):
+    def test_candidate_configs(self):
+        """
+        Test creating the candidate configurations from the parameter space.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        space: dict[str, list] = {"num_of_mutations": [1, 2, 3], "population_kind": [1, 3]}
+
+        candidates: list[ESConfiguration] = es_candidate_configs(config1, space, 100, 5)
+        self.assertEqual(len(candidates), 6)
+        self.assertEqual({(c.num_of_mutations, c.population_kind) for c in candidates},
+            {(1, 1), (1, 3), (2, 1), (2, 3), (3, 1), (3, 3)})
+        self.assertTrue(all(c.random_seed == 5 for c in candidates))
+
+        candidates = es_candidate_configs(config1, space, 4, 5)
+        self.assertEqual(len(candidates), 4)
+
+        with self.assertRaises(ValueError):
+            es_candidate_configs(config1, {"unknown_option": [1]}, 4, 5)
+
+    def test_run_trial(self):
+        """
+        Test that a trial with the same seed gives the same result.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        config1.random_seed = 7
+        ind1: TestIndividual = TestIndividual()
+
+        result1 = es_run_trial(config1, ind1, 2)
+        result2 = es_run_trial(config1, ind1, 2)
+
+        self.assertAlmostEqual(result1[0], result2[0])
+
+    def test_run_trial_early_exit(self):
+        """
+        Test that a trial does not wait after an early exit and does not change the config.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        # Reached in the first iteration:
+        config1.target_fitness = 100.0
+        config1.random_seed = 7
+        ind1: TestIndividual = TestIndividual()
+
+        with patch("evolusnake.es_population.time.sleep") as sleep1:
+            result1 = es_run_trial(config1, ind1, 1)
+            sleep1.assert_called_once_with(0.0)
+
+        self.assertLessEqual(result1[0], 100.0)
+        self.assertAlmostEqual(config1.early_exit_delay, 5.0)
+
+    def test_tune(self):
+        """
+        Test successive halving and saving the best configuration.
+        """
+
+        config1: ESConfiguration = ESConfiguration()
+        config1.num_of_iterations = 10
+        config1.target_fitness = -1.0
+        ind1: TestIndividual = TestIndividual()
+        space: dict[str, list] = {"num_of_mutations": [1, 2], "node_population_size": [2, 10]}
+
+        (config2, result) = es_tune(config1, ind1, space, num_of_workers=1)
+
+        self.assertIn(config2.num_of_mutations, [1, 2])
+        self.assertIn(config2.node_population_size, [2, 10])
+        self.assertGreaterEqual(result[0], 0.0)
+
+        filename: str = "test_tuning.json"
+        config2.to_json(filename)
+        config3: ESConfiguration = ESConfiguration.from_json(filename)
+        os.remove(filename)
+
+        self.assertEqual(config3.num_of_mutations, config2.num_of_mutations)
+        self.assertEqual(config3.node_population_size, config2.node_population_size)
+
+        with self.assertRaises(ValueError):
+            es_tune(config1, ind1, space, eta=1)
+
+
+if __name__ == "__main__":
+    unittest.main()